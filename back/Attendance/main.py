@@ -17,11 +17,14 @@ if not all([SUPABASE_URL, SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY]):
     raise RuntimeError("❌ Variables de entorno de Supabase no configuradas")
 
 from routes.attendance_routes import router as attendance_router
+from utils.http_client import lifespan
+from utils.supabase import tenant_cache_stats
 
 app = FastAPI(
     title="Attendance Microservice",
     version="1.0.0",
-    description="API para gestión de asistencias y excusas multi-tenant"
+    description="API para gestión de asistencias y excusas multi-tenant",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -45,7 +48,12 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat(), "service": "attendance"}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat(),
+        "service": "attendance",
+        "tenant_cache": tenant_cache_stats()
+    }
 
 if __name__ == "__main__":
     import uvicorn
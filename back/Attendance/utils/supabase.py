@@ -1,14 +1,18 @@
-import httpx
 import os
 from typing import Optional, Dict
 from fastapi import HTTPException, Header
 import jwt
+from utils.http_client import get_http_client
+from utils.ttl_cache import AsyncTTLCache
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET", SUPABASE_ANON_KEY)
 
+# Los tenants casi nunca cambian: se guardan en memoria TENANT_CACHE_TTL segundos
+_tenant_cache = AsyncTTLCache(ttl=float(os.getenv("TENANT_CACHE_TTL", 300)))
+
 def get_tenant_from_email(email: str) -> Optional[str]:
     if not email:
         return None
@@ -21,24 +25,39 @@ def get_tenant_from_email(email: str) -> Optional[str]:
         return "gmail.com"
     return None
 
+async def _fetch_tenant_info(domain: str) -> Optional[Dict]:
+    """Consultar el tenant en Supabase (sin caché)"""
+    client = get_http_client()
+    headers = {
+        "apikey": SUPABASE_ANON_KEY,
+        "Authorization": f"Bearer {SUPABASE_ANON_KEY}"
+    }
+    response = await client.get(
+        f"{SUPABASE_URL}/rest/v1/tenants?domain=eq.{domain}&select=*",
+        headers=headers
+    )
+    if response.status_code == 200:
+        tenants = response.json()
+        return tenants[0] if tenants else None
+    return None
+
 async def get_tenant_info(domain: str) -> Optional[Dict]:
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            headers = {
-                "apikey": SUPABASE_ANON_KEY,
-                "Authorization": f"Bearer {SUPABASE_ANON_KEY}"
-            }
-            response = await client.get(
-                f"{SUPABASE_URL}/rest/v1/tenants?domain=eq.{domain}&select=*",
-                headers=headers
-            )
-            if response.status_code == 200:
-                tenants = response.json()
-                return tenants[0] if tenants else None
+        tenant = await _tenant_cache.get(domain, lambda: _fetch_tenant_info(domain))
+        # Copia: quien llama no debe modificar la entrada compartida de la caché
+        return dict(tenant) if tenant else None
     except Exception as e:
         print(f"❌ Error obteniendo tenant info: {e}")
     return None
 
+def invalidate_tenant_info(domain: Optional[str] = None):
+    """Descartar de la caché un tenant (o todos), p. ej. después de modificarlo"""
+    _tenant_cache.invalidate(domain)
+
+def tenant_cache_stats() -> Dict:
+    """Métricas de la caché de tenants"""
+    return _tenant_cache.stats()
+
 async def get_current_user(authorization: str = Header(None)) -> Dict:
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Token no proporcionado")
@@ -64,19 +83,19 @@ async def get_current_user(authorization: str = Header(None)) -> Dict:
 
 async def get_user_by_email(email: str, schema: str) -> Optional[Dict]:
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            headers = {
-                "apikey": SUPABASE_SERVICE_ROLE_KEY,
-                "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
-            }
-            table_name = f"{schema}_usuarios"
-            response = await client.get(
-                f"{SUPABASE_URL}/rest/v1/{table_name}?email=eq.{email}&select=*",
-                headers=headers
-            )
-            if response.status_code == 200:
-                users = response.json()
-                return users[0] if users else None
+        client = get_http_client()
+        headers = {
+            "apikey": SUPABASE_SERVICE_ROLE_KEY,
+            "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
+        }
+        table_name = f"{schema}_usuarios"
+        response = await client.get(
+            f"{SUPABASE_URL}/rest/v1/{table_name}?email=eq.{email}&select=*",
+            headers=headers
+        )
+        if response.status_code == 200:
+            users = response.json()
+            return users[0] if users else None
     except Exception as e:
         print(f"❌ Error obteniendo usuario: {e}")
     return None
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class AsyncTTLCache:
+    """Caché en memoria con expiración (TTL) para consultas async
+
+    Las consultas concurrentes de una clave ausente comparten una sola llamada
+    (single-flight). Ni los valores None ni los errores se guardan, así que se
+    reintentan en la siguiente consulta.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, tuple] = {}          # clave -> (expira_en, valor)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # Cambia con cada invalidación; una carga iniciada antes no guarda su resultado
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Valor en caché de la clave, o el resultado de loader() si no está o expiró"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, loader, self._version))
+            task.add_done_callback(_retrieve_exception)
+            self._inflight[key] = task
+
+        # shield: si se cancela quien espera, la carga sigue para los demás
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], version: int) -> Any:
+        try:
+            value = await loader()
+            if value is not None and version == self._version:
+                self._store(key, value)
+            return value
+        finally:
+            # Tras una invalidación la clave puede apuntar ya a una carga más nueva
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def _store(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        if len(self._entries) >= self.max_entries and key not in self._entries:
+            for stale in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+                del self._entries[stale]
+            if len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (now + self.ttl, value)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Descartar una clave, o toda la caché si no se indica ninguna
+
+        Las cargas en curso también se sueltan: quien consulte después inicia
+        una carga nueva en vez de esperar un resultado anterior a la invalidación.
+        """
+        self._version += 1
+        if key is None:
+            self._entries.clear()
+            self._inflight.clear()
+        else:
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict:
+        """Aciertos, fallos y consultas que esperaron una carga en curso"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl
+        }
+
+
+def _retrieve_exception(task: asyncio.Task):
+    """Marcar el error como leído aunque todos los que esperaban se hayan cancelado"""
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,71 @@
+"""Latency of ordinary analyses while a pathological upload is being analyzed
+
+Usage: python benchmarks/analysis_sandbox.py [requests]
+
+A thread keeps analyzing a huge generated file (as a stream of bad uploads
+would) while the main thread times small analyses: first through the sandbox,
+whose CPU limit aborts the heavy ones, then in-process as before. The sandbox
+runs first so that the peak RSS of this (parent) process shows what in-process
+analysis adds.
+"""
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+
+from synthetic import random_program
+from utils.code_analyzer import CodeAnalyzer
+from utils.sandbox import AnalysisSandbox
+
+
+def _measure(analyze, heavy, small, requests):
+    stop = threading.Event()
+    heavy_results = []
+
+    def hog():
+        while not stop.is_set():
+            heavy_results.append(analyze(heavy))
+
+    thread = threading.Thread(target=hog)
+    thread.start()
+    time.sleep(0.5)
+
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        analyze(small)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    stop.set()
+    thread.join()
+    aborted = sum(1 for result in heavy_results if 'aborted' in result['metrics'])
+    return timings, len(heavy_results), aborted
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rng = random.Random(8)
+    heavy = random_program(rng, functions=2000)
+    small = random_program(rng, functions=6)
+
+    sandbox = AnalysisSandbox(workers=2, cpu_seconds=1, memory_mb=512, timeout=10)
+    sandbox.analyze(small, 'py')  # start the workers outside the measurement
+
+    cases = [
+        ("sandbox", lambda code: sandbox.analyze(code, 'py')),
+        ("in-process", lambda code: CodeAnalyzer(code, 'py').analyze()),
+    ]
+    print(f"heavy file: {len(heavy.splitlines())} lines, small file: {len(small.splitlines())} lines")
+    for name, analyze in cases:
+        timings, heavy_runs, aborted = _measure(analyze, heavy, small, requests)
+        timings.sort()
+        print(f"{name:>10}: small analysis median {statistics.median(timings):7.1f} ms, "
+              f"p99 {timings[int(len(timings) * 0.99)]:7.1f} ms, max {timings[-1]:7.1f} ms "
+              f"({heavy_runs} heavy runs, {aborted} aborted), "
+              f"parent peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Storage savings and read cost of compressed, deduplicated submission content
+
+Usage: python benchmarks/blob_storage.py [assignments] [students]
+
+The corpus mimics a course: every assignment ships starter code that some
+students submit unchanged, others resubmit byte-identical files, and a share
+copy from each other with light edits.
+"""
+import random
+import statistics
+import sys
+import time
+
+from synthetic import make_assignment, random_program
+from utils.blob_store import compress, decompress, zstandard, CODEC_ZLIB, CODEC_ZSTD
+from utils.fingerprint_index import content_hash
+
+
+def course_corpus(assignments, students, seed=5):
+    """Submission contents of a synthetic course, duplicates included"""
+    rng = random.Random(seed)
+    contents = []
+    for index in range(assignments):
+        starter = random_program(rng, functions=4)
+        for sub in make_assignment(students, copy_ratio=0.2, seed=seed + index, functions=6):
+            roll = rng.random()
+            if roll < 0.1:
+                code = starter
+            else:
+                code = starter + "\n\n" + sub['code']
+            contents.append(code)
+            if rng.random() < 0.15:
+                contents.append(code)  # resubmission
+    return contents
+
+
+def main():
+    assignments = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    students = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    contents = course_corpus(assignments, students)
+
+    raw_bytes = sum(len(content.encode('utf-8')) for content in contents)
+    distinct = {content_hash(content): content for content in contents}
+    distinct_bytes = sum(len(content.encode('utf-8')) for content in distinct.values())
+
+    print(f"Corpus: {len(contents)} submissions, {len(distinct)} distinct, {raw_bytes / 1024:.0f} KB raw text")
+    print(f"  dedup only            {distinct_bytes / 1024:8.0f} KB  ({raw_bytes / distinct_bytes:4.2f}x)")
+
+    codecs = [CODEC_ZLIB] + ([CODEC_ZSTD] if zstandard is not None else [])
+    for codec in codecs:
+        blobs = [compress(content, codec) for content in distinct.values()]
+        stored = sum(len(data) for _, data in blobs)
+
+        timings = []
+        for blob_codec, data in blobs:
+            start = time.perf_counter()
+            decompress(blob_codec, data)
+            timings.append((time.perf_counter() - start) * 1e6)
+
+        print(f"  dedup + {codec:<5} base64 {stored / 1024:8.0f} KB  ({raw_bytes / stored:4.2f}x)  "
+              f"decompress median {statistics.median(timings):6.1f} us, "
+              f"p99 {sorted(timings)[int(len(timings) * 0.99)]:6.1f} us per submission")
+
+
+if __name__ == '__main__':
+    main()
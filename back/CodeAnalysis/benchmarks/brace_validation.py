@@ -0,0 +1,125 @@
+"""Syntax checks of C-family files: the masked scan vs the legacy regex analyzers
+
+Usage: python benchmarks/brace_validation.py [lines] [repeat]
+
+The legacy analyzers ran one re.findall per metric plus str.count per bracket
+kind over the raw text, so brackets inside strings, comments and regexes were
+counted and a mismatch carried no line number. The scan blanks comments and
+literals with one regex per language, checks balance on the remaining brackets
+and only walks them with a stack when a file is unbalanced.
+"""
+import random
+import re
+import sys
+import time
+
+import synthetic  # noqa: F401  (puts the service root on sys.path)
+from utils.code_analyzer import CodeAnalyzer
+
+
+def legacy_javascript_counts(code):
+    """Metrics and errors of the previous JavaScriptAnalyzer"""
+    functions = re.findall(r'(function\s+\w+|const\s+\w+\s*=\s*\([^)]*\)\s*=>|\w+\s*:\s*function)', code)
+    imports = re.findall(r'(import\s+.*from|require\()', code)
+    console_logs = len(re.findall(r'console\.log', code))
+    var_usage = len(re.findall(r'\bvar\s+\w+', code))
+    errors = []
+    if code.count('{') != code.count('}'):
+        errors.append("Mismatched curly braces")
+    if code.count('(') != code.count(')'):
+        errors.append("Mismatched parentheses")
+    return len(functions), len(imports), console_logs, var_usage, errors
+
+
+def legacy_c_counts(code):
+    """Metrics and errors of the previous CCppAnalyzer"""
+    includes = re.findall(r'#include\s*[<"][^>"]+[>"]', code)
+    functions = re.findall(r'\w+\s+\w+\s*\([^)]*\)\s*\{', code)
+    has_main = bool(re.search(r'int\s+main\s*\(', code))
+    errors = []
+    if code.count('{') != code.count('}'):
+        errors.append("Mismatched curly braces")
+    if code.count('(') != code.count(')'):
+        errors.append("Mismatched parentheses")
+    return len(includes), len(functions), has_main, errors
+
+
+def _javascript_source(rng, lines):
+    parts = ['import fs from "fs";', 'const path = require("path");']
+    index = 0
+    while len(parts) < lines:
+        index += 1
+        parts += [
+            f"function handler{index}(request, options) {{",
+            "    // parse { the ( payload",
+            f"    const pattern = /[({{]+/g;",
+            f"    const label = \"item ({index}\" + `total: ${{request.size}}`;",
+            f"    const values = request.items.filter(item => item.size > {rng.randint(1, 99)});",
+            f"    if (values.length > options.limit) {{ console.log(label); }}",
+            f"    return values.map((value) => value * {rng.randint(2, 9)});",
+            "}",
+        ]
+    return "\n".join(parts) + "\n"
+
+
+def _c_source(rng, lines):
+    parts = ['#include <stdio.h>', '#include "list.h"']
+    index = 0
+    while len(parts) < lines:
+        index += 1
+        parts += [
+            f"static int compute_{index}(int *values, int count) {{",
+            "    /* sum the ( values } */",
+            f"    int total = {rng.randint(0, 9)};",
+            "    for (int i = 0; i < count; i++) { total += values[i]; }",
+            "    printf(\"total: %d)\\n\", total);",
+            "    return total > 0 ? total : '{';",
+            "}",
+        ]
+    parts += ["int main(void) {", "    return compute_1(0, 0);", "}"]
+    return "\n".join(parts) + "\n"
+
+
+def _best(func, code, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(code)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    rng = random.Random(11)
+
+    cases = [
+        ('js', _javascript_source(rng, lines), legacy_javascript_counts),
+        ('c', _c_source(rng, lines), legacy_c_counts),
+    ]
+    print(f"{'file':>10}  {'legacy regex':>14}  {'masked scan':>12}  errors legacy / scan")
+    for language, code, legacy in cases:
+        old_time, old_result = _best(legacy, code, repeat)
+        new_time, new_result = _best(lambda text: CodeAnalyzer(text, language).analyze(), code, repeat)
+        print(f"{language:>3} {len(code.splitlines()):>6}  {old_time * 1000:>11.1f} ms  "
+              f"{new_time * 1000:>9.1f} ms  {len(old_result[-1])} / {len(new_result['errors'])}")
+        print(f"    legacy metrics {old_result[:-1]}, scan metrics {new_result['metrics']}")
+
+    valid = [
+        ('java', 'class Note {\n    String text = """\n        He said "hi" {\n        """;\n}\n'),
+        ('js', "export function App() {\n    return <p>Don't</p>;\n}\n"),
+    ]
+    print("\nValid files with quotes the stack walk cannot pair:")
+    for language, code in valid:
+        result = CodeAnalyzer(code, language).analyze()
+        print(f"  {language:>4}  is_valid={result['is_valid']}  errors={result['errors']}")
+
+    broken = "int main(void) {\n    if (ready) {\n        run(];\n    }\n"
+    print("\nError report for a truncated file:")
+    for error in CodeAnalyzer(broken, 'c').analyze()['errors']:
+        print(f"  {error}")
+
+
+if __name__ == '__main__':
+    main()
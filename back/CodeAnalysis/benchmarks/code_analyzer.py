@@ -0,0 +1,89 @@
+"""CPU time of the Python CodeAnalyzer on large files, single pass vs the legacy pipeline
+
+Usage: python benchmarks/code_analyzer.py [lines] [repeat]
+
+The legacy pipeline parsed the source five times (ast.parse, then radon's
+analyze, cc_visit, mi_visit and h_visit) and walked the tree three more times.
+"""
+import ast
+import random
+import sys
+import time
+
+from synthetic import random_program
+from radon.complexity import cc_visit
+from radon.metrics import mi_visit, h_visit
+from radon.raw import analyze
+from utils.code_analyzer import CodeAnalyzer
+
+
+def legacy_python_metrics(code):
+    """The metrics of the previous _analyze_python, computed the old way"""
+    tree = ast.parse(code)
+    raw = analyze(code)
+    complexity = cc_visit(code)
+    mi_score = mi_visit(code, True)
+    halstead = h_visit(code)
+
+    imports = [node for node in ast.walk(tree) if isinstance(node, (ast.Import, ast.ImportFrom))]
+    classes = [node for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
+    functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
+    missing = [func.name for func in functions if not ast.get_docstring(func)]
+
+    return {
+        "lines_of_code": raw.loc,
+        "cyclomatic_complexity": round(sum(c.complexity for c in complexity) / len(complexity), 2) if complexity else 0,
+        "functions_count": len(complexity),
+        "maintainability_index": round(mi_score, 2),
+        "halstead_difficulty": round(halstead.total.difficulty, 2),
+        "halstead_effort": round(halstead.total.effort, 2),
+        "imports": len(imports),
+        "classes": len(classes),
+        "functions": len(functions),
+        "missing_docstrings": len(missing),
+    }
+
+
+def _program_of_lines(rng, lines):
+    """Concatenate synthetic programs until the file has the requested number of lines"""
+    parts = ["import os", "import sys", "from collections import Counter", ""]
+    count = len(parts)
+    while count < lines:
+        code = random_program(rng, functions=10)
+        parts.append(f"class Block{len(parts)}:\n    \"\"\"Synthetic block\"\"\"\n    limit = {count}\n")
+        parts.append(code)
+        count += code.count("\n") + 4
+    return "\n".join(parts)
+
+
+def _cpu_time(func, repeat):
+    """Best process CPU time of repeat runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    code = _program_of_lines(random.Random(11), lines)
+
+    legacy = legacy_python_metrics(code)
+    current = CodeAnalyzer(code, 'py').analyze()['metrics']
+    mismatched = [key for key in legacy if key in current and current[key] != legacy[key]]
+
+    legacy_time = _cpu_time(lambda: legacy_python_metrics(code), repeat)
+    current_time = _cpu_time(lambda: CodeAnalyzer(code, 'py').analyze(), repeat)
+
+    print(f"Python file: {len(code.splitlines())} lines, {len(code) // 1024} KB")
+    print(f"  legacy pipeline  {legacy_time * 1000:8.1f} ms CPU")
+    print(f"  single pass      {current_time * 1000:8.1f} ms CPU  speedup {legacy_time / current_time:4.2f}x")
+    print(f"  metrics {'identical' if not mismatched else 'MISMATCH: ' + ', '.join(mismatched)}")
+
+
+if __name__ == '__main__':
+    main()
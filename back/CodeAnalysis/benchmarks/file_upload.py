@@ -0,0 +1,66 @@
+"""Read and decode 10 MB uploads: streaming reader vs the legacy read-all + full chardet
+
+Usage: python benchmarks/file_upload.py [size_mb]
+
+The legacy reader is skipped with 'legacy=off' as a second argument when only
+the new path should be timed (chardet over 10 MB takes a long time).
+"""
+import io
+import random
+import sys
+import time
+
+import chardet
+from synthetic import random_program
+from utils.file_handler import read_file_content
+
+
+def legacy_read_file_content(file):
+    """The previous implementation: seek for the size, read everything, chardet everything"""
+    file.seek(0, 2)
+    file.tell()
+    file.seek(0)
+    file_bytes = file.read()
+    encoding = chardet.detect(file_bytes)['encoding'] or 'utf-8'
+    return file_bytes.decode(encoding), encoding
+
+
+def _source_text(size):
+    """Python source with a few accented comments, about size bytes long"""
+    rng = random.Random(3)
+    parts = []
+    length = 0
+    while length < size:
+        code = random_program(rng) + "\n# revisión: función de cálculo del año\n"
+        parts.append(code)
+        length += len(code.encode('utf-8'))
+    return "".join(parts)
+
+
+def _time(func, data):
+    start = time.perf_counter()
+    content, encoding = func(io.BytesIO(data))[:2]
+    return time.perf_counter() - start, encoding, content
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    run_legacy = not (len(sys.argv) > 2 and sys.argv[2] == 'legacy=off')
+    text = _source_text(int(size_mb * 1024 * 1024) - 4096)
+
+    cases = [("utf-8", text.encode('utf-8')), ("latin-1", text.encode('latin-1'))]
+    print(f"{'upload':>16}  {'legacy':>22}  {'streaming':>22}")
+    for name, data in cases:
+        new_time, new_encoding, new_content = _time(read_file_content, data)
+        if run_legacy:
+            old_time, old_encoding, old_content = _time(legacy_read_file_content, data)
+            legacy = f"{old_time * 1000:>9.1f} ms {old_encoding:>10}"
+            same = "identical" if old_content == new_content else "content differs"
+        else:
+            legacy, same = f"{'skipped':>22}", ""
+        print(f"{name:>7} {len(data) / 1048576:5.1f} MB  {legacy}  "
+              f"{new_time * 1000:>9.1f} ms {new_encoding:>10}  {same}")
+
+
+if __name__ == '__main__':
+    main()
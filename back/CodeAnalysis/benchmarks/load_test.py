@@ -0,0 +1,168 @@
+"""Throughput and tail latency of the HTTP service: Werkzeug dev server vs gunicorn
+
+Usage:
+    python benchmarks/load_test.py --serve dev        # start `python main.py`-style server and load it
+    python benchmarks/load_test.py --serve gunicorn   # start gunicorn -c gunicorn.conf.py main:app
+    python benchmarks/load_test.py --url http://host:5015 --paths /api/submissions/list/<id>
+
+--heavy adds clients that keep requesting a slow endpoint (e.g. a synchronous
+plagiarism run) so the numbers show whether light requests queue behind it.
+"""
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEV_SERVER = (
+    "from main import app; "
+    "app.run(host='127.0.0.1', port={port}, debug=True, use_reloader=False)"
+)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, port):
+    """Start the service on 127.0.0.1:port and wait until /health answers"""
+    if kind == 'dev':
+        command = [sys.executable, '-c', DEV_SERVER.format(port=port)]
+    else:
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                   '--bind', f'127.0.0.1:{port}', 'main:app']
+    process = subprocess.Popen(command, cwd=SERVICE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{kind} server did not start on port {port}")
+
+
+def _request(connection, path):
+    connection.request('GET', path)
+    response = connection.getresponse()
+    response.read()
+    return response
+
+
+def _client(base, paths, stop, latencies, errors):
+    """Keep-alive client cycling through paths until stop is set"""
+    def connect():
+        return http.client.HTTPConnection(base.hostname, base.port or 80, timeout=60)
+
+    connection = connect()
+    index = 0
+    while not stop.is_set():
+        path = paths[index % len(paths)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            try:
+                response = _request(connection, path)
+            except (OSError, http.client.HTTPException):
+                # The server may close an idle keep-alive connection (e.g. a recycled
+                # worker); like any HTTP client, retry once on a new one
+                connection.close()
+                connection = connect()
+                response = _request(connection, path)
+        except (OSError, http.client.HTTPException):
+            errors.append('connection')
+            connection.close()
+            connection = connect()
+            continue
+
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status >= 500:
+            errors.append(response.status)
+        if response.version == 10 or (response.getheader('Connection') or '').lower() == 'close':
+            connection.close()
+    connection.close()
+
+
+def run_load(url, paths, concurrency, duration, heavy=None, heavy_clients=2):
+    """Drive the server with concurrent clients and summarize the light requests"""
+    base = urllib.parse.urlparse(url)
+    stop = threading.Event()
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=_client, args=(base, paths, stop, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    if heavy:
+        threads += [
+            threading.Thread(target=_client, args=(base, [heavy], stop, [], []))
+            for _ in range(heavy_clients)
+        ]
+
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    if not latencies:
+        return {"requests": 0, "errors": len(errors)}
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / duration,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--serve', choices=['dev', 'gunicorn'], nargs='*', default=[],
+                        help="start these servers locally, one after the other")
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help="server to load when --serve is not given")
+    parser.add_argument('--paths', default='/health,/api/analysis/cache/stats', help="comma-separated GET paths")
+    parser.add_argument('--heavy', help="slow GET path hammered by extra clients")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    args = parser.parse_args()
+
+    paths = [path.strip() for path in args.paths.split(',') if path.strip()]
+    targets = [(kind, None) for kind in args.serve] or [(args.url, args.url)]
+
+    print(f"{'server':>10}  {'requests':>8}  {'errors':>6}  {'req/s':>8}  {'p50 ms':>8}  {'p99 ms':>8}")
+    for name, url in targets:
+        process = None
+        if url is None:
+            port = _free_port()
+            process = start_server(name, port)
+            url = f'http://127.0.0.1:{port}'
+        try:
+            stats = run_load(url, paths, args.concurrency, args.duration, args.heavy)
+        finally:
+            if process:
+                process.terminate()
+                process.wait()
+        if not stats['requests']:
+            print(f"{name:>10}  {0:>8}  {stats['errors']:>6}")
+            continue
+        print(f"{name:>10}  {stats['requests']:>8}  {stats['errors']:>6}  {stats['rps']:>8.0f}  "
+              f"{stats['p50']:>8.1f}  {stats['p99']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
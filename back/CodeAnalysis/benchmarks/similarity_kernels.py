@@ -0,0 +1,60 @@
+"""Micro-benchmark of the similarity kernels on file sizes from 1 KB to 1 MB
+
+Usage: python benchmarks/similarity_kernels.py [difflib_max_kb]
+
+difflib gets very slow on large inputs; sizes above difflib_max_kb (default 10)
+are only measured with the fast kernels.
+"""
+import random
+import sys
+import time
+
+from synthetic import make_assignment, disguise
+from utils.similarity_kernels import KERNELS, get_kernel
+
+SIZES_KB = [1, 10, 100, 1024]
+
+
+def _code_of_size(rng, size):
+    """Concatenate synthetic programs until the text reaches size bytes"""
+    parts = []
+    length = 0
+    seed = rng.randint(0, 10 ** 6)
+    while length < size:
+        code = make_assignment(1, seed=seed + len(parts), functions=8)[0]['code']
+        parts.append(code)
+        length += len(code)
+    return "\n".join(parts)[:size]
+
+
+def main():
+    difflib_max_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rng = random.Random(7)
+
+    kernels = []
+    for name in KERNELS:
+        try:
+            kernels.append(get_kernel(name))
+        except ImportError as e:
+            print(f"Skipping {name}: {e}")
+
+    print(f"{'size':>8}  " + "  ".join(f"{kernel.name:>22}" for kernel in kernels))
+    for size_kb in SIZES_KB:
+        code_a = _code_of_size(rng, size_kb * 1024)
+        code_b = disguise(rng, code_a)
+
+        cells = []
+        for kernel in kernels:
+            if kernel.name == 'difflib' and size_kb > difflib_max_kb:
+                cells.append(f"{'skipped':>22}")
+                continue
+            start = time.perf_counter()
+            score = kernel.ratio(code_a, code_b)
+            elapsed = time.perf_counter() - start
+            cells.append(f"{elapsed * 1000:>12.1f} ms ({score:.3f})")
+
+        print(f"{size_kb:>5} KB  " + "  ".join(cells))
+
+
+if __name__ == '__main__':
+    main()
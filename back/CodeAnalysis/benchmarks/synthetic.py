@@ -0,0 +1,73 @@
+"""Synthetic assignment corpus used by the benchmark scripts"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_NAMES = ['data', 'items', 'values', 'result', 'total', 'count', 'index', 'node',
+          'matrix', 'buffer', 'score', 'limit', 'grade', 'record', 'queue', 'stack']
+
+_STATEMENTS = [
+    "{a} = [x * {n} for x in range({b})]",
+    "for {a} in range(len({b})):\n        {c} += {a} * {n}",
+    "if {a} > {n}:\n        {b} = {a} - {n}\n    else:\n        {b} = {a} + {n}",
+    "while {a} < {n}:\n        {a} += 1",
+    "{a} = sorted({b}, key=lambda v: v % {n})",
+    "{a} = {{k: k ** 2 for k in range({n})}}",
+    "try:\n        {a} = int({b})\n    except ValueError:\n        {a} = {n}",
+    "{a} = sum({b}) / max(len({b}), 1)",
+    "print('{a}', {b}, {n})",
+    "{a}.append({b} // {n})",
+]
+
+
+def _random_function(rng, name, statements=8):
+    """Generate a random Python function"""
+    body = []
+    for _ in range(statements):
+        a, b, c = rng.sample(_NAMES, 3)
+        template = rng.choice(_STATEMENTS)
+        body.append("    " + template.format(a=a, b=b, c=c, n=rng.randint(2, 99)))
+    args = ", ".join(rng.sample(_NAMES, rng.randint(1, 3)))
+    return f"def {name}({args}):\n    \"\"\"{name} helper\"\"\"\n" + "\n".join(body) + "\n    return None\n"
+
+
+def random_program(rng, functions=6):
+    """Generate an original student program"""
+    parts = ["import math", "import sys", ""]
+    for i in range(functions):
+        parts.append(_random_function(rng, f"task_{i}_{rng.randint(0, 9999)}"))
+    return "\n".join(parts)
+
+
+def disguise(rng, code):
+    """Produce a plagiarized copy: renamed identifiers, edited comments and spacing"""
+    renames = dict(zip(_NAMES, rng.sample(_NAMES, len(_NAMES))))
+    lines = []
+    for line in code.splitlines():
+        for old, new in renames.items():
+            if rng.random() < 0.5:
+                line = line.replace(old, new.upper() if rng.random() < 0.2 else new)
+        lines.append(line)
+        if rng.random() < 0.1:
+            lines.append("    # " + rng.choice(_NAMES) + " step")
+    return "\n".join(lines)
+
+
+def make_assignment(size=200, copy_ratio=0.2, seed=42, functions=6):
+    """Build a list of submissions in the format used by PlagiarismDetector"""
+    rng = random.Random(seed)
+    submissions = []
+    for i in range(size):
+        if submissions and rng.random() < copy_ratio:
+            code = disguise(rng, rng.choice(submissions)['code'])
+        else:
+            code = random_program(rng, functions)
+        submissions.append({
+            'id': f"sub-{i}",
+            'student_id': f"student-{i}",
+            'code': code,
+            'language': 'py'
+        })
+    return submissions
@@ -1,9 +1,16 @@
 from flask import jsonify
 from datetime import datetime
 from utils.supabase import get_supabase_client
-from utils.code_analyzer import CodeAnalyzer
-from utils.plagiarism_detector import PlagiarismDetector
+from utils.analysis_cache import get_analysis_cache, analysis_row
+from utils.alignment import get_alignment_cache
+from utils.sandbox import get_sandbox
+from utils.plagiarism_detector import PlagiarismDetector, MODES
+from utils.fingerprint_index import attach_profiles
+from utils.blob_store import load_code
+from utils.corpus_index import posting_rows, index_postings, purge_stale_postings, search_corpus, RESCORE_FACTOR
+from utils.job_queue import get_job_queue, JOB_QUEUED
 import os
+import time
 import traceback
 
 class AnalysisController:
@@ -21,42 +28,42 @@ class AnalysisController:
             if not result.data:
                 return jsonify({"error": "Submission not found"}), 404
             
-            submission = result.data[0]
+            submission = load_code(supabase, result.data)[0]
             
-            # Analyze code
-            analyzer = CodeAnalyzer(submission['code_content'], submission['file_extension'])
-            analysis = analyzer.analyze()
-            
-            # Save or update analysis
-            existing_analysis = supabase.table('code_analysis').select('*').eq('submission_id', submission_id).execute()
+            # Analyze code (identical content is answered from the analysis cache)
+            key, analysis, cache_tier = get_analysis_cache().analyze(
+                supabase, submission['code_content'], submission['file_extension']
+            )
             
-            analysis_data = {
-                "submission_id": submission_id,
-                "is_valid": analysis['is_valid'],
-                "language": analysis['language'],
-                "errors": analysis['errors'],
-                "warnings": analysis['warnings'],
-                "metrics": analysis['metrics'],
-                "suggestions": analysis['suggestions'],
-                "analyzed_at": datetime.utcnow().isoformat()
-            }
+            # Save or update analysis, unless the stored one is already current
+            existing_analysis = supabase.table('code_analysis').select('id, analysis_key').eq('submission_id', submission_id).execute()
             
-            if existing_analysis.data:
-                # Update
-                supabase.table('code_analysis').update(analysis_data).eq('submission_id', submission_id).execute()
-            else:
-                # Insert
-                supabase.table('code_analysis').insert(analysis_data).execute()
+            is_current = (
+                existing_analysis.data
+                and existing_analysis.data[0].get('analysis_key') == key
+                and submission.get('is_analyzed')
+            )
             
-            # Update submission
-            supabase.table('code_submissions').update({
-                "is_analyzed": True,
-                "analysis_result": analysis
-            }).eq('id', submission_id).execute()
+            if not is_current:
+                analysis_data = analysis_row(submission_id, key, analysis)
+                
+                if existing_analysis.data:
+                    # Update
+                    supabase.table('code_analysis').update(analysis_data).eq('submission_id', submission_id).execute()
+                else:
+                    # Insert
+                    supabase.table('code_analysis').insert(analysis_data).execute()
+                
+                # Update submission
+                supabase.table('code_submissions').update({
+                    "is_analyzed": True,
+                    "analysis_result": analysis
+                }).eq('id', submission_id).execute()
             
             return jsonify({
                 "submission_id": submission_id,
-                "analysis": analysis
+                "analysis": analysis,
+                "cache": cache_tier
             }), 200
             
         except Exception as e:
@@ -65,74 +72,368 @@ class AnalysisController:
             return jsonify({"error": f"Internal server error: {str(e)}"}), 500
     
     @staticmethod
-    def detect_plagiarism(assignment_id):
+    def get_cache_stats():
+        """Hit/miss counters of the analysis and alignment caches, and analysis sandbox counters"""
+        try:
+            return jsonify({
+                **get_analysis_cache().stats(),
+                "alignment": get_alignment_cache().stats(),
+                "sandbox": get_sandbox().stats()
+            }), 200
+        except Exception as e:
+            print(f"Error getting cache stats: {str(e)}")
+            return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+    
+    @staticmethod
+    def detect_plagiarism(assignment_id, mode=None):
         """Detect plagiarism among all submissions for an assignment"""
+        try:
+            mode = mode or os.getenv('PLAGIARISM_MODE', 'exhaustive')
+            if mode not in MODES:
+                return jsonify({"error": f"Invalid mode, expected one of: {', '.join(MODES)}"}), 400
+            
+            supabase = get_supabase_client()
+            summary = AnalysisController.run_plagiarism_detection(supabase, assignment_id, mode)
+            
+            return jsonify(summary), 200
+            
+        except Exception as e:
+            print(f"Error detecting plagiarism: {str(e)}")
+            print(traceback.format_exc())
+            return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+    
+    @staticmethod
+    def run_plagiarism_detection(supabase, assignment_id, mode, progress_callback=None):
+        """Compare all submissions of an assignment and save the reports"""
+        # Get all submissions for the assignment
+        result = supabase.table('code_submissions').select('*').eq('assignment_id', assignment_id).execute()
+        
+        if not result.data or len(result.data) < 2:
+            return {
+                "assignment_id": assignment_id,
+                "message": "Not enough submissions to compare",
+                "plagiarism_cases": []
+            }
+        
+        submissions = load_code(supabase, result.data)
+        
+        # Prepare data for comparison
+        comparison_data = [AnalysisController._comparison_entry(sub) for sub in submissions]
+        
+        # Detect plagiarism
+        threshold = float(os.getenv('PLAGIARISM_THRESHOLD', 0.75))
+        workers = int(os.getenv('PLAGIARISM_WORKERS', 0))  # 0 = one per CPU core
+        detector = PlagiarismDetector(threshold=threshold, mode=mode, workers=workers)
+        
+        # Reuse fingerprint profiles computed at upload time
+        profile_stats = attach_profiles(supabase, comparison_data, detector)
+        
+        plagiarism_cases = detector.compare_submissions(comparison_data, progress_callback)
+        
+        # Save plagiarism reports
+        report_writes = AnalysisController.save_plagiarism_reports(supabase, assignment_id, plagiarism_cases)
+        
+        return {
+            "assignment_id": assignment_id,
+            "submissions_analyzed": len(submissions),
+            "plagiarism_cases_found": len(plagiarism_cases),
+            "threshold": threshold,
+            "mode": mode,
+            "pairs_total": detector.last_stats['total_pairs'],
+            "pairs_compared": detector.last_stats['compared_pairs'],
+            "pairs_pruned": detector.last_stats['pruned_pairs'],
+            "workers": detector.last_stats['workers'],
+            "profiles_reused": profile_stats['profiles_reused'],
+            "profiles_built": profile_stats['profiles_built'],
+            "report_writes": report_writes,
+            "plagiarism_cases": plagiarism_cases
+        }
+    
+    @staticmethod
+    def enqueue_plagiarism_job(assignment_id, mode=None):
+        """Queue plagiarism detection for an assignment and return the job id"""
+        try:
+            mode = mode or os.getenv('PLAGIARISM_MODE', 'exhaustive')
+            if mode not in MODES:
+                return jsonify({"error": f"Invalid mode, expected one of: {', '.join(MODES)}"}), 400
+            
+            job_id = get_job_queue().submit(
+                'plagiarism',
+                {"assignment_id": assignment_id, "mode": mode},
+                AnalysisController._plagiarism_job
+            )
+            
+            return jsonify({
+                "job_id": job_id,
+                "status": JOB_QUEUED,
+                "status_url": f"/api/analysis/jobs/{job_id}"
+            }), 202
+            
+        except Exception as e:
+            print(f"Error enqueuing plagiarism job: {str(e)}")
+            print(traceback.format_exc())
+            return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+    
+    @staticmethod
+    def _plagiarism_job(progress, assignment_id, mode):
+        """Job body: run detection while reporting pair progress"""
+        supabase = get_supabase_client()
+        return AnalysisController.run_plagiarism_detection(supabase, assignment_id, mode, progress.update)
+    
+    @staticmethod
+    def get_job_status(job_id):
+        """Get status, progress, ETA and partial results of a background job"""
+        try:
+            job = get_job_queue().get(job_id)
+            
+            if not job:
+                return jsonify({"error": "Job not found"}), 404
+            
+            return jsonify(job), 200
+            
+        except Exception as e:
+            print(f"Error fetching job status: {str(e)}")
+            return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+    
+    @staticmethod
+    def detect_plagiarism_for_submission(submission_id, mode=None):
+        """Compare one submission against the rest of its assignment"""
+        try:
+            mode = mode or os.getenv('PLAGIARISM_MODE', 'exhaustive')
+            if mode not in MODES:
+                return jsonify({"error": f"Invalid mode, expected one of: {', '.join(MODES)}"}), 400
+            
+            supabase = get_supabase_client()
+            
+            result = supabase.table('code_submissions').select('*').eq('id', submission_id).execute()
+            
+            if not result.data:
+                return jsonify({"error": "Submission not found"}), 404
+            
+            submission = load_code(supabase, result.data)[0]
+            summary = AnalysisController.run_incremental_detection(supabase, submission, mode)
+            
+            return jsonify(summary), 200
+            
+        except Exception as e:
+            print(f"Error detecting plagiarism for submission: {str(e)}")
+            print(traceback.format_exc())
+            return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+    
+    @staticmethod
+    def run_incremental_detection(supabase, submission, mode=None):
+        """Compare a new or changed submission against its assignment corpus and upsert affected reports"""
+        mode = mode or os.getenv('PLAGIARISM_MODE', 'exhaustive')
+        assignment_id = submission['assignment_id']
+        
+        # Get the rest of the assignment
+        result = supabase.table('code_submissions').select('*').eq('assignment_id', assignment_id).neq('id', submission['id']).execute()
+        corpus = [AnalysisController._comparison_entry(sub) for sub in load_code(supabase, result.data or [])]
+        target = AnalysisController._comparison_entry(submission)
+        
+        threshold = float(os.getenv('PLAGIARISM_THRESHOLD', 0.75))
+        detector = PlagiarismDetector(threshold=threshold, mode=mode)
+        
+        plagiarism_cases = []
+        if corpus:
+            attach_profiles(supabase, corpus + [target], detector)
+            plagiarism_cases = detector.compare_against(target, corpus)
+        
+        # Existing reports of this submission, keyed by the other submission of the pair
+        existing_a = supabase.table('plagiarism_reports').select('id, submission_a_id, submission_b_id').eq('submission_a_id', submission['id']).execute()
+        existing_b = supabase.table('plagiarism_reports').select('id, submission_a_id, submission_b_id').eq('submission_b_id', submission['id']).execute()
+        existing = {report['submission_b_id']: report for report in existing_a.data or []}
+        existing.update({report['submission_a_id']: report for report in existing_b.data or []})
+        
+        # compare_against puts the existing submission first
+        flagged = {case['submission_a_id'] for case in plagiarism_cases}
+        
+        # Drop reports of partners compared in this run that no longer exceed the threshold;
+        # partners fingerprint mode did not compare keep their reports
+        compared = set(detector.last_compared_ids) if corpus else set()
+        stale_ids = [
+            report['id'] for partner_id, report in existing.items()
+            if partner_id in compared and partner_id not in flagged
+        ]
+        if stale_ids:
+            supabase.table('plagiarism_reports').delete().in_('id', stale_ids).execute()
+        
+        report_writes = AnalysisController.save_plagiarism_reports(supabase, assignment_id, plagiarism_cases)
+        
+        return {
+            "assignment_id": assignment_id,
+            "submission_id": submission['id'],
+            "submissions_compared": detector.last_stats.get('compared_pairs', 0),
+            "corpus_size": len(corpus),
+            "plagiarism_cases_found": len(plagiarism_cases),
+            "threshold": threshold,
+            "mode": mode,
+            "report_writes": report_writes,
+            "plagiarism_cases": plagiarism_cases
+        }
+    
+    @staticmethod
+    def save_plagiarism_reports(supabase, assignment_id, plagiarism_cases):
+        """Bulk upsert the plagiarism_reports rows of the given cases, in chunks"""
+        start = time.perf_counter()
+        batch_size = int(os.getenv('REPORT_BATCH_SIZE', 500))
+        
+        rows = []
+        for case in plagiarism_cases:
+            AnalysisController._orient_case(case)
+            rows.append({
+                "assignment_id": assignment_id,
+                "submission_a_id": case['submission_a_id'],
+                "submission_b_id": case['submission_b_id'],
+                "student_a_id": case['student_a_id'],
+                "student_b_id": case['student_b_id'],
+                "similarity_score": case['similarity_score'],
+                "text_similarity": case['text_similarity'],
+                "structure_similarity": case['structure_similarity'],
+                "is_plagiarism": case['is_plagiarism'],
+                "details": case['details'],
+                "created_at": datetime.utcnow().isoformat()
+            })
+        
+        round_trips = 0
+        for offset in range(0, len(rows), batch_size):
+            supabase.table('plagiarism_reports').upsert(
+                rows[offset:offset + batch_size],
+                on_conflict='submission_a_id,submission_b_id'
+            ).execute()
+            round_trips += 1
+        
+        stats = {
+            "rows": len(rows),
+            "round_trips": round_trips,
+            # The previous write path did a SELECT plus an INSERT/UPDATE per case
+            "round_trips_saved": 2 * len(rows) - round_trips,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+        return stats
+    
+    @staticmethod
+    def _orient_case(case):
+        """Put the smaller submission id first, so a pair always maps to the same report row
+        
+        Lowercase UUID strings sort like Postgres sorts the uuid values.
+        """
+        if str(case['submission_a_id']) > str(case['submission_b_id']):
+            case['submission_a_id'], case['submission_b_id'] = case['submission_b_id'], case['submission_a_id']
+            case['student_a_id'], case['student_b_id'] = case['student_b_id'], case['student_a_id']
+        return case
+    
+    @staticmethod
+    def _comparison_entry(submission):
+        """Build the detector input for a code_submissions row"""
+        return {
+            'id': submission['id'],
+            'student_id': submission['student_id'],
+            'code': submission['code_content'],
+            'language': submission['file_extension'],
+            'content_hash': submission.get('content_hash')
+        }
+    
+    @staticmethod
+    def find_similar_submissions(submission_id, k=10, other_assignments=False, rescore=True):
+        """Top-k most similar submissions across the whole historical corpus"""
         try:
             supabase = get_supabase_client()
             
-            # Get all submissions for the assignment
-            result = supabase.table('code_submissions').select('*').eq('assignment_id', assignment_id).execute()
-            
-            if not result.data or len(result.data) < 2:
-                return jsonify({
-                    "assignment_id": assignment_id,
-                    "message": "Not enough submissions to compare",
-                    "plagiarism_cases": []
-                }), 200
-            
-            submissions = result.data
-            
-            # Prepare data for comparison
-            comparison_data = []
-            for sub in submissions:
-                comparison_data.append({
-                    'id': sub['id'],
-                    'student_id': sub['student_id'],
-                    'code': sub['code_content'],
-                    'language': sub['file_extension']
-                })
-            
-            # Detect plagiarism
-            threshold = float(os.getenv('PLAGIARISM_THRESHOLD', 0.75))
-            detector = PlagiarismDetector(threshold=threshold)
-            plagiarism_cases = detector.compare_submissions(comparison_data)
-            
-            # Save plagiarism reports
-            for case in plagiarism_cases:
-                report_data = {
-                    "assignment_id": assignment_id,
-                    "submission_a_id": case['submission_a_id'],
-                    "submission_b_id": case['submission_b_id'],
-                    "student_a_id": case['student_a_id'],
-                    "student_b_id": case['student_b_id'],
-                    "similarity_score": case['similarity_score'],
-                    "text_similarity": case['text_similarity'],
-                    "structure_similarity": case['structure_similarity'],
-                    "is_plagiarism": case['is_plagiarism'],
-                    "details": case['details'],
-                    "created_at": datetime.utcnow().isoformat()
+            result = supabase.table('code_submissions').select('*').eq('id', submission_id).execute()
+            
+            if not result.data:
+                return jsonify({"error": "Submission not found"}), 404
+            
+            submission = load_code(supabase, result.data)[0]
+            detector = PlagiarismDetector()
+            target = AnalysisController._comparison_entry(submission)
+            attach_profiles(supabase, [target], detector)
+            fingerprints = target['profile']['fingerprints']
+            
+            # Fetch a few extra candidates so rescoring can reorder them
+            limit = k * RESCORE_FACTOR if rescore else k
+            hits = search_corpus(
+                supabase, fingerprints, target['language'], submission_id, limit,
+                exclude_assignment=submission['assignment_id'] if other_assignments else None,
+                profile_version=target['profile']['profile_version']
+            )
+            
+            matches = [{
+                "submission_id": hit['submission_id'],
+                "assignment_id": hit['assignment_id'],
+                "shared_fingerprints": hit['shared'],
+                "containment": round(hit['shared'] / len(fingerprints), 4) if fingerprints else 0.0
+            } for hit in hits]
+            
+            if rescore and matches:
+                rows = supabase.table('code_submissions').select(
+                    'id, student_id, code_content, file_extension, content_hash'
+                ).in_('id', [match['submission_id'] for match in matches]).execute()
+                
+                candidates = {
+                    row['id']: AnalysisController._comparison_entry(row)
+                    for row in load_code(supabase, rows.data or [])
                 }
+                attach_profiles(supabase, list(candidates.values()), detector)
                 
-                # Check if report already exists
-                existing = supabase.table('plagiarism_reports').select('*').eq('submission_a_id', case['submission_a_id']).eq('submission_b_id', case['submission_b_id']).execute()
+                for match in matches:
+                    candidate = candidates.get(match['submission_id'])
+                    if candidate is None:
+                        continue
+                    similarity = detector.calculate_similarity(
+                        candidate['code'], target['code'], target['language'],
+                        candidate['profile'], target['profile']
+                    )
+                    match['student_id'] = candidate['student_id']
+                    match['similarity_score'] = similarity['overall_similarity']
+                    match['details'] = similarity['details']
                 
-                if existing.data:
-                    # Update
-                    supabase.table('plagiarism_reports').update(report_data).eq('id', existing.data[0]['id']).execute()
-                else:
-                    # Insert
-                    supabase.table('plagiarism_reports').insert(report_data).execute()
+                matches.sort(key=lambda match: match.get('similarity_score', 0.0), reverse=True)
+            
+            return jsonify({
+                "submission_id": submission_id,
+                "fingerprints": len(fingerprints),
+                "rescored": rescore,
+                "matches": matches[:k]
+            }), 200
+            
+        except Exception as e:
+            print(f"Error searching corpus: {str(e)}")
+            print(traceback.format_exc())
+            return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+    
+    @staticmethod
+    def index_assignment(assignment_id):
+        """Add every submission of an assignment to the corpus index (backfill)"""
+        try:
+            supabase = get_supabase_client()
+            
+            result = supabase.table('code_submissions').select(
+                'id, assignment_id, student_id, code_content, file_extension, content_hash'
+            ).eq('assignment_id', assignment_id).execute()
+            
+            submissions = load_code(supabase, result.data or [])
+            entries = [AnalysisController._comparison_entry(row) for row in submissions]
+            profile_stats = attach_profiles(supabase, entries, PlagiarismDetector())
+            
+            rows = []
+            for submission, entry in zip(submissions, entries):
+                rows.extend(posting_rows(submission, entry['profile']['fingerprints'], entry['profile']['profile_version']))
+            round_trips = index_postings(supabase, rows)
+            # Backfilling after a PROFILE_VERSION bump also clears the previous version's postings
+            purge_stale_postings(supabase, 'assignment_id', assignment_id)
             
             return jsonify({
                 "assignment_id": assignment_id,
-                "submissions_analyzed": len(submissions),
-                "plagiarism_cases_found": len(plagiarism_cases),
-                "threshold": threshold,
-                "plagiarism_cases": plagiarism_cases
+                "submissions_indexed": len(submissions),
+                "postings": len(rows),
+                "round_trips": round_trips,
+                **profile_stats
             }), 200
             
         except Exception as e:
-            print(f"Error detecting plagiarism: {str(e)}")
+            print(f"Error indexing assignment: {str(e)}")
             print(traceback.format_exc())
             return jsonify({"error": f"Internal server error: {str(e)}"}), 500
     
@@ -189,8 +490,7 @@ class AnalysisController:
             if not result_a.data or not result_b.data:
                 return jsonify({"error": "One or both submissions not found"}), 404
             
-            sub_a = result_a.data[0]
-            sub_b = result_b.data[0]
+            sub_a, sub_b = load_code(supabase, [result_a.data[0], result_b.data[0]])
             
             # Compare
             detector = PlagiarismDetector()
@@ -200,11 +500,8 @@ class AnalysisController:
                 sub_a['file_extension']
             )
             
-            # Get matching blocks
-            matching_blocks = detector.get_matching_blocks(
-                sub_a['code_content'],
-                sub_b['code_content']
-            )
+            # Aligned line ranges for side-by-side review
+            alignment, alignment_cached = get_alignment_cache().align(sub_a, sub_b)
             
             return jsonify({
                 "submission_a": {
@@ -218,7 +515,13 @@ class AnalysisController:
                     "filename": sub_b['filename']
                 },
                 "similarity": similarity,
-                "matching_blocks": len(matching_blocks),
+                "matching_blocks": len(alignment['blocks']),
+                "aligned_blocks": alignment['blocks'],
+                "coverage": {
+                    "submission_a": alignment['coverage_a'],
+                    "submission_b": alignment['coverage_b']
+                },
+                "alignment_cached": alignment_cached,
                 "is_plagiarism": similarity['overall_similarity'] >= 0.75
             }), 200
             
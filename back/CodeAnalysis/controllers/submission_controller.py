@@ -2,10 +2,26 @@ from flask import request, jsonify
 from werkzeug.utils import secure_filename
 from datetime import datetime
 from utils.supabase import get_supabase_client
-from utils.file_handler import allowed_file, get_file_extension, read_file_content, validate_file_size
-from utils.code_analyzer import CodeAnalyzer
+from utils.file_handler import (
+    allowed_file, get_file_extension, read_file_content,
+    open_zip_archive, zip_code_entries, read_zip_entry, MAX_BATCH_FILES
+)
+from utils.analysis_cache import get_analysis_cache, analysis_row
+from utils.fingerprint_index import content_hash, store_profile
+from utils.corpus_index import index_submission
+from utils.blob_store import compression_enabled, store_blobs, stored_submission, load_code
+from utils.pagination import list_columns, page_size, keyset_page
+from utils.job_queue import get_analysis_queue, get_job_queue, JOB_QUEUED, JOB_COMPLETED
+from controllers.analysis_controller import AnalysisController
+import functools
+import os
+import posixpath
 import traceback
 
+# Submissions per insert request, and decoded bytes buffered before a flush
+BATCH_INSERT_SIZE = 50
+BATCH_INSERT_BYTES = 4 * 1024 * 1024
+
 class SubmissionController:
     """Controller for handling code submissions"""
     
@@ -36,15 +52,9 @@ class SubmissionController:
                     "allowed_extensions": ["py", "js", "java", "cpp", "c", "cs", "ts", "jsx", "tsx", "html", "css"]
                 }), 400
             
-            # Validate file size
-            try:
-                file_size = validate_file_size(file)
-            except ValueError as e:
-                return jsonify({"error": str(e)}), 400
-            
-            # Read file content
+            # Read file content (the size limit is enforced while streaming)
             try:
-                content, encoding = read_file_content(file)
+                content, encoding, file_size = read_file_content(file)
             except ValueError as e:
                 return jsonify({"error": str(e)}), 400
             
@@ -60,47 +70,49 @@ class SubmissionController:
                 "filename": filename,
                 "file_extension": file_extension,
                 "code_content": content,
+                "content_hash": content_hash(content),
                 "file_size": file_size,
                 "encoding": encoding,
                 "submitted_at": datetime.utcnow().isoformat(),
                 "is_analyzed": False
             }
             
-            result = supabase.table('code_submissions').insert(submission_data).execute()
+            # The content itself goes to the compressed, deduplicated blob table
+            if compression_enabled():
+                store_blobs(supabase, [content])
+            
+            result = supabase.table('code_submissions').insert(stored_submission(submission_data)).execute()
             
             if not result.data:
                 return jsonify({"error": "Failed to save submission"}), 500
             
-            submission = result.data[0]
-            
-            # Analyze code immediately
-            analyzer = CodeAnalyzer(content, file_extension)
-            analysis = analyzer.analyze()
-            
-            # Save analysis result
-            analysis_data = {
-                "submission_id": submission['id'],
-                "is_valid": analysis['is_valid'],
-                "language": analysis['language'],
-                "errors": analysis['errors'],
-                "warnings": analysis['warnings'],
-                "metrics": analysis['metrics'],
-                "suggestions": analysis['suggestions'],
-                "analyzed_at": datetime.utcnow().isoformat()
-            }
+            submission = {**result.data[0], "code_content": content}
             
-            analysis_result = supabase.table('code_analysis').insert(analysis_data).execute()
+            # Analysis can run on the background pool so upload latency does not depend on the code
+            deferred = request.args.get('deferred', os.getenv('DEFERRED_ANALYSIS', 'false')).lower() == 'true'
+            
+            if deferred:
+                get_analysis_queue().submit(
+                    'analysis',
+                    {"submission_id": submission['id']},
+                    functools.partial(SubmissionController._analysis_job, submission=submission),
+                    job_id=SubmissionController._analysis_job_id(submission['id'])
+                )
+                
+                return jsonify({
+                    "message": "Submission uploaded, analysis queued",
+                    "submission": submission,
+                    "status": JOB_QUEUED,
+                    "status_url": f"/api/submissions/{submission['id']}/status"
+                }), 202
             
-            # Update submission as analyzed
-            supabase.table('code_submissions').update({
-                "is_analyzed": True,
-                "analysis_result": analysis
-            }).eq('id', submission['id']).execute()
+            analysis, plagiarism = SubmissionController.process_submission(supabase, submission)
             
             return jsonify({
                 "message": "Submission uploaded and analyzed successfully",
                 "submission": submission,
-                "analysis": analysis
+                "analysis": analysis,
+                "plagiarism": plagiarism
             }), 201
             
         except Exception as e:
@@ -109,17 +121,262 @@ class SubmissionController:
             return jsonify({"error": f"Internal server error: {str(e)}"}), 500
     
     @staticmethod
-    def get_submissions_by_assignment(assignment_id):
-        """Get all submissions for an assignment"""
+    def upload_batch():
+        """Upload a ZIP archive with the submissions of a whole class"""
+        try:
+            if 'file' not in request.files:
+                return jsonify({"error": "No file provided"}), 400
+            
+            assignment_id = request.form.get('assignment_id')
+            
+            if not assignment_id:
+                return jsonify({"error": "assignment_id is required"}), 400
+            
+            try:
+                archive = open_zip_archive(request.files['file'])
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            
+            with archive:
+                entries = zip_code_entries(archive)
+                code_paths = [info.filename for info in entries if allowed_file(info.filename)]
+                code_files = len(code_paths)
+                root_depth = SubmissionController._batch_root_depth(code_paths)
+                
+                if code_files > MAX_BATCH_FILES:
+                    return jsonify({"error": f"Archive has {code_files} code files, maximum is {MAX_BATCH_FILES}"}), 400
+                
+                supabase = get_supabase_client()
+                queue = get_analysis_queue()
+                created = []
+                skipped = []
+                chunk = []
+                chunk_bytes = 0
+                
+                def flush():
+                    if compression_enabled():
+                        store_blobs(supabase, [row['code_content'] for row in chunk])
+                    result = supabase.table('code_submissions').insert([stored_submission(row) for row in chunk]).execute()
+                    for row in result.data or []:
+                        queue.submit(
+                            'analysis',
+                            {"submission_id": row['id'], "detect_plagiarism": False},
+                            SubmissionController._analysis_job,
+                            job_id=SubmissionController._analysis_job_id(row['id'])
+                        )
+                        created.append({
+                            "id": row['id'],
+                            "student_id": row['student_id'],
+                            "filename": row['filename'],
+                            "status_url": f"/api/submissions/{row['id']}/status"
+                        })
+                
+                # Entries are decoded one at a time and inserted in bounded chunks
+                for info in entries:
+                    filename = secure_filename(posixpath.basename(info.filename))
+                    
+                    if not allowed_file(filename):
+                        skipped.append({"path": info.filename, "error": "File type not allowed"})
+                        continue
+                    
+                    try:
+                        content, encoding, file_size = read_zip_entry(archive, info)
+                    except ValueError as e:
+                        skipped.append({"path": info.filename, "error": str(e)})
+                        continue
+                    
+                    chunk.append({
+                        "assignment_id": assignment_id,
+                        "student_id": SubmissionController._batch_student_id(info.filename, root_depth),
+                        "filename": filename,
+                        "file_extension": get_file_extension(filename),
+                        "code_content": content,
+                        "content_hash": content_hash(content),
+                        "file_size": file_size,
+                        "encoding": encoding,
+                        "submitted_at": datetime.utcnow().isoformat(),
+                        "is_analyzed": False
+                    })
+                    chunk_bytes += file_size
+                    
+                    if len(chunk) >= BATCH_INSERT_SIZE or chunk_bytes >= BATCH_INSERT_BYTES:
+                        flush()
+                        chunk = []
+                        chunk_bytes = 0
+                
+                if chunk:
+                    flush()
+            
+            # One assignment-wide detection instead of an incremental run per file
+            plagiarism_job = None
+            if created and os.getenv('PLAGIARISM_ON_UPLOAD', 'true').lower() == 'true':
+                job_id = get_job_queue().submit(
+                    'plagiarism',
+                    {"assignment_id": assignment_id, "mode": os.getenv('PLAGIARISM_MODE', 'exhaustive')},
+                    AnalysisController._plagiarism_job
+                )
+                plagiarism_job = {"job_id": job_id, "status_url": f"/api/analysis/jobs/{job_id}"}
+            
+            return jsonify({
+                "message": f"{len(created)} submission(s) uploaded, analysis queued",
+                "assignment_id": assignment_id,
+                "submissions_created": len(created),
+                "submissions": created,
+                "skipped": skipped,
+                "plagiarism_job": plagiarism_job
+            }), 202
+            
+        except Exception as e:
+            print(f"Error uploading batch: {str(e)}")
+            print(traceback.format_exc())
+            return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+    
+    @staticmethod
+    def _batch_root_depth(paths):
+        """Number of leading folders shared by every path, like `assignment/` in `assignment/alice/a.py`
+        
+        A shared folder only counts while some path still has a folder below it, so
+        an archive of one student's folder (`alice/a.py`, `alice/b.py`) keeps it.
+        """
+        split = [[part for part in path.split('/') if part] for path in paths]
+        depth = 0
+        while split and all(len(parts) > depth + 1 for parts in split):
+            if len({parts[depth] for parts in split}) > 1:
+                break
+            if not any(len(parts) > depth + 2 for parts in split):
+                break
+            depth += 1
+        return depth
+    
+    @staticmethod
+    def _batch_student_id(path, root_depth=0):
+        """Student of an archive entry: its top-level folder below the shared root, or the file name without extension"""
+        parts = [part for part in path.split('/') if part][root_depth:]
+        if len(parts) > 1:
+            return parts[0]
+        return parts[0].rsplit('.', 1)[0]
+    
+    @staticmethod
+    def process_submission(supabase, submission, detect_plagiarism=True):
+        """Post-insert work: analysis, fingerprint profile, corpus index and incremental detection"""
+        content = submission['code_content']
+        file_extension = submission['file_extension']
+        
+        # Analyze code (resubmitted content is served from the analysis cache)
+        key, analysis, _ = get_analysis_cache().analyze(supabase, content, file_extension)
+        
+        # Save analysis result
+        analysis_data = analysis_row(submission['id'], key, analysis)
+        
+        supabase.table('code_analysis').insert(analysis_data).execute()
+        
+        # Update submission as analyzed
+        supabase.table('code_submissions').update({
+            "is_analyzed": True,
+            "analysis_result": analysis
+        }).eq('id', submission['id']).execute()
+        
+        # Precompute plagiarism fingerprints and add them to the corpus index
+        try:
+            profile = store_profile(supabase, content, file_extension)
+            index_submission(supabase, submission, profile)
+        except Exception as e:
+            print(f"Error storing fingerprint profile: {str(e)}")
+        
+        # Compare the new submission against the rest of the assignment
+        plagiarism = None
+        if detect_plagiarism and os.getenv('PLAGIARISM_ON_UPLOAD', 'true').lower() == 'true':
+            try:
+                plagiarism = AnalysisController.run_incremental_detection(supabase, submission)
+            except Exception as e:
+                print(f"Error running incremental plagiarism detection: {str(e)}")
+        
+        return analysis, plagiarism
+    
+    @staticmethod
+    def _analysis_job_id(submission_id):
+        """Job id of a submission's deferred analysis, derived so any process can look it up"""
+        return f"analysis-{submission_id}"
+    
+    @staticmethod
+    def _analysis_job(progress, submission_id, submission=None, detect_plagiarism=True):
+        """Job body: deferred post-upload processing of one submission"""
+        supabase = get_supabase_client()
+        
+        # Batch uploads queue only the id, so queued jobs do not hold every file in memory
+        if submission is None:
+            result = supabase.table('code_submissions').select('*').eq('id', submission_id).execute()
+            if not result.data:
+                raise ValueError(f"Submission {submission_id} not found")
+            # A job requeued after a worker exit may find its work already done
+            if result.data[0].get('is_analyzed'):
+                return {
+                    "submission_id": submission_id,
+                    "is_valid": (result.data[0].get('analysis_result') or {}).get('is_valid'),
+                    "plagiarism": None
+                }
+            submission = load_code(supabase, result.data)[0]
+        
+        analysis, plagiarism = SubmissionController.process_submission(supabase, submission, detect_plagiarism)
+        return {
+            "submission_id": submission_id,
+            "is_valid": analysis['is_valid'],
+            "plagiarism": plagiarism
+        }
+    
+    @staticmethod
+    def get_submission_status(submission_id):
+        """Get the analysis status of a submission"""
+        try:
+            supabase = get_supabase_client()
+            
+            result = supabase.table('code_submissions').select('id, is_analyzed').eq('id', submission_id).execute()
+            
+            if not result.data:
+                return jsonify({"error": "Submission not found"}), 404
+            
+            is_analyzed = bool(result.data[0].get('is_analyzed'))
+            job = get_analysis_queue().get(SubmissionController._analysis_job_id(submission_id))
+            
+            if job:
+                status = job['status']
+            else:
+                # Analyzed synchronously, or queued by a process on another host
+                status = JOB_COMPLETED if is_analyzed else JOB_QUEUED
+            
+            return jsonify({
+                "submission_id": submission_id,
+                "is_analyzed": is_analyzed,
+                "status": status,
+                "error": job['error'] if job else None,
+                "result": job['result'] if job else None
+            }), 200
+            
+        except Exception as e:
+            print(f"Error fetching submission status: {str(e)}")
+            return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+    
+    @staticmethod
+    def get_submissions_by_assignment(assignment_id, include=None, limit=None, cursor=None):
+        """Get one page of an assignment's submissions, metadata only unless include= asks for more"""
         try:
             supabase = get_supabase_client()
             
-            result = supabase.table('code_submissions').select('*').eq('assignment_id', assignment_id).execute()
+            try:
+                columns = list_columns(include)
+                query = supabase.table('code_submissions').select(columns).eq('assignment_id', assignment_id)
+                submissions, next_cursor = keyset_page(query, page_size(limit), cursor)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            
+            if 'code_content' in columns:
+                load_code(supabase, submissions)
             
             return jsonify({
                 "assignment_id": assignment_id,
-                "submissions": result.data,
-                "count": len(result.data)
+                "submissions": submissions,
+                "count": len(submissions),
+                "next_cursor": next_cursor
             }), 200
             
         except Exception as e:
@@ -137,7 +394,7 @@ class SubmissionController:
             if not result.data:
                 return jsonify({"error": "Submission not found"}), 404
             
-            submission = result.data[0]
+            submission = load_code(supabase, result.data)[0]
             
             # Get analysis if exists
             analysis_result = supabase.table('code_analysis').select('*').eq('submission_id', submission_id).execute()
@@ -152,22 +409,30 @@ class SubmissionController:
             return jsonify({"error": f"Internal server error: {str(e)}"}), 500
     
     @staticmethod
-    def get_student_submissions(student_id, assignment_id=None):
-        """Get all submissions for a student"""
+    def get_student_submissions(student_id, assignment_id=None, include=None, limit=None, cursor=None):
+        """Get one page of a student's submissions, metadata only unless include= asks for more"""
         try:
             supabase = get_supabase_client()
             
-            query = supabase.table('code_submissions').select('*').eq('student_id', student_id)
-            
-            if assignment_id:
-                query = query.eq('assignment_id', assignment_id)
+            try:
+                columns = list_columns(include)
+                query = supabase.table('code_submissions').select(columns).eq('student_id', student_id)
+                
+                if assignment_id:
+                    query = query.eq('assignment_id', assignment_id)
+                
+                submissions, next_cursor = keyset_page(query, page_size(limit), cursor)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
             
-            result = query.execute()
+            if 'code_content' in columns:
+                load_code(supabase, submissions)
             
             return jsonify({
                 "student_id": student_id,
-                "submissions": result.data,
-                "count": len(result.data)
+                "submissions": submissions,
+                "count": len(submissions),
+                "next_cursor": next_cursor
             }), 200
             
         except Exception as e:
@@ -0,0 +1,33 @@
+"""Production server settings: gunicorn -c gunicorn.conf.py main:app
+
+Requests spend most of their time waiting on Supabase, so each worker process
+serves them from a pool of threads. CPU-bound work is not isolated from those
+threads: synchronous /plagiarism/<id> runs, upload-time incremental detection
+and the in-process JobQueue threads all hold the worker's GIL while comparing,
+so requests on the same worker wait behind them. Only the other worker
+processes keep serving meanwhile; analysis alone runs in the sandbox processes.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# gthread workers heartbeat from their main loop, so this only catches a stuck
+# worker process, not a slow request
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+# Off by default: JobQueue jobs live in the worker process, and recycling it
+# kills them after graceful_timeout. Set it to return memory held by large
+# uploads only when no background jobs are in use.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = 200
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'info')
@@ -3,15 +3,34 @@ from flask_cors import CORS
 import os
 from routes.submission_routes import submission_bp
 from routes.analysis_routes import analysis_bp
+from controllers.analysis_controller import AnalysisController
+from controllers.submission_controller import SubmissionController
 from utils.supabase import get_supabase_client
+from utils.analyzers import warm_up
+from utils.sandbox import sandbox_enabled, warmup_extensions, preload_analyzers
+from utils.job_queue import get_analysis_queue, get_job_queue
 
 app = Flask(__name__)
 CORS(app)
 
+# Language analyzers load on first use; ANALYZER_WARMUP=all (or e.g. "py,java") loads them
+# ahead of time where analysis runs: in the sandbox's forkserver, or here without the sandbox
+_warmup = warmup_extensions()
+if _warmup:
+    if sandbox_enabled():
+        preload_analyzers(_warmup)
+    else:
+        warm_up(_warmup)
+
 # Register blueprints
 app.register_blueprint(submission_bp, url_prefix='/api/submissions')
 app.register_blueprint(analysis_bp, url_prefix='/api/analysis')
 
+# Open the job queues at start-up, so each worker takes over the jobs a recycled or
+# crashed worker left behind; both kinds are safe to run again from their params
+get_analysis_queue(resumable={'analysis': SubmissionController._analysis_job})
+get_job_queue(resumable={'plagiarism': AnalysisController._plagiarism_job})
+
 @app.route('/health', methods=['GET'])
 def health_check():
     return jsonify({"status": "healthy", "service": "code-analysis"}), 200
@@ -23,14 +42,23 @@ def root():
         "version": "1.0.0",
         "endpoints": [
             "/api/submissions/upload",
+            "/api/submissions/upload-batch",
+            "/api/submissions/<submission_id>/status",
             "/api/submissions/list/<assignment_id>",
             "/api/analysis/validate/<submission_id>",
+            "/api/analysis/cache/stats",
             "/api/analysis/plagiarism/<assignment_id>",
+            "/api/analysis/plagiarism/<assignment_id>/jobs",
+            "/api/analysis/jobs/<job_id>",
+            "/api/analysis/plagiarism/submission/<submission_id>",
+            "/api/analysis/corpus/similar/<submission_id>",
+            "/api/analysis/corpus/index/<assignment_id>",
             "/api/analysis/report/<submission_id>"
         ]
     }), 200
 
+# Development server only; production runs gunicorn -c gunicorn.conf.py main:app
 if __name__ == '__main__':
     print("🚀 Starting Code Analysis Service...")
     print(f"📊 Environment: {os.getenv('FLASK_ENV', 'production')}")
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(host='0.0.0.0', port=5000, debug=os.getenv('FLASK_ENV') == 'development', threaded=True)
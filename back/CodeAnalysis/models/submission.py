@@ -11,6 +11,7 @@ class Submission:
             self.filename = data.get('filename')
             self.file_extension = data.get('file_extension')
             self.code_content = data.get('code_content')
+            self.content_hash = data.get('content_hash')
             self.file_size = data.get('file_size')
             self.encoding = data.get('encoding')
             self.submitted_at = data.get('submitted_at')
@@ -26,6 +27,7 @@ class Submission:
             'filename': self.filename,
             'file_extension': self.file_extension,
             'code_content': self.code_content,
+            'content_hash': self.content_hash,
             'file_size': self.file_size,
             'encoding': self.encoding,
             'submitted_at': self.submitted_at,
@@ -8,10 +8,46 @@ def validate_code(submission_id):
     """Validate a code submission"""
     return AnalysisController.validate_code(submission_id)
 
+@analysis_bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get analysis cache hit/miss counters"""
+    return AnalysisController.get_cache_stats()
+
 @analysis_bp.route('/plagiarism/<assignment_id>', methods=['POST'])
 def detect_plagiarism(assignment_id):
     """Detect plagiarism for an assignment"""
-    return AnalysisController.detect_plagiarism(assignment_id)
+    mode = request.args.get('mode')
+    return AnalysisController.detect_plagiarism(assignment_id, mode)
+
+@analysis_bp.route('/plagiarism/<assignment_id>/jobs', methods=['POST'])
+def enqueue_plagiarism_job(assignment_id):
+    """Queue plagiarism detection for an assignment"""
+    mode = request.args.get('mode')
+    return AnalysisController.enqueue_plagiarism_job(assignment_id, mode)
+
+@analysis_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Get the status of a background job"""
+    return AnalysisController.get_job_status(job_id)
+
+@analysis_bp.route('/plagiarism/submission/<submission_id>', methods=['POST'])
+def detect_plagiarism_for_submission(submission_id):
+    """Incrementally detect plagiarism for a single submission"""
+    mode = request.args.get('mode')
+    return AnalysisController.detect_plagiarism_for_submission(submission_id, mode)
+
+@analysis_bp.route('/corpus/similar/<submission_id>', methods=['GET'])
+def find_similar_submissions(submission_id):
+    """Find the most similar submissions across all assignments"""
+    k = min(max(request.args.get('k', 10, type=int), 1), 100)
+    other_assignments = request.args.get('other_assignments', 'false').lower() == 'true'
+    rescore = request.args.get('rescore', 'true').lower() == 'true'
+    return AnalysisController.find_similar_submissions(submission_id, k, other_assignments, rescore)
+
+@analysis_bp.route('/corpus/index/<assignment_id>', methods=['POST'])
+def index_assignment(assignment_id):
+    """Add an assignment's submissions to the corpus index"""
+    return AnalysisController.index_assignment(assignment_id)
 
 @analysis_bp.route('/report/<submission_id>', methods=['GET'])
 def get_plagiarism_report(submission_id):
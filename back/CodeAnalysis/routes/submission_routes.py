@@ -8,21 +8,42 @@ def upload_submission():
     """Upload a new code submission"""
     return SubmissionController.upload_submission()
 
+@submission_bp.route('/upload-batch', methods=['POST'])
+def upload_batch():
+    """Upload a ZIP archive of submissions"""
+    return SubmissionController.upload_batch()
+
 @submission_bp.route('/list/<assignment_id>', methods=['GET'])
 def get_submissions_by_assignment(assignment_id):
-    """Get all submissions for an assignment"""
-    return SubmissionController.get_submissions_by_assignment(assignment_id)
+    """Get a page of submissions for an assignment"""
+    return SubmissionController.get_submissions_by_assignment(
+        assignment_id,
+        include=request.args.get('include'),
+        limit=request.args.get('limit', type=int),
+        cursor=request.args.get('cursor')
+    )
 
 @submission_bp.route('/<submission_id>', methods=['GET'])
 def get_submission_by_id(submission_id):
     """Get a specific submission"""
     return SubmissionController.get_submission_by_id(submission_id)
 
+@submission_bp.route('/<submission_id>/status', methods=['GET'])
+def get_submission_status(submission_id):
+    """Get the analysis status of a submission"""
+    return SubmissionController.get_submission_status(submission_id)
+
 @submission_bp.route('/student/<student_id>', methods=['GET'])
 def get_student_submissions(student_id):
-    """Get all submissions for a student"""
+    """Get a page of submissions for a student"""
     assignment_id = request.args.get('assignment_id')
-    return SubmissionController.get_student_submissions(student_id, assignment_id)
+    return SubmissionController.get_student_submissions(
+        student_id,
+        assignment_id,
+        include=request.args.get('include'),
+        limit=request.args.get('limit', type=int),
+        cursor=request.args.get('cursor')
+    )
 
 @submission_bp.route('/<submission_id>', methods=['DELETE'])
 def delete_submission(submission_id):
@@ -7,7 +7,8 @@ CREATE TABLE IF NOT EXISTS code_submissions (
     student_id TEXT NOT NULL,
     filename TEXT NOT NULL,
     file_extension TEXT NOT NULL,
-    code_content TEXT NOT NULL,
+    code_content TEXT,
+    content_hash TEXT,
     file_size INTEGER NOT NULL,
     encoding TEXT DEFAULT 'utf-8',
     submitted_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
@@ -27,6 +28,8 @@ CREATE TABLE IF NOT EXISTS code_analysis (
     warnings JSONB DEFAULT '[]',
     metrics JSONB DEFAULT '{}',
     suggestions JSONB DEFAULT '[]',
+    analysis_key TEXT,
+    analyzer_version INTEGER,
     analyzed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -48,15 +51,119 @@ CREATE TABLE IF NOT EXISTS plagiarism_reports (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Table for storing derived plagiarism artifacts, computed once per distinct content
+CREATE TABLE IF NOT EXISTS submission_fingerprints (
+    content_hash TEXT NOT NULL,
+    language TEXT NOT NULL,
+    profile_version INTEGER NOT NULL,
+    normalized_code TEXT NOT NULL,
+    tokens JSONB DEFAULT '[]',
+    structure JSONB,
+    fingerprints JSONB DEFAULT '[]',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (content_hash, language)
+);
+
+-- Table for storing compressed submission content, one row per distinct content
+CREATE TABLE IF NOT EXISTS code_blobs (
+    content_hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    data TEXT NOT NULL,
+    original_size INTEGER NOT NULL,
+    compressed_size INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Inverted index of winnowed fingerprints across all assignments (fingerprint -> submissions)
+CREATE TABLE IF NOT EXISTS fingerprint_postings (
+    fingerprint BIGINT NOT NULL,
+    submission_id UUID NOT NULL REFERENCES code_submissions(id) ON DELETE CASCADE,
+    assignment_id TEXT NOT NULL,
+    language TEXT NOT NULL,
+    profile_version INTEGER NOT NULL DEFAULT 0,
+    indexed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (fingerprint, submission_id)
+);
+
+-- Migrations for existing deployments
+ALTER TABLE code_submissions ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE code_submissions ALTER COLUMN code_content DROP NOT NULL;
+ALTER TABLE code_analysis ADD COLUMN IF NOT EXISTS analysis_key TEXT;
+ALTER TABLE code_analysis ADD COLUMN IF NOT EXISTS analyzer_version INTEGER;
+-- Postings indexed before versioning count as stale until their submission is reindexed
+ALTER TABLE fingerprint_postings ADD COLUMN IF NOT EXISTS profile_version INTEGER NOT NULL DEFAULT 0;
+-- Aborted sandbox results are not reused; earlier versions stored them with a key
+UPDATE code_analysis SET analysis_key = NULL WHERE analysis_key IS NOT NULL AND metrics ? 'aborted';
+ALTER TABLE submission_fingerprints ALTER COLUMN structure TYPE JSONB USING to_jsonb(structure);
+
 -- Indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_submissions_assignment ON code_submissions(assignment_id);
 CREATE INDEX IF NOT EXISTS idx_submissions_student ON code_submissions(student_id);
 CREATE INDEX IF NOT EXISTS idx_submissions_submitted ON code_submissions(submitted_at DESC);
+-- Keyset pagination of the list endpoints: (submitted_at, id) within an assignment or student
+CREATE INDEX IF NOT EXISTS idx_submissions_assignment_page ON code_submissions(assignment_id, submitted_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_submissions_student_page ON code_submissions(student_id, submitted_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_submissions_content_hash ON code_submissions(content_hash);
 CREATE INDEX IF NOT EXISTS idx_analysis_submission ON code_analysis(submission_id);
+CREATE INDEX IF NOT EXISTS idx_analysis_key ON code_analysis(analysis_key);
 CREATE INDEX IF NOT EXISTS idx_plagiarism_assignment ON plagiarism_reports(assignment_id);
 CREATE INDEX IF NOT EXISTS idx_plagiarism_submission_a ON plagiarism_reports(submission_a_id);
 CREATE INDEX IF NOT EXISTS idx_plagiarism_submission_b ON plagiarism_reports(submission_b_id);
 CREATE INDEX IF NOT EXISTS idx_plagiarism_score ON plagiarism_reports(similarity_score DESC);
+-- Conflict target of the bulk report upsert. Reports store the smaller submission id
+-- first; older deployments may hold duplicate or reversed pairs, so keep the newest
+-- report of each pair (ties broken by id) and flip the reversed ones first.
+DELETE FROM plagiarism_reports a USING plagiarism_reports b
+    WHERE LEAST(a.submission_a_id, a.submission_b_id) = LEAST(b.submission_a_id, b.submission_b_id)
+    AND GREATEST(a.submission_a_id, a.submission_b_id) = GREATEST(b.submission_a_id, b.submission_b_id)
+    AND (a.updated_at < b.updated_at OR (a.updated_at = b.updated_at AND a.id < b.id));
+UPDATE plagiarism_reports
+    SET submission_a_id = submission_b_id, submission_b_id = submission_a_id,
+        student_a_id = student_b_id, student_b_id = student_a_id
+    WHERE submission_a_id > submission_b_id;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_plagiarism_pair ON plagiarism_reports(submission_a_id, submission_b_id);
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'plagiarism_pair_ordered') THEN
+        ALTER TABLE plagiarism_reports
+            ADD CONSTRAINT plagiarism_pair_ordered CHECK (submission_a_id < submission_b_id);
+    END IF;
+END $$;
+CREATE INDEX IF NOT EXISTS idx_postings_submission ON fingerprint_postings(submission_id);
+
+-- Top-k corpus search: count shared fingerprints per submission, skipping over-common ones.
+-- Only postings of the query's profile version match; fingerprints of other versions hash
+-- different token streams. Over-common posting lists are still counted, just not joined.
+DROP FUNCTION IF EXISTS search_fingerprint_corpus(BIGINT[], TEXT, UUID, TEXT, INTEGER, INTEGER);
+CREATE OR REPLACE FUNCTION search_fingerprint_corpus(
+    query_fingerprints BIGINT[],
+    query_language TEXT,
+    query_profile_version INTEGER,
+    exclude_submission UUID,
+    exclude_assignment TEXT DEFAULT NULL,
+    max_results INTEGER DEFAULT 10,
+    max_postings INTEGER DEFAULT 500
+)
+RETURNS TABLE (submission_id UUID, assignment_id TEXT, shared INTEGER) AS $$
+    WITH selective AS (
+        SELECT p.fingerprint
+        FROM fingerprint_postings p
+        WHERE p.fingerprint = ANY(query_fingerprints)
+        AND p.profile_version = query_profile_version
+        GROUP BY p.fingerprint
+        HAVING COUNT(*) <= max_postings
+    )
+    SELECT p.submission_id, p.assignment_id, COUNT(*)::INTEGER AS shared
+    FROM fingerprint_postings p
+    JOIN selective s ON s.fingerprint = p.fingerprint
+    WHERE p.language = query_language
+    AND p.profile_version = query_profile_version
+    AND p.submission_id <> exclude_submission
+    AND (exclude_assignment IS NULL OR p.assignment_id <> exclude_assignment)
+    GROUP BY p.submission_id, p.assignment_id
+    ORDER BY shared DESC
+    LIMIT max_results;
+$$ LANGUAGE sql STABLE;
 
 -- Trigger to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -77,3 +184,6 @@ CREATE TRIGGER update_plagiarism_reports_updated_at BEFORE UPDATE ON plagiarism_
 COMMENT ON TABLE code_submissions IS 'Stores student code submissions for assignments';
 COMMENT ON TABLE code_analysis IS 'Stores code analysis results including syntax validation and metrics';
 COMMENT ON TABLE plagiarism_reports IS 'Stores plagiarism detection results between submissions';
+COMMENT ON TABLE submission_fingerprints IS 'Stores normalized code, tokens, AST subtree hashes and winnowed fingerprints keyed by content hash';
+COMMENT ON TABLE code_blobs IS 'Stores zstd/zlib-compressed, base64-encoded submission content keyed by content hash; code_submissions.code_content is NULL for rows stored here';
+COMMENT ON TABLE fingerprint_postings IS 'Inverted index from winnowed fingerprint hashes to submissions, used for cross-assignment corpus search';
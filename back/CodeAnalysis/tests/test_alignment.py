@@ -0,0 +1,75 @@
+from utils.alignment import AlignmentCache, align_code, match_blocks
+
+ORIGINAL = '''def average(grades, weights):
+    total = 0
+    for index in range(len(grades)):
+        total += grades[index] * weights[index]
+    return total / max(sum(weights), 1)
+
+
+def best(grades, count):
+    result = sorted(grades, key=lambda v: -v)
+    if count > len(result):
+        count = len(result)
+    return result[:count]
+'''
+
+# Both functions renamed, swapped, commented and spaced out
+REORDERED = '''def mejores(notas, n):
+    # ordenar de mayor a menor
+    orden = sorted(notas, key=lambda x: -x)
+
+    if n > len(orden):
+        n = len(orden)
+    return orden[:n]
+
+
+def promedio(notas, pesos):
+    suma = 0
+    for i in range(len(notas)):
+        suma += notas[i] * pesos[i]
+    return suma / max(sum(pesos), 1)
+'''
+
+
+def test_moved_and_renamed_functions_align_across():
+    alignment = align_code(ORIGINAL, REORDERED, 'py')
+
+    assert [(block['a_start'], block['a_end'], block['b_start'], block['b_end']) for block in alignment['blocks']] == [
+        (1, 5, 10, 14),
+        (8, 12, 1, 7),
+    ]
+    assert alignment['coverage_a'] == alignment['coverage_b'] == 1.0
+
+
+def test_unrelated_code_has_no_blocks():
+    alignment = align_code(ORIGINAL, "import os\nprint(os.getcwd())\n", 'py')
+
+    assert alignment == {"blocks": [], "coverage_a": 0.0, "coverage_b": 0.0}
+
+
+def test_small_matches_are_not_reported():
+    assert align_code("x = 1\n", "y = 2\n", 'py', min_tokens=12)['blocks'] == []
+    assert len(align_code("x = 1\n", "y = 2\n", 'py', min_tokens=1)['blocks']) == 1
+
+
+def test_match_blocks_extends_anchors_over_repeated_lines():
+    a = ['p', 'x', 'x', 'q', 'r', 's', 't', 'x']
+    b = ['z', 'p', 'x', 'x', 'q', 'r', 's', 't']
+
+    assert match_blocks(a, b) == [(0, 1, 7)]
+
+
+def test_cache_serves_repeats_and_misses_edited_content():
+    cache = AlignmentCache(max_entries=2)
+    a = {"id": 'a', "code_content": ORIGINAL, "file_extension": 'py'}
+    b = {"id": 'b', "code_content": REORDERED, "file_extension": 'py'}
+
+    first, cached = cache.align(a, b)
+    assert not cached
+    assert cache.align(a, b) == (first, True)
+
+    edited = {**b, "code_content": REORDERED + "print(promedio([1], [1]))\n"}
+    assert not cache.align(a, edited)[1]
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['entries'] == 2
@@ -0,0 +1,77 @@
+import utils.analysis_cache as analysis_cache
+from utils.analysis_cache import AnalysisCache, analysis_key, analysis_row, TIER_MEMORY, TIER_MISS
+from utils.sandbox import aborted_result, ABORT_TIMEOUT
+
+
+class Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class AnalysisTable:
+    """code_analysis lookups by analysis_key"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = {}
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def limit(self, count):
+        return self
+
+    def execute(self):
+        return Result([row for row in self.rows if all(row.get(k) == v for k, v in self.filters.items())])
+
+
+class AnalysisStore:
+    def __init__(self, rows=None):
+        self.rows = rows or []
+
+    def table(self, name):
+        return AnalysisTable(self.rows)
+
+
+def counting_analysis(results):
+    calls = []
+
+    def run_analysis(code, language):
+        calls.append(code)
+        return results[min(len(calls), len(results)) - 1]
+
+    return run_analysis, calls
+
+
+def test_successful_analysis_is_served_from_memory(monkeypatch):
+    ok = {"is_valid": True, "language": "py", "errors": [], "warnings": [], "metrics": {},
+          "suggestions": [], "code_length": 1, "lines_of_code": 1}
+    run_analysis, calls = counting_analysis([ok])
+    monkeypatch.setattr(analysis_cache, 'run_analysis', run_analysis)
+    cache = AnalysisCache()
+
+    assert cache.analyze(AnalysisStore(), "x = 1", "py")[2] == TIER_MISS
+    assert cache.analyze(AnalysisStore(), "x = 1", "py")[2] == TIER_MEMORY
+    assert len(calls) == 1
+
+
+def test_aborted_analysis_is_not_cached_in_either_tier(monkeypatch):
+    code = "x = 1"
+    timeout = aborted_result(code, "py", ABORT_TIMEOUT, 30)
+    run_analysis, calls = counting_analysis([timeout])
+    monkeypatch.setattr(analysis_cache, 'run_analysis', run_analysis)
+    cache = AnalysisCache()
+
+    key, analysis, tier = cache.analyze(AnalysisStore(), code, "py")
+    assert tier == TIER_MISS
+    assert analysis_row("sub-1", key, analysis)["analysis_key"] is None
+
+    # A row persisted with a key by an older version is ignored too
+    stale = {**analysis_row("sub-1", key, analysis), "analysis_key": analysis_key(code, "py")}
+    assert cache.analyze(AnalysisStore([stale]), code, "py")[2] == TIER_MISS
+    assert len(calls) == 2
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,24 @@
+from controllers.submission_controller import SubmissionController
+
+
+def students(paths):
+    depth = SubmissionController._batch_root_depth(paths)
+    return [SubmissionController._batch_student_id(path, depth) for path in paths]
+
+
+def test_student_folders_at_the_top_level():
+    assert students(['alice/a.py', 'bob/b.py', 'carol.py']) == ['alice', 'bob', 'carol']
+
+
+def test_shared_root_folder_is_skipped():
+    paths = ['assignment/alice/a.py', 'assignment/alice/util/b.py', 'assignment/bob/main.py']
+
+    assert students(paths) == ['alice', 'alice', 'bob']
+
+
+def test_nested_shared_roots_are_skipped():
+    assert students(['course/hw1/alice/a.py', 'course/hw1/bob/b.py']) == ['alice', 'bob']
+
+
+def test_single_student_folder_is_kept():
+    assert students(['alice/a.py', 'alice/b.py']) == ['alice', 'alice']
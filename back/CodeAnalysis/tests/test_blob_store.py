@@ -0,0 +1,98 @@
+import pytest
+
+from utils.blob_store import CODEC_ZLIB, LOOKUP_BATCH_SIZE, compress, decompress, load_code, store_blobs, stored_submission
+from utils.fingerprint_index import content_hash
+
+
+class Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class BlobTable:
+    def __init__(self, blobs, lookups):
+        self.blobs = blobs
+        self.lookups = lookups
+        self.hashes = None
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False):
+        for row in rows:
+            self.blobs.setdefault(row[on_conflict], row)
+        return self
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.lookups.append(len(values))
+        self.hashes = set(values)
+        return self
+
+    def execute(self):
+        if self.hashes is None:
+            return Result([])
+        return Result([blob for key, blob in self.blobs.items() if key in self.hashes])
+
+
+class BlobStore:
+    def __init__(self):
+        self.blobs = {}
+        self.lookups = []
+        self.queries = 0
+
+    def table(self, name):
+        self.queries += 1
+        return BlobTable(self.blobs, self.lookups)
+
+
+def test_compress_round_trip():
+    code = "def greet(name):\n    return f'hola {name} ñ ✓'\n" * 50
+    for codec in (None, CODEC_ZLIB):
+        assert decompress(*compress(code, codec)) == code
+
+
+def test_stored_rows_load_back_from_blobs(monkeypatch):
+    monkeypatch.setenv('COMPRESSED_STORAGE', 'true')
+    store = BlobStore()
+    contents = ["print('a')\n", "print('b')\n", "print('a')\n"]
+
+    assert store_blobs(store, contents) == 2
+    rows = [
+        stored_submission({"id": index, "content_hash": content_hash(content), "code_content": content})
+        for index, content in enumerate(contents)
+    ]
+    assert all(row['code_content'] is None for row in rows)
+
+    store.queries = 0
+    loaded = load_code(store, rows)
+
+    assert [row['code_content'] for row in loaded] == contents
+    assert store.queries == 1
+
+
+def test_inline_rows_need_no_blob_query():
+    store = BlobStore()
+    rows = [{"id": 1, "content_hash": 'h1', "code_content": "x = 1\n"}]
+
+    assert load_code(store, rows) == rows
+    assert store.queries == 0
+
+
+def test_large_assignments_are_looked_up_in_batches():
+    store = BlobStore()
+    contents = [f"print({index})\n" for index in range(2 * LOOKUP_BATCH_SIZE + 50)]
+    store_blobs(store, contents)
+    rows = [{"id": index, "content_hash": content_hash(content), "code_content": None}
+            for index, content in enumerate(contents)]
+
+    loaded = load_code(store, rows)
+
+    assert [row['code_content'] for row in loaded] == contents
+    assert store.lookups == [LOOKUP_BATCH_SIZE, LOOKUP_BATCH_SIZE, 50]
+
+
+def test_missing_blob_is_an_error():
+    rows = [{"id": 7, "content_hash": 'gone', "code_content": None}]
+
+    with pytest.raises(ValueError, match='7 \\(gone\\)'):
+        load_code(BlobStore(), rows)
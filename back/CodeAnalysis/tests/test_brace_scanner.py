@@ -0,0 +1,118 @@
+from utils.analyzers.brace_scanner import scan_braces
+from utils.code_analyzer import CodeAnalyzer
+
+
+def test_java_text_block_is_a_literal():
+    code = (
+        'public class Note {\n'
+        '    String text = """\n'
+        '        He said "hi" and it\'s { open\n'
+        '        """;\n'
+        '    public static void main(String[] args) {}\n'
+        '}\n'
+    )
+    scan = scan_braces(code, 'java')
+
+    assert scan["errors"] == []
+    assert scan["classes"] == 1
+    assert scan["declarations"] == 1
+    assert scan["has_main"]
+
+
+def test_jsx_text_apostrophe_is_not_an_unterminated_string():
+    code = "export default function App() {\n    return <p>Don't</p>;\n}\n"
+    result = CodeAnalyzer(code, 'js').analyze()
+
+    assert result["is_valid"]
+    assert result["errors"] == []
+
+
+def test_unterminated_string_outside_jsx_is_reported():
+    assert scan_braces('const s = "abc;\n', 'js')["errors"] == ["Unterminated string literal at line 1"]
+
+
+def test_bracket_errors_point_at_lines():
+    code = "int main(void) {\n    if (ready) {\n        run(];\n    }\n"
+
+    assert scan_braces(code, 'c')["errors"] == [
+        "Unmatched ']' at line 3",
+        "Unclosed '(' opened at line 3 before '}' at line 4",
+        "Unclosed '{' opened at line 1",
+    ]
+
+
+def test_brackets_in_comments_and_literals_are_ignored():
+    code = (
+        '#include <stdio.h>\n'
+        '#define OPEN {\n'
+        'static int *pick(int (*cb)(int), int n) {\n'
+        '    /* } ( */\n'
+        '    char c = \'{\';\n'
+        '    for (int i = 0; i < n; i++) { printf("%d)\\n", cb(i)); }\n'
+        '    return 0;\n'
+        '}\n'
+    )
+    scan = scan_braces(code, 'c')
+
+    assert scan["errors"] == []
+    assert scan["includes"] == 1
+    assert scan["declarations"] == 1
+    assert not scan["has_main"]
+
+
+def test_javascript_regex_and_template_literals():
+    code = (
+        "import fs from 'fs';\n"
+        "const path = require('path');\n"
+        "const pattern = /[({]+/g, half = total / 2 / 3;\n"
+        "const label = `open ( ${path.sep}`;\n"
+        "var items = list.map((item) => item.size);\n"
+        "console.log(label);\n"
+    )
+    scan = scan_braces(code, 'js')
+
+    assert scan["errors"] == []
+    assert scan["imports"] == 2
+    assert scan["functions"] == 1
+    assert scan["var_declarations"] == 1
+    assert scan["console_logs"] == 1
+
+
+def test_java_abstract_methods_count_outside_bodies_only():
+    code = (
+        'interface Shape { double area(); }\n'
+        'abstract class Base {\n'
+        '    abstract void draw(int x);\n'
+        '    void run() { draw(1); helper(2); }\n'
+        '}\n'
+    )
+
+    assert scan_braces(code, 'java')["declarations"] == 3
+
+
+def test_broken_files_with_literals_report_line_numbers():
+    c_code = (
+        '#include <stdio.h>\n'
+        '/* helper ( */\n'
+        'int main(void) {\n'
+        '    printf("total: %d)\\n", 1);\n'
+        '    char c = \'}\';\n'
+        '    if (1) {\n'
+        '        return 0;\n'
+        '}\n'
+    )
+    assert scan_braces(c_code, 'c')["errors"] == ["Unclosed '{' opened at line 3"]
+
+    java_code = (
+        'import java.util.List;\n'
+        'class A {\n'
+        '    // closes } here\n'
+        '    String s = "(";\n'
+        '    void f() {\n'
+        '        int x = (1 + 2;\n'
+        '    }\n'
+        '}\n'
+    )
+    result = CodeAnalyzer(java_code, 'java').analyze()
+    assert result["errors"] == ["Unclosed '(' opened at line 6 before '}' at line 7"]
+    assert result["metrics"]["classes"] == 1
@@ -0,0 +1,79 @@
+from utils.corpus_index import index_submission, search_corpus
+from utils.plagiarism_detector import PROFILE_VERSION, PlagiarismDetector
+
+
+class Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class PostingsTable:
+    def __init__(self, store):
+        self.store = store
+        self.filters = []
+
+    def upsert(self, rows, on_conflict=None):
+        for row in rows:
+            self.store.rows[(row['fingerprint'], row['submission_id'])] = row
+        return self
+
+    def delete(self):
+        self.filters.append(('delete', None, None))
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(('eq', column, value))
+        return self
+
+    def neq(self, column, value):
+        self.filters.append(('neq', column, value))
+        return self
+
+    def execute(self):
+        if self.filters and self.filters[0][0] == 'delete':
+            def matches(row):
+                return all(
+                    (row[column] == value) if op == 'eq' else (row[column] != value)
+                    for op, column, value in self.filters[1:]
+                )
+            self.store.rows = {key: row for key, row in self.store.rows.items() if not matches(row)}
+        return Result([])
+
+
+class PostingsStore:
+    def __init__(self):
+        self.rows = {}
+        self.calls = []
+
+    def table(self, name):
+        return PostingsTable(self)
+
+    def rpc(self, name, params):
+        self.calls.append((name, params))
+        return PostingsTable(self)
+
+
+SUBMISSION = {"id": 's1', "assignment_id": 'a1', "file_extension": 'py'}
+
+
+def test_postings_carry_their_profile_version_and_replace_older_ones():
+    profile = PlagiarismDetector().build_profile("def add(a, b):\n    total = a + b\n    return total\n", 'py')
+    store = PostingsStore()
+    store.rows[(-1, 's1')] = dict(SUBMISSION, fingerprint=-1, submission_id='s1', language='py',
+                                  profile_version=PROFILE_VERSION - 1)
+    store.rows[(-1, 's2')] = dict(store.rows[(-1, 's1')], submission_id='s2')
+
+    count = index_submission(store, SUBMISSION, profile)
+
+    own = [row for row in store.rows.values() if row['submission_id'] == 's1']
+    assert count == len(own) == len(set(profile['fingerprints']))
+    assert {row['profile_version'] for row in own} == {PROFILE_VERSION}
+    assert (-1, 's2') in store.rows
+
+
+def test_search_only_matches_the_query_profile_version():
+    store = PostingsStore()
+    search_corpus(store, [1, 2], 'py', 's1', 5)
+
+    name, params = store.calls[0]
+    assert params["query_profile_version"] == PROFILE_VERSION
@@ -0,0 +1,62 @@
+from utils.fingerprint_index import LOOKUP_BATCH_SIZE, attach_profiles, content_hash, _profile_row
+from utils.plagiarism_detector import PlagiarismDetector
+
+
+class Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class ProfileTable:
+    def __init__(self, store):
+        self.store = store
+        self.hashes = None
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.store.lookups.append(len(values))
+        self.hashes = set(values)
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.store.upserts.append(len(rows))
+        for row in rows:
+            self.store.rows[row['content_hash']] = row
+        return self
+
+    def execute(self):
+        if self.hashes is None:
+            return Result([])
+        return Result([row for key, row in self.store.rows.items() if key in self.hashes])
+
+
+class ProfileStore:
+    def __init__(self):
+        self.rows = {}
+        self.lookups = []
+        self.upserts = []
+
+    def table(self, name):
+        return ProfileTable(self)
+
+
+def test_profile_lookups_are_split_into_batches():
+    detector = PlagiarismDetector()
+    submissions = [
+        {"code": f"def f{index}(x):\n    return x * {index}\n", "language": 'py'}
+        for index in range(2 * LOOKUP_BATCH_SIZE + 50)
+    ]
+    store = ProfileStore()
+    for sub in submissions[:100]:
+        store.rows[content_hash(sub['code'])] = _profile_row(
+            content_hash(sub['code']), detector.build_profile(sub['code'], 'py')
+        )
+
+    stats = attach_profiles(store, submissions, detector)
+
+    assert store.lookups == [LOOKUP_BATCH_SIZE, LOOKUP_BATCH_SIZE, 50]
+    assert stats == {"profiles_reused": 100, "profiles_built": 150}
+    assert store.upserts == [150]
+    assert all(sub['profile']['fingerprints'] is not None for sub in submissions)
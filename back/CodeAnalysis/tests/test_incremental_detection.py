@@ -0,0 +1,110 @@
+from controllers.analysis_controller import AnalysisController
+from utils.plagiarism_detector import MODE_FINGERPRINT
+
+from test_plagiarism_candidates import ORIGINAL, RENAMED, UNRELATED
+
+ORIGINAL_ID = "10000000-0000-4000-8000-000000000001"
+UNRELATED_ID = "20000000-0000-4000-8000-000000000002"
+TARGET_ID = "30000000-0000-4000-8000-000000000003"
+
+
+class Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class Query:
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+        self.action = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def neq(self, column, value):
+        self.filters.append(lambda row: row.get(column) != value)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def delete(self):
+        self.action = ('delete', None)
+        return self
+
+    def upsert(self, rows, on_conflict=None, **options):
+        self.action = ('upsert', (rows if isinstance(rows, list) else [rows], on_conflict.split(',')))
+        return self
+
+    def execute(self):
+        matching = [row for row in self.rows if all(check(row) for check in self.filters)]
+        if self.action is None:
+            return Result(matching)
+        kind, payload = self.action
+        if kind == 'delete':
+            self.rows[:] = [row for row in self.rows if row not in matching]
+            return Result(matching)
+        rows, keys = payload
+        for new in rows:
+            old = next((row for row in self.rows if all(row.get(k) == new.get(k) for k in keys)), None)
+            if old is not None:
+                old.update(new)
+            else:
+                self.rows.append({"id": f"report-{len(self.rows)}", **new})
+        return Result(rows)
+
+
+class Store:
+    def __init__(self, tables):
+        self.tables = tables
+
+    def table(self, name):
+        return Query(self.tables.setdefault(name, []))
+
+
+def submission(sub_id, code):
+    return {
+        "id": sub_id, "assignment_id": "hw1", "student_id": f"student-{sub_id}",
+        "code_content": code, "file_extension": 'py', "content_hash": None
+    }
+
+
+def report(report_id, a, b):
+    return {"id": report_id, "assignment_id": "hw1", "submission_a_id": a, "submission_b_id": b}
+
+
+def store_with_reports():
+    target = submission(TARGET_ID, RENAMED)
+    return target, Store({
+        "code_submissions": [submission(ORIGINAL_ID, ORIGINAL), submission(UNRELATED_ID, UNRELATED), target],
+        # The unrelated pair was reported by an earlier exhaustive run
+        "plagiarism_reports": [report("old-copy", ORIGINAL_ID, TARGET_ID), report("old-other", UNRELATED_ID, TARGET_ID)],
+    })
+
+
+def reported_pairs(store):
+    return {(row['submission_a_id'], row['submission_b_id']) for row in store.tables['plagiarism_reports']}
+
+
+def test_fingerprint_run_keeps_reports_of_partners_it_did_not_compare():
+    target, store = store_with_reports()
+
+    summary = AnalysisController.run_incremental_detection(store, target, MODE_FINGERPRINT)
+
+    assert summary['submissions_compared'] == 1
+    assert reported_pairs(store) == {(ORIGINAL_ID, TARGET_ID), (UNRELATED_ID, TARGET_ID)}
+
+
+def test_compared_partners_below_threshold_lose_their_reports(monkeypatch):
+    monkeypatch.setenv('PLAGIARISM_THRESHOLD', '0.999')
+    target, store = store_with_reports()
+
+    AnalysisController.run_incremental_detection(store, target, MODE_FINGERPRINT)
+
+    assert reported_pairs(store) == {(UNRELATED_ID, TARGET_ID)}
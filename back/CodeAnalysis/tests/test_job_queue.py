@@ -0,0 +1,117 @@
+import json
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+from utils.job_queue import JobQueue, JOB_COMPLETED, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, STALE_AFTER
+
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def insert_job(db_path, job_id, status, owner_pid, heartbeat_at, kind='analysis', params=None, queue=None):
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO jobs (id, kind, status, params, created_at, owner, owner_pid, heartbeat_at, queue) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (job_id, kind, status, json.dumps(params or {}), heartbeat_at, 'other-queue', owner_pid, heartbeat_at, queue)
+    )
+    conn.commit()
+    conn.close()
+
+
+def wait_for(queue, job_id, statuses, timeout=5):
+    deadline = time.time() + timeout
+    while queue.get(job_id)['status'] not in statuses:
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def test_start_up_fails_jobs_of_gone_or_stale_owners(tmp_path):
+    db_path = str(tmp_path / 'jobs.sqlite3')
+    JobQueue(db_path, 1)
+    now = time.time()
+    insert_job(db_path, 'crashed', JOB_RUNNING, exited_pid(), now)
+    insert_job(db_path, 'recycled', JOB_QUEUED, exited_pid(), now)
+    insert_job(db_path, 'hung', JOB_RUNNING, 1, now - STALE_AFTER - 1)
+    insert_job(db_path, 'live', JOB_RUNNING, 1, now)
+
+    queue = JobQueue(db_path, 1)
+
+    assert queue.get('crashed')['status'] == JOB_FAILED
+    assert queue.get('recycled')['status'] == JOB_FAILED
+    assert queue.get('hung')['status'] == JOB_FAILED
+    assert queue.get('crashed')['error']
+    assert queue.get('live')['status'] == JOB_RUNNING
+
+
+def test_queues_sharing_a_database_keep_each_others_jobs(tmp_path):
+    db_path = str(tmp_path / 'jobs.sqlite3')
+    release = threading.Event()
+    first = JobQueue(db_path, 1)
+    job_id = first.submit('plagiarism', {}, lambda progress: release.wait(5))
+    wait_for(first, job_id, (JOB_RUNNING,))
+
+    second = JobQueue(db_path, 1)
+    assert second.get(job_id)['status'] == JOB_RUNNING
+
+    release.set()
+    wait_for(first, job_id, (JOB_COMPLETED,))
+
+
+def test_databases_without_owner_columns_are_migrated(tmp_path):
+    db_path = str(tmp_path / 'jobs.sqlite3')
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, params TEXT, "
+        "total INTEGER DEFAULT 0, processed INTEGER DEFAULT 0, partial_results TEXT DEFAULT '[]', "
+        "result TEXT, error TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+    )
+    conn.execute("INSERT INTO jobs (id, kind, status, created_at) VALUES ('old', 'analysis', 'running', ?)", (time.time(),))
+    conn.commit()
+    conn.close()
+
+    queue = JobQueue(db_path, 1)
+
+    assert queue.get('old')['status'] == JOB_FAILED
+    job_id = queue.submit('analysis', {}, lambda progress: 1)
+    wait_for(queue, job_id, (JOB_COMPLETED,))
+
+
+def test_resumable_orphans_are_requeued_once_with_their_params(tmp_path):
+    db_path = str(tmp_path / 'jobs.sqlite3')
+    JobQueue(db_path, 1, 'analysis')
+    insert_job(db_path, 'analysis-42', JOB_RUNNING, exited_pid(), time.time(),
+               params={"submission_id": 42, "detect_plagiarism": False}, queue='analysis')
+    insert_job(db_path, 'other', JOB_QUEUED, exited_pid(), time.time(), kind='plagiarism', queue='analysis')
+    calls = []
+
+    def analysis_job(progress, submission_id, detect_plagiarism=True):
+        calls.append((submission_id, detect_plagiarism))
+        return {"submission_id": submission_id}
+
+    first = JobQueue(db_path, 1, 'analysis', resumable={'analysis': analysis_job})
+    second = JobQueue(db_path, 1, 'analysis', resumable={'analysis': analysis_job})
+
+    wait_for(first, 'analysis-42', (JOB_COMPLETED,))
+    assert first.get('analysis-42')['result'] == {"submission_id": 42}
+    assert first.get('other')['status'] == JOB_FAILED
+    assert calls == [(42, False)]
+    assert second.recover_orphaned() == {"requeued": 0, "failed": 0}
+
+
+def test_queues_only_recover_their_own_rows(tmp_path):
+    db_path = str(tmp_path / 'jobs.sqlite3')
+    JobQueue(db_path, 1, 'analysis')
+    insert_job(db_path, 'analysis-7', JOB_QUEUED, exited_pid(), time.time(), queue='analysis')
+
+    jobs = JobQueue(db_path, 1, 'jobs', resumable={'analysis': lambda progress: None})
+
+    assert jobs.get('analysis-7')['status'] == JOB_QUEUED
+    analysis = JobQueue(db_path, 1, 'analysis', resumable={'analysis': lambda progress: "done"})
+    wait_for(analysis, 'analysis-7', (JOB_COMPLETED,))
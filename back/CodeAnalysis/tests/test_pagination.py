@@ -0,0 +1,103 @@
+import re
+import uuid
+
+import httpx
+import pytest
+
+from utils.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor, keyset_page, list_columns, page_size
+
+KEYSET = re.compile(r'\(submitted_at\.lt\."(?P<at>[^"]+)",and\(submitted_at\.eq\."(?P=at)",id\.lt\.(?P<id>[0-9a-f-]+)\)\)')
+
+
+class Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class ListQuery:
+    """code_submissions list query, evaluating the raw keyset and order parameters like PostgREST"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.params = httpx.QueryParams()
+        self.count = None
+
+    def limit(self, count):
+        self.count = count
+        return self
+
+    def execute(self):
+        assert self.params['order'] == 'submitted_at.desc,id.desc'
+        rows = self.rows
+        if 'or' in self.params:
+            match = KEYSET.fullmatch(self.params['or'])
+            at, row_id = match.group('at'), match.group('id')
+            rows = [row for row in rows if row['submitted_at'] < at or (row['submitted_at'] == at and row['id'] < row_id)]
+        rows = sorted(rows, key=lambda row: (row['submitted_at'], row['id']), reverse=True)
+        return Result(rows[:self.count])
+
+
+def submission(minute):
+    return {"id": str(uuid.uuid4()), "submitted_at": f"2024-05-01T10:{minute:02d}:00"}
+
+
+def all_pages(rows, limit):
+    pages, cursor = [], None
+    while True:
+        page, cursor = keyset_page(ListQuery(rows), limit, cursor)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_every_row_once_in_order_including_ties():
+    rows = [submission(minute // 3) for minute in range(25)]
+
+    pages = all_pages(rows, 4)
+
+    seen = [row for page in pages for row in page]
+    assert seen == sorted(rows, key=lambda row: (row['submitted_at'], row['id']), reverse=True)
+    assert [len(page) for page in pages] == [4, 4, 4, 4, 4, 4, 1]
+
+
+def test_new_submissions_do_not_shift_later_pages():
+    rows = [submission(minute) for minute in range(10)]
+    first, cursor = keyset_page(ListQuery(rows), 5, None)
+
+    rows.append(submission(59))
+    second, _ = keyset_page(ListQuery(rows), 5, cursor)
+
+    assert {row['id'] for row in first}.isdisjoint(row['id'] for row in second)
+    assert len(first) + len(second) == 10
+
+
+def test_last_full_page_has_no_cursor():
+    rows = [submission(minute) for minute in range(4)]
+
+    assert keyset_page(ListQuery(rows), 4, None)[1] is None
+
+
+def test_cursor_round_trip():
+    row = submission(7)
+
+    assert decode_cursor(encode_cursor(row)) == (row['submitted_at'], row['id'])
+
+
+@pytest.mark.parametrize('cursor', [
+    'not base64 !',
+    encode_cursor({"submitted_at": "yesterday", "id": str(uuid.uuid4())}),
+    encode_cursor({"submitted_at": "2024-05-01T10:00:00", "id": '1) or (true'}),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_cursor(cursor)
+
+
+def test_page_size_and_columns():
+    assert page_size(None) > 0
+    assert page_size(0) == page_size(None)
+    assert page_size(-3) == 1
+    assert page_size(10 ** 6) == MAX_PAGE_SIZE
+    assert list_columns('code, analysis').endswith('code_content, analysis_result')
+    with pytest.raises(ValueError):
+        list_columns('secrets')
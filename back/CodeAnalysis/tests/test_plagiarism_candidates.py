@@ -0,0 +1,82 @@
+import os
+import sys
+
+from utils.plagiarism_detector import PlagiarismDetector, MODE_EXHAUSTIVE, MODE_FINGERPRINT
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from synthetic import make_assignment  # noqa: E402
+
+ORIGINAL = '''
+def average(grades, weights):
+    total = 0
+    for index in range(len(grades)):
+        total += grades[index] * weights[index]
+    if total > 100:
+        total = 100
+    return total / max(sum(weights), 1)
+
+def best(grades):
+    result = sorted(grades, key=lambda v: -v)
+    return result[:3]
+'''
+
+RENAMED = '''
+def promedio(notas, pesos):
+    suma = 0
+    for i in range(len(notas)):
+        suma += notas[i] * pesos[i]
+    if suma > 100:
+        suma = 100
+    return suma / max(sum(pesos), 1)
+
+def mejores(notas):
+    orden = sorted(notas, key=lambda x: -x)
+    return orden[:3]
+'''
+
+UNRELATED = '''
+class Stack:
+    def __init__(self):
+        self.items = []
+
+    def push(self, item):
+        self.items.append(item)
+
+    def pop(self):
+        if not self.items:
+            raise IndexError("empty")
+        return self.items.pop()
+'''
+
+
+def submission(sub_id, code):
+    return {'id': sub_id, 'student_id': f"student-{sub_id}", 'code': code, 'language': 'py'}
+
+
+def test_renamed_python_copy_is_a_candidate():
+    detector = PlagiarismDetector(mode=MODE_FINGERPRINT)
+    submissions = [submission('a', ORIGINAL), submission('b', RENAMED), submission('c', UNRELATED)]
+
+    assert detector.generate_candidates(submissions) == {(0, 1)}
+
+
+def test_incremental_detection_finds_renamed_python_copy():
+    detector = PlagiarismDetector(mode=MODE_FINGERPRINT)
+    cases = detector.compare_against(submission('b', RENAMED), [submission('a', ORIGINAL), submission('c', UNRELATED)])
+
+    assert [case['submission_a_id'] for case in cases] == ['a']
+    assert detector.last_stats['compared_pairs'] == 1
+
+
+def test_fingerprint_mode_flags_what_the_exhaustive_scan_flags():
+    submissions = make_assignment(40, 0.2)
+
+    stats = PlagiarismDetector(mode=MODE_FINGERPRINT).evaluate_candidates(submissions)
+
+    assert stats['flagged_pairs'] > 0
+    assert stats['recall'] == 1.0
+    assert stats['pruned_ratio'] > 0.5
+
+    exhaustive = PlagiarismDetector(mode=MODE_EXHAUSTIVE).compare_submissions(submissions)
+    fingerprint = PlagiarismDetector(mode=MODE_FINGERPRINT).compare_submissions(submissions)
+    assert fingerprint == exhaustive
@@ -0,0 +1,53 @@
+from controllers.analysis_controller import AnalysisController
+
+
+class RecordingTable:
+    def __init__(self, upserts):
+        self.upserts = upserts
+
+    def upsert(self, rows, on_conflict=None):
+        self.upserts.append((rows, on_conflict))
+        return self
+
+    def execute(self):
+        return None
+
+
+class RecordingSupabase:
+    def __init__(self):
+        self.upserts = []
+
+    def table(self, name):
+        return RecordingTable(self.upserts)
+
+
+def case(a, b):
+    return {
+        "submission_a_id": a,
+        "submission_b_id": b,
+        "student_a_id": f"student-{a}",
+        "student_b_id": f"student-{b}",
+        "similarity_score": 0.9,
+        "text_similarity": 0.9,
+        "structure_similarity": 0.9,
+        "is_plagiarism": True,
+        "details": "High similarity - possible plagiarism"
+    }
+
+
+def test_reports_store_the_smaller_submission_id_first():
+    supabase = RecordingSupabase()
+    first = "0b6a6f1e-0000-4000-8000-000000000001"
+    second = "f3c1d2e4-0000-4000-8000-000000000002"
+
+    # The same pair found from either side maps to one conflict key
+    AnalysisController.save_plagiarism_reports(supabase, "hw1", [case(second, first)])
+    AnalysisController.save_plagiarism_reports(supabase, "hw1", [case(first, second)])
+
+    (reversed_rows, conflict), (ordered_rows, _) = supabase.upserts
+    assert conflict == 'submission_a_id,submission_b_id'
+    for rows in (reversed_rows, ordered_rows):
+        assert rows[0]['submission_a_id'] == first
+        assert rows[0]['submission_b_id'] == second
+        assert rows[0]['student_a_id'] == f"student-{first}"
+        assert rows[0]['student_b_id'] == f"student-{second}"
@@ -0,0 +1,39 @@
+from utils.sandbox import AnalysisSandbox, ABORT_TIMEOUT
+
+SMALL = "def add(a, b):\n    return a + b\n"
+
+
+def heavy_program(functions):
+    return "\n".join(
+        f"def f{index}(x):\n    if x > {index}:\n        return [y * {index} for y in range(x) if y % 3]\n    return x\n"
+        for index in range(functions)
+    )
+
+
+def test_timeout_kills_the_worker_and_the_next_task_gets_a_fresh_one():
+    sandbox = AnalysisSandbox(workers=1, cpu_seconds=30, timeout=30)
+    assert sandbox.analyze(SMALL, 'py')['is_valid']
+    worker = sandbox._idle.queue[0]
+
+    sandbox.timeout = 0.01
+    result = sandbox.analyze(heavy_program(3000), 'py')
+
+    assert result['metrics']['aborted']['reason'] == ABORT_TIMEOUT
+    assert not result['is_valid']
+    assert not worker.process.is_alive()
+    assert sandbox.stats()['aborted'][ABORT_TIMEOUT] == 1
+
+    sandbox.timeout = 30
+    assert sandbox.analyze(SMALL, 'py')['is_valid']
+    assert sandbox._idle.queue[0] is not worker
+    sandbox._idle.queue[0].stop()
+
+
+def test_workers_are_recycled_after_max_tasks():
+    sandbox = AnalysisSandbox(workers=1, max_tasks=2)
+    for _ in range(3):
+        assert sandbox.analyze(SMALL, 'py')['is_valid']
+
+    assert sandbox.stats()['recycled'] == 1
+    assert sandbox.stats()['completed'] == 3
+    sandbox._idle.queue[0].stop()
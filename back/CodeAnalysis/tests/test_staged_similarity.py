@@ -0,0 +1,56 @@
+import itertools
+import os
+import sys
+
+from utils.plagiarism_detector import PlagiarismDetector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from synthetic import make_assignment  # noqa: E402
+
+JS_A = "function total(items) {\n  let sum = 0;\n  for (const item of items) { sum += item.price; }\n  return sum;\n}\n"
+JS_B = "function suma(lista) {\n  let s = 0;\n  for (const x of lista) { s += x.price; }\n  return s;\n}\n"
+JS_C = "const el = document.querySelector('#app');\nel.addEventListener('click', () => alert('hi'));\n"
+
+
+def staged_and_full(detector, code_a, code_b, language):
+    profile_a = detector.build_profile(code_a, language)
+    profile_b = detector.build_profile(code_b, language)
+    staged = detector._staged_similarity(code_a, code_b, language, profile_a, profile_b)
+    full = detector.calculate_similarity(code_a, code_b, language, profile_a, profile_b)
+    return staged, full
+
+
+def test_pruned_pairs_are_below_threshold_and_kept_pairs_score_exactly():
+    submissions = make_assignment(10, 0.4, seed=5)
+    pruned = 0
+    for threshold in (0.3, 0.6, 0.75):
+        detector = PlagiarismDetector(threshold=threshold)
+        for a, b in itertools.combinations(submissions, 2):
+            staged, full = staged_and_full(detector, a['code'], b['code'], 'py')
+            if staged is None:
+                pruned += 1
+                assert full['overall_similarity'] < threshold
+            else:
+                assert staged == full
+    assert pruned > 0
+
+
+def test_brace_languages_prune_the_same_way():
+    detector = PlagiarismDetector(threshold=0.6)
+    for code_a, code_b in itertools.combinations((JS_A, JS_B, JS_C), 2):
+        staged, full = staged_and_full(detector, code_a, code_b, 'js')
+        assert staged is None and full['overall_similarity'] < 0.6 or staged == full
+
+
+def test_exhaustive_scan_reports_what_calculate_similarity_flags():
+    submissions = make_assignment(10, 0.4, seed=9)
+    detector = PlagiarismDetector(threshold=0.75)
+
+    cases = detector.compare_submissions(submissions)
+
+    expected = {
+        (a['id'], b['id']) for a, b in itertools.combinations(submissions, 2)
+        if detector.calculate_similarity(a['code'], b['code'], 'py')['overall_similarity'] >= 0.75
+    }
+    assert {(case['submission_a_id'], case['submission_b_id']) for case in cases} == expected
+    assert detector.pruned_pairs > 0
@@ -0,0 +1,193 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from utils.fingerprint_index import content_hash
+from utils.lexer import iter_tokens, SUPPORTED_LANGUAGES
+
+# Aligned regions with fewer significant tokens than this are not reported
+MIN_BLOCK_TOKENS = 12
+
+# Consecutive lines hashed together to find anchors; single lines are too
+# common once identifiers are collapsed to their class
+ANCHOR_LINES = 4
+
+
+def line_signatures(code: str, language: str) -> List[Tuple[int, object, int]]:
+    """(line number, signature, token count) of every line holding code
+
+    Lines are compared by their canonical token classes, so renamed identifiers,
+    edited literals, comments and re-indentation do not break an alignment.
+    Languages without a lexer fall back to the whitespace-collapsed, lowercased line.
+    """
+    if language not in SUPPORTED_LANGUAGES:
+        signatures = []
+        for number, line in enumerate(code.splitlines(), start=1):
+            text = re.sub(r'\s+', ' ', line).strip().lower()
+            if text:
+                signatures.append((number, text, len(text.split(' '))))
+        return signatures
+
+    lines = {}
+    line = 1
+    line_offset = 0
+    for token, _, offset in iter_tokens(code, language):
+        line += code.count('\n', line_offset, offset)
+        line_offset = offset
+        lines.setdefault(line, []).append(token)
+
+    return [(number, tuple(tokens), len(tokens)) for number, tokens in lines.items()]
+
+
+def _unique_windows(sequence: List, size: int) -> Dict:
+    """Start index of every window of `size` consecutive signatures occurring exactly once"""
+    starts = {}
+    for i in range(len(sequence) - size + 1):
+        window = tuple(sequence[i:i + size])
+        starts[window] = -1 if window in starts else i
+    return {window: i for window, i in starts.items() if i >= 0}
+
+
+def match_blocks(a: List, b: List) -> List[Tuple[int, int, int]]:
+    """(i, j, length) runs of equal signatures in two sequences, ordered by i
+
+    Windows of ANCHOR_LINES lines that occur once on each side anchor a run,
+    which is then extended backwards and forwards over equal lines, repeated
+    ones included. Single unique lines anchor what the windows left over.
+    Runs may cross, so moved and reordered code is still aligned.
+    """
+    covered_a = [False] * len(a)
+    covered_b = [False] * len(b)
+    blocks = []
+
+    for size in (ANCHOR_LINES, 1):
+        windows_b = _unique_windows(b, size)
+        anchors = sorted(
+            (i, windows_b[window]) for window, i in _unique_windows(a, size).items() if window in windows_b
+        )
+        for i, j in anchors:
+            if covered_a[i] or covered_b[j]:
+                continue
+            while i > 0 and j > 0 and not covered_a[i - 1] and not covered_b[j - 1] and a[i - 1] == b[j - 1]:
+                i -= 1
+                j -= 1
+            length = 0
+            while (i + length < len(a) and j + length < len(b) and not covered_a[i + length]
+                   and not covered_b[j + length] and a[i + length] == b[j + length]):
+                covered_a[i + length] = covered_b[j + length] = True
+                length += 1
+            blocks.append((i, j, length))
+
+    blocks.sort()
+    return blocks
+
+
+def align_code(code_a: str, code_b: str, language: str, min_tokens: int = MIN_BLOCK_TOKENS) -> Dict:
+    """Aligned line ranges of two submissions for side-by-side display
+
+    Each block maps lines a_start..a_end of the first submission to lines
+    b_start..b_end of the second (1-based, inclusive); blank and comment-only
+    lines inside a block are spanned. Blocks are ordered by a_start and may
+    cross when code was moved. Coverage is the share of code lines of each
+    side that fall in a reported block.
+    """
+    lines_a = line_signatures(code_a, language)
+    lines_b = line_signatures(code_b, language)
+    a = [signature for _, signature, _ in lines_a]
+    b = [signature for _, signature, _ in lines_b]
+
+    blocks = []
+    for i, j, length in match_blocks(a, b):
+        tokens = sum(lines_a[k][2] for k in range(i, i + length))
+        if tokens >= min_tokens:
+            blocks.append({
+                "a_start": lines_a[i][0],
+                "a_end": lines_a[i + length - 1][0],
+                "b_start": lines_b[j][0],
+                "b_end": lines_b[j + length - 1][0],
+                "lines": length,
+                "tokens": tokens
+            })
+
+    covered = sum(block['lines'] for block in blocks)
+    return {
+        "blocks": blocks,
+        "coverage_a": round(covered / len(a), 4) if a else 0.0,
+        "coverage_b": round(covered / len(b), 4) if b else 0.0
+    }
+
+
+class AlignmentCache:
+    """LRU of align_code results keyed by the submission pair and both content hashes
+
+    Edited content gets a new key, so stale alignments are never served.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _recall(self, key: Tuple) -> Optional[Dict]:
+        with self._lock:
+            alignment = self._entries.get(key)
+            if alignment is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return alignment
+
+    def _remember(self, key: Tuple, alignment: Dict):
+        with self._lock:
+            self._entries[key] = alignment
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def align(self, submission_a: Dict, submission_b: Dict) -> Tuple[Dict, bool]:
+        """Alignment of two code_submissions rows, returning (alignment, cached)"""
+        key = (
+            submission_a['id'], submission_a.get('content_hash') or content_hash(submission_a['code_content']),
+            submission_b['id'], submission_b.get('content_hash') or content_hash(submission_b['code_content']),
+            submission_a['file_extension']
+        )
+
+        alignment = self._recall(key)
+        if alignment is not None:
+            return alignment, True
+
+        alignment = align_code(
+            submission_a['code_content'],
+            submission_b['code_content'],
+            submission_a['file_extension']
+        )
+        self._remember(key, alignment)
+        return alignment, False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "lookups": lookups,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries
+            }
+
+
+_alignment_cache = None
+_alignment_cache_lock = threading.Lock()
+
+
+def get_alignment_cache() -> AlignmentCache:
+    global _alignment_cache
+    with _alignment_cache_lock:
+        if _alignment_cache is None:
+            _alignment_cache = AlignmentCache(int(os.getenv('ALIGNMENT_CACHE_SIZE', 256)))
+    return _alignment_cache
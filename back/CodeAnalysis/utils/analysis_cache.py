@@ -0,0 +1,153 @@
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from utils.code_analyzer import ANALYZER_VERSION
+from utils.sandbox import run_analysis
+
+ANALYSIS_TABLE = 'code_analysis'
+
+# Which tier answered a lookup
+TIER_MEMORY = 'memory'
+TIER_PERSISTED = 'persisted'
+TIER_MISS = 'miss'
+
+
+def analysis_key(code: str, language: str) -> str:
+    """SHA-256 of the content, language and analyzer version"""
+    digest = hashlib.sha256(code.encode('utf-8'))
+    digest.update(f"\0{language.lower()}\0{ANALYZER_VERSION}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def is_cacheable(analysis: Dict) -> bool:
+    """Whether a result may be served for the same content later
+
+    Sandbox aborts depend on load (timeouts, crashed workers) as much as on the
+    code, so they are never reused.
+    """
+    return 'aborted' not in (analysis.get('metrics') or {})
+
+
+def analysis_row(submission_id: str, key: str, analysis: Dict) -> Dict:
+    """code_analysis row for an analysis result; aborted results get no analysis_key"""
+    return {
+        "submission_id": submission_id,
+        "is_valid": analysis['is_valid'],
+        "language": analysis['language'],
+        "errors": analysis['errors'],
+        "warnings": analysis['warnings'],
+        "metrics": analysis['metrics'],
+        "suggestions": analysis['suggestions'],
+        "analysis_key": key if is_cacheable(analysis) else None,
+        "analyzer_version": ANALYZER_VERSION,
+        "analyzed_at": datetime.utcnow().isoformat()
+    }
+
+
+def _row_analysis(row: Dict, code: str) -> Dict:
+    """Rebuild the analyze() result from a code_analysis row"""
+    return {
+        "is_valid": row['is_valid'],
+        "language": row['language'],
+        "errors": row['errors'],
+        "warnings": row['warnings'],
+        "metrics": row['metrics'],
+        "suggestions": row['suggestions'],
+        "code_length": len(code),
+        "lines_of_code": len(code.splitlines())
+    }
+
+
+class AnalysisCache:
+    """Content-addressed CodeAnalyzer results: in-memory LRU in front of code_analysis
+
+    Misses are analyzed in the sandbox. Aborted results are returned but not
+    cached in either tier, so the next request for that content runs it again.
+
+    Hit and miss counters are per process.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {TIER_MEMORY: 0, TIER_PERSISTED: 0, TIER_MISS: 0}
+
+    def _remember(self, key: str, analysis: Dict):
+        with self._lock:
+            self._entries[key] = analysis
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _recall(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+            return analysis
+
+    def _count(self, tier: str):
+        with self._lock:
+            self._counters[tier] += 1
+
+    def analyze(self, supabase, code: str, language: str) -> Tuple[str, Dict, str]:
+        """Analysis of the code from the cheapest tier that has it
+
+        Returns (key, analysis, tier). On a miss the analyzer runs and only the
+        memory tier is filled; the caller persists the result with analysis_row().
+        """
+        key = analysis_key(code, language)
+
+        analysis = self._recall(key)
+        if analysis is not None:
+            self._count(TIER_MEMORY)
+            return key, copy.deepcopy(analysis), TIER_MEMORY
+
+        result = supabase.table(ANALYSIS_TABLE).select('*').eq('analysis_key', key).limit(1).execute()
+        if result.data and is_cacheable(result.data[0]):
+            analysis = _row_analysis(result.data[0], code)
+            tier = TIER_PERSISTED
+        else:
+            analysis = run_analysis(code, language)
+            tier = TIER_MISS
+
+        self._count(tier)
+        if is_cacheable(analysis):
+            self._remember(key, analysis)
+        return key, copy.deepcopy(analysis), tier
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and LRU occupancy"""
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+
+        lookups = sum(counters.values())
+        hits = counters[TIER_MEMORY] + counters[TIER_PERSISTED]
+        return {
+            "analyzer_version": ANALYZER_VERSION,
+            "lookups": lookups,
+            "memory_hits": counters[TIER_MEMORY],
+            "persisted_hits": counters[TIER_PERSISTED],
+            "misses": counters[TIER_MISS],
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries
+        }
+
+
+_analysis_cache = None
+_analysis_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    global _analysis_cache
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            _analysis_cache = AnalysisCache(int(os.getenv('ANALYSIS_CACHE_SIZE', 1024)))
+    return _analysis_cache
@@ -0,0 +1,63 @@
+import importlib
+import threading
+from typing import Dict, Iterable, List, Optional
+from utils.analyzers.base import LanguageAnalyzer
+
+# extension -> "module:Class" of its analyzer. Modules are imported on first use,
+# so heavy dependencies (radon for Python) only load when that language is analyzed.
+_REGISTRY: Dict[str, str] = {}
+_loaded: Dict[str, LanguageAnalyzer] = {}
+_lock = threading.Lock()
+
+
+def register_analyzer(extensions: Iterable[str], target: str):
+    """Register a 'module:Class' analyzer for extensions, replacing any previous one"""
+    with _lock:
+        for extension in extensions:
+            _REGISTRY[extension.lower()] = target
+            _loaded.pop(extension.lower(), None)
+
+
+def registered_extensions() -> List[str]:
+    """Extensions with a language-specific analyzer"""
+    return sorted(_REGISTRY)
+
+
+def get_analyzer(extension: str) -> Optional[LanguageAnalyzer]:
+    """Analyzer for a file extension, importing its module on first use; None if unsupported"""
+    extension = extension.lower()
+    analyzer = _loaded.get(extension)
+    if analyzer is not None:
+        return analyzer
+
+    with _lock:
+        target = _REGISTRY.get(extension)
+        if target is None:
+            return None
+
+        if extension not in _loaded:
+            module_name, class_name = target.split(':')
+            analyzer_class = getattr(importlib.import_module(module_name), class_name)
+            if extension not in analyzer_class.extensions:
+                raise ValueError(f"{target} does not advertise extension '{extension}'")
+            _loaded[extension] = analyzer_class()
+        return _loaded[extension]
+
+
+def analyzer_modules(extensions: Optional[Iterable[str]] = None) -> List[str]:
+    """Modules of the registered analyzers of the extensions (all registered ones by default)"""
+    extensions = list(extensions) if extensions is not None else registered_extensions()
+    return sorted({_REGISTRY[ext.lower()].split(':')[0] for ext in extensions if ext.lower() in _REGISTRY})
+
+
+def warm_up(extensions: Optional[Iterable[str]] = None) -> List[str]:
+    """Load analyzers ahead of the first request (all registered ones by default)"""
+    extensions = list(extensions) if extensions is not None else registered_extensions()
+    return [extension for extension in extensions if get_analyzer(extension) is not None]
+
+
+register_analyzer(('py',), 'utils.analyzers.python_analyzer:PythonAnalyzer')
+register_analyzer(('js', 'jsx', 'ts', 'tsx'), 'utils.analyzers.javascript_analyzer:JavaScriptAnalyzer')
+register_analyzer(('java',), 'utils.analyzers.java_analyzer:JavaAnalyzer')
+register_analyzer(('c', 'cpp'), 'utils.analyzers.c_cpp_analyzer:CCppAnalyzer')
+register_analyzer(('cs',), 'utils.analyzers.csharp_analyzer:CSharpAnalyzer')
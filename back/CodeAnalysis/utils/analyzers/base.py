@@ -0,0 +1,9 @@
+class LanguageAnalyzer:
+    """A language plugin: syntax checks, metrics and suggestions for some file extensions"""
+    
+    # File extensions handled by the analyzer
+    extensions = ()
+    
+    def analyze(self, code, extension):
+        """Return the analysis result dict (is_valid, language, errors, warnings, metrics, suggestions)"""
+        raise NotImplementedError
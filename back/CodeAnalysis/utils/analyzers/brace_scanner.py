@@ -0,0 +1,355 @@
+import re
+from typing import Dict, List
+from utils.lexer import _LANGUAGE_KEYWORDS
+
+_OPENERS = {'(': ')', '[': ']', '{': '}'}
+_CLOSERS = {')': '(', ']': '[', '}': '{'}
+
+# At most this many bracket/literal errors are reported per file
+MAX_ERRORS = 10
+
+# Rounds of removing innermost bracket pairs before the exact stack walk takes over
+MAX_REDUCTIONS = 32
+
+# Tokens that can end the type in front of a declared function name: `int *f(`, `List<T> f(`
+_TYPE_KEYWORDS = {
+    'void', 'int', 'char', 'float', 'double', 'long', 'short', 'bool', 'boolean', 'byte',
+    'unsigned', 'signed', 'auto', 'string', 'object', 'decimal', 'var',
+}
+
+# Allowed between a declaration's ')' and its body: `) const {`, `) throws IOException {`
+_DECLARATION_QUALIFIERS = {'const', 'override', 'noexcept', 'final', 'throws'}
+
+_JS_LANGUAGES = ('js', 'jsx', 'ts', 'tsx')
+
+_COMMENT = r'//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)'
+_QUOTED = r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+_TEXT_BLOCK = r'"""[\s\S]*?"""'
+
+# Comments and literals, which are blanked before brackets and keywords are looked at
+_LITERALS = {
+    'js': re.compile(_COMMENT + r'|`(?:\\[\s\S]|[^`\\])*`|' + _QUOTED + r'|(?P<slash>/)'),
+    'java': re.compile(_COMMENT + '|' + _TEXT_BLOCK + '|' + _QUOTED),
+    'c': re.compile(_COMMENT + '|' + _QUOTED),
+    'cs': re.compile(_COMMENT + '|' + _TEXT_BLOCK + r'|@"(?:""|[^"])*"|' + _QUOTED),
+}
+_LITERALS.update({'jsx': _LITERALS['js'], 'ts': _LITERALS['js'], 'tsx': _LITERALS['js'], 'cpp': _LITERALS['c']})
+
+# JavaScript regex literals, recognized only where a '/' cannot be a division
+_REGEX_LITERAL = re.compile(r'/(?![*/])(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[A-Za-z]*')
+_REGEX_PREFIX_KEYWORDS = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw', 'case',
+    'do', 'else', 'yield', 'await',
+}
+
+# Markup in a JavaScript file means JSX, whose text may hold a lone apostrophe: <p>Don't</p>
+_JSX_MARKUP = re.compile(r'</[A-Za-z]|/>')
+
+_BRACES = re.compile(r'[{}]')
+_BRACKETS_AND_QUOTES = re.compile(r'[(){}\[\]"\'`]')
+_NOT_BRACKET = re.compile(r'[^(){}\[\]]+')
+_NOT_NEWLINE = re.compile(r'[^\n]+')
+_DIRECTIVE_LINE = re.compile(r'^[ \t]*#[^\n]*', re.MULTILINE)
+
+# str.translate table deleting every ASCII character but brackets
+_ASCII_NON_BRACKETS = {code: None for code in range(128) if chr(code) not in '(){}[]'}
+
+# Keyword patterns start with their literal, which lets re skip ahead to it; the
+# fixed-width lookbehind after it then rejects matches inside longer identifiers
+_FUNCTIONS = re.compile(r'function(?<![\w$]function)(?![\w$])')
+_CLASSES = re.compile(r'class(?<![\w$.]class)(?![\w$])')
+_NAMESPACES = re.compile(r'namespace(?<![\w$]namespace)(?![\w$])')
+_VARS = re.compile(r'var(?<![\w$.]var)(?![\w$])')
+_CONSOLE_LOGS = re.compile(r'console(?<![\w$]console)\s*\.\s*log(?![\w$])')
+_REQUIRES = re.compile(r'require(?<![\w$.]require)\s*\(')
+_USINGS = re.compile(r'using(?<![\w$.]using)\s+([A-Za-z_]\w*)')
+_IMPORTS = re.compile(r'import(?![\w$]|\s*[(.])')
+_INCLUDES = re.compile(r'#[ \t]*include(?!\w)')
+_MAINS = re.compile(r'main\s*\(')
+_MAIN_TYPE = re.compile(r'(?<![\w$])(?:void|int)\s+$')
+
+# `) qualifiers {` ends a declaration head (or `;` for abstract Java methods);
+# _HEAD then reads the name and type before the matching '(' from the reversed text
+_BODY = re.compile(r'\)(?P<qualifiers>(?:\s*(?:[A-Za-z_$][\w$]*(?![\w$])|[.,]))*)\s*\{')
+_BODY_OR_ABSTRACT = re.compile(r'\)(?P<qualifiers>(?:\s*(?:[A-Za-z_$][\w$]*(?![\w$])|[.,]))*)\s*[{;]')
+_HEAD = re.compile(r'\s*(?P<name>[\w$]+)(?:\s+(?P<type>[\w$]+)|\s*(?:&&|::|[*&\]]|>(?!-)))')
+_WORDS = re.compile(r'[A-Za-z_$][\w$]*')
+
+
+def _line(code: str, offset: int) -> int:
+    """1-based line number of an offset"""
+    return code.count('\n', 0, offset) + 1
+
+
+def _blank(text: str) -> str:
+    """Spaces in place of a masked literal, keeping its newlines"""
+    return _NOT_NEWLINE.sub(lambda match: ' ' * len(match.group()), text)
+
+
+def _regex_can_start(code: str, offset: int) -> bool:
+    """Whether a '/' at offset opens a JS regex literal rather than dividing"""
+    position = offset - 1
+    while position >= 0 and code[position] in ' \t\r\n':
+        position -= 1
+    if position < 0:
+        return True
+
+    previous = code[position]
+    if previous in ')]}"\'`':
+        return False
+    if previous.isalnum() or previous in '_$':
+        start = position
+        while start > 0 and (code[start - 1].isalnum() or code[start - 1] in '_$'):
+            start -= 1
+        return code[start:position + 1] in _REGEX_PREFIX_KEYWORDS
+    # `a++ / b` and `a-- / b` divide
+    return not (previous in '+-' and position > 0 and code[position - 1] == previous)
+
+
+def _mask(code: str, language: str, keep_offsets: bool) -> str:
+    """The code with comments, literals and (C, C++, C#) preprocessor directives blanked
+
+    With keep_offsets every blanked character becomes a space and newlines stay,
+    so offsets and line numbers still point into the original code. Unterminated
+    quotes are not literals and stay in place.
+    """
+    pattern = _LITERALS[language]
+    if language not in _JS_LANGUAGES:
+        replacement = (lambda match: _blank(match.group())) if keep_offsets else ' '
+        masked = pattern.sub(replacement, code)
+        if language in ('c', 'cpp', 'cs'):
+            # Preprocessor directives take their whole line, like utils.lexer
+            masked = _DIRECTIVE_LINE.sub(replacement, masked)
+        return masked
+
+    # A '/' may open a regex literal, which the scan then resumes after
+    pieces = []
+    position = 0
+    while True:
+        match = pattern.search(code, position)
+        if match is None:
+            break
+        start = match.start()
+        end = match.end()
+        if match.group('slash') is not None:
+            literal = _REGEX_LITERAL.match(code, start) if _regex_can_start(code, start) else None
+            if literal is None:
+                # A division: keep it and scan on
+                pieces.append(code[position:end])
+                position = end
+                continue
+            end = literal.end()
+        pieces.append(code[position:start])
+        pieces.append(_blank(code[start:end]) if keep_offsets else ' ')
+        position = end
+    pieces.append(code[position:])
+    return ''.join(pieces)
+
+
+def _is_balanced(masked: str) -> bool:
+    """Whether every bracket is closed in order, by repeatedly removing innermost pairs
+
+    False also when MAX_REDUCTIONS rounds do not settle it; the stack walk decides then.
+    """
+    brackets = masked.translate(_ASCII_NON_BRACKETS)
+    if not brackets.isascii():
+        brackets = _NOT_BRACKET.sub('', brackets)
+    for _ in range(MAX_REDUCTIONS):
+        if not brackets:
+            return True
+        reduced = brackets.replace('()', '').replace('[]', '').replace('{}', '')
+        if len(reduced) == len(brackets):
+            return False
+        brackets = reduced
+    return not brackets
+
+
+def _bracket_errors(code: str, masked: str, quotes: str) -> List[str]:
+    """Unmatched, unclosed and crossed brackets and unterminated literals, with line numbers"""
+    errors = []
+    error_count = 0          # errors beyond MAX_ERRORS are counted, not formatted
+    stack = []               # (bracket, offset)
+
+    for match in _BRACKETS_AND_QUOTES.finditer(masked):
+        token = match.group()
+        offset = match.start()
+
+        if token in _OPENERS:
+            stack.append((token, offset))
+            continue
+
+        if token in _CLOSERS:
+            opener = _CLOSERS[token]
+            if stack and stack[-1][0] == opener:
+                stack.pop()
+                continue
+            if any(bracket == opener for bracket, _ in stack):
+                # Close the nearest matching bracket, reporting the ones left open inside it
+                while True:
+                    bracket, opened_at = stack.pop()
+                    if bracket == opener:
+                        break
+                    error_count += 1
+                    if error_count <= MAX_ERRORS:
+                        errors.append(
+                            f"Unclosed '{bracket}' opened at line {_line(code, opened_at)} "
+                            f"before '{token}' at line {_line(code, offset)}"
+                        )
+                continue
+            message = f"Unmatched '{token}' at line {_line(code, offset)}"
+        elif token in quotes:
+            message = f"Unterminated string literal at line {_line(code, offset)}"
+        else:
+            continue
+
+        error_count += 1
+        if error_count <= MAX_ERRORS:
+            errors.append(message)
+
+    for bracket, opened_at in stack[:max(MAX_ERRORS - error_count, 0)]:
+        errors.append(f"Unclosed '{bracket}' opened at line {_line(code, opened_at)}")
+    error_count += len(stack)
+
+    if error_count > MAX_ERRORS:
+        errors.append(f"... and {error_count - MAX_ERRORS} more bracket errors")
+
+    return errors
+
+
+def _opening_paren(masked: str, close: int) -> int:
+    """Offset of the '(' matching the ')' at close, or -1"""
+    opening = masked.rfind('(', 0, close)
+    if masked.find(')', opening + 1, close) < 0:
+        return opening       # no nested parentheses, the usual case
+    pending = 0
+    position = close
+    while True:
+        opening = masked.rfind('(', 0, position)
+        if opening < 0:
+            return -1
+        pending += masked.count(')', opening, position)
+        if pending == 0:
+            return opening
+        pending -= 1
+        position = opening
+
+
+def _declarations(masked: str, language: str) -> int:
+    """`type name(...) {` definitions; for Java also `;`-terminated abstract methods outside bodies"""
+    keywords = _LANGUAGE_KEYWORDS[language]
+    reversed_code = masked[::-1]
+    length = len(masked)
+    count = 0
+    abstract = []            # offsets of Java `;` declarations, checked against bodies below
+    bodies = []              # offsets of the opening braces of declaration bodies
+
+    heads = _BODY_OR_ABSTRACT if language == 'java' else _BODY
+    for match in heads.finditer(masked):
+        qualifiers = match.group('qualifiers')
+        if qualifiers and any(
+            word in keywords and word not in _DECLARATION_QUALIFIERS for word in _WORDS.findall(qualifiers)
+        ):
+            continue
+
+        opening = _opening_paren(masked, match.start())
+        head = _HEAD.match(reversed_code, length - opening) if opening > 0 else None
+        if head is None:
+            continue
+        name = head.group('name')[::-1]
+        kind = head.group('type')
+        kind = kind[::-1] if kind is not None else None
+        if name[0].isdigit() or name in keywords:
+            continue
+        if kind is not None and (kind[0].isdigit() or (kind in keywords and kind not in _TYPE_KEYWORDS)):
+            continue
+
+        if masked[match.end() - 1] == '{':
+            count += 1
+            bodies.append(match.end() - 1)
+        else:
+            abstract.append(match.end() - 1)
+
+    if abstract:
+        closes = _closing_braces(masked)
+        spans = [(start, closes.get(start, length)) for start in bodies]
+        count += sum(1 for offset in abstract if not any(start < offset < end for start, end in spans))
+    return count
+
+
+def _closing_braces(masked: str) -> Dict[int, int]:
+    """Offset of the closing brace of every opening brace that has one"""
+    closes = {}
+    stack = []
+    for match in _BRACES.finditer(masked):
+        if match.group() == '{':
+            stack.append(match.start())
+        elif stack:
+            closes[stack.pop()] = match.start()
+    return closes
+
+
+def _line_starts(text: str, pattern) -> int:
+    """Matches of pattern that only have indentation before them on their line"""
+    count = 0
+    for match in pattern.finditer(text):
+        line_start = text.rfind('\n', 0, match.start()) + 1
+        if not text[line_start:match.start()].strip(' \t'):
+            count += 1
+    return count
+
+
+def scan_braces(code: str, language: str) -> Dict:
+    """Validate brackets and count declarations of a C-family file
+
+    Comments, strings, characters, text blocks, template and regex literals are
+    blanked by one regex per language, so their brackets and keywords are never seen.
+    Nesting is then checked at C speed; only files that fail that check walk
+    their brackets in Python to report errors with line numbers. Returns the
+    errors and raw counts; each language analyzer picks the metrics it reports.
+    """
+    masked = _mask(code, language, keep_offsets=False)
+
+    # Quotes left after masking never closed; in JSX files apostrophes and
+    # double quotes may be text content instead
+    quotes = '`' if language in _JS_LANGUAGES and _JSX_MARKUP.search(code) else '"\'`'
+    errors = []
+    if not _is_balanced(masked) or any(quote in masked for quote in quotes):
+        errors = _bracket_errors(code, _mask(code, language, keep_offsets=True), quotes)
+
+    counts = {
+        "functions": 0,       # `function` keywords and `=>` arrows (JS/TS)
+        "declarations": 0,    # `type name(...) {` definitions (Java methods, C functions)
+        "classes": 0,
+        "namespaces": 0,
+        "imports": 0,         # top-level `import` lines, `require(` calls
+        "includes": 0,        # `#include` directives
+        "usings": 0,          # C# `using X;` directives
+        "console_logs": 0,
+        "var_declarations": 0,
+    }
+    keywords = _LANGUAGE_KEYWORDS[language]
+
+    if language in _JS_LANGUAGES:
+        counts["functions"] = len(_FUNCTIONS.findall(masked)) + masked.count('=>')
+        counts["imports"] = _line_starts(masked, _IMPORTS) + len(_REQUIRES.findall(masked))
+        counts["console_logs"] = len(_CONSOLE_LOGS.findall(masked))
+        counts["var_declarations"] = len(_VARS.findall(masked))
+    elif language == 'java':
+        counts["classes"] = len(_CLASSES.findall(masked))
+        counts["imports"] = _line_starts(masked, _IMPORTS)
+        counts["declarations"] = _declarations(masked, language)
+    elif language == 'cs':
+        counts["classes"] = len(_CLASSES.findall(masked))
+        counts["namespaces"] = len(_NAMESPACES.findall(masked))
+        counts["usings"] = sum(
+            1 for word in _USINGS.findall(masked) if word == 'static' or word not in keywords
+        )
+    else:
+        counts["includes"] = _line_starts(code, _INCLUDES)
+        counts["declarations"] = _declarations(masked, language)
+
+    has_main = language in ('java', 'c', 'cpp') and any(
+        _MAIN_TYPE.search(masked, max(match.start() - 64, 0), match.start())
+        for match in _MAINS.finditer(masked)
+    )
+    return {"errors": errors, "has_main": has_main, **counts}
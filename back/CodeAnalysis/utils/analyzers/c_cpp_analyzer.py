@@ -0,0 +1,37 @@
+from utils.analyzers.base import LanguageAnalyzer
+from utils.analyzers.brace_scanner import scan_braces
+
+
+class CCppAnalyzer(LanguageAnalyzer):
+    """Pattern checks for C and C++"""
+    
+    extensions = ('c', 'cpp')
+    
+    def analyze(self, code, extension):
+        """Analyze C/C++ code"""
+        result = {
+            "is_valid": True,
+            "language": "c/c++",
+            "errors": [],
+            "warnings": [],
+            "metrics": {},
+            "suggestions": []
+        }
+        
+        lines = code.splitlines()
+        result["metrics"]["lines_of_code"] = len(lines)
+        
+        # Masked scan: bracket balance and counts, ignoring strings, comments and directives
+        scan = scan_braces(code, extension)
+        result["metrics"]["includes"] = scan["includes"]
+        result["metrics"]["functions"] = scan["declarations"]
+        
+        # Check for main function
+        if scan["has_main"]:
+            result["metrics"]["has_main"] = True
+        
+        if scan["errors"]:
+            result["errors"].extend(scan["errors"])
+            result["is_valid"] = False
+        
+        return result
@@ -0,0 +1,34 @@
+from utils.analyzers.base import LanguageAnalyzer
+from utils.analyzers.brace_scanner import scan_braces
+
+
+class CSharpAnalyzer(LanguageAnalyzer):
+    """Pattern checks for C#"""
+    
+    extensions = ('cs',)
+    
+    def analyze(self, code, extension):
+        """Analyze C# code"""
+        result = {
+            "is_valid": True,
+            "language": "csharp",
+            "errors": [],
+            "warnings": [],
+            "metrics": {},
+            "suggestions": []
+        }
+        
+        lines = code.splitlines()
+        result["metrics"]["lines_of_code"] = len(lines)
+        
+        # Masked scan: bracket balance and counts, ignoring strings and comments
+        scan = scan_braces(code, extension)
+        result["metrics"]["namespaces"] = scan["namespaces"]
+        result["metrics"]["classes"] = scan["classes"]
+        result["metrics"]["using_statements"] = scan["usings"]
+        
+        if scan["errors"]:
+            result["errors"].extend(scan["errors"])
+            result["is_valid"] = False
+        
+        return result
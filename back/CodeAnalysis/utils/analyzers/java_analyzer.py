@@ -0,0 +1,42 @@
+from utils.analyzers.base import LanguageAnalyzer
+from utils.analyzers.brace_scanner import scan_braces
+
+
+class JavaAnalyzer(LanguageAnalyzer):
+    """Pattern checks for Java"""
+    
+    extensions = ('java',)
+    
+    def analyze(self, code, extension):
+        """Analyze Java code"""
+        result = {
+            "is_valid": True,
+            "language": "java",
+            "errors": [],
+            "warnings": [],
+            "metrics": {},
+            "suggestions": []
+        }
+        
+        lines = code.splitlines()
+        result["metrics"]["lines_of_code"] = len(lines)
+        
+        # Masked scan: bracket balance and counts, ignoring strings and comments
+        scan = scan_braces(code, extension)
+        result["metrics"]["classes"] = scan["classes"]
+        
+        if scan["classes"] == 0:
+            result["warnings"].append("No class definition found")
+        
+        result["metrics"]["methods"] = scan["declarations"]
+        result["metrics"]["imports"] = scan["imports"]
+        
+        if scan["errors"]:
+            result["errors"].extend(scan["errors"])
+            result["is_valid"] = False
+        
+        # Check for main method
+        if scan["has_main"]:
+            result["metrics"]["has_main"] = True
+        
+        return result
@@ -0,0 +1,43 @@
+from utils.analyzers.base import LanguageAnalyzer
+from utils.analyzers.brace_scanner import scan_braces
+
+
+class JavaScriptAnalyzer(LanguageAnalyzer):
+    """Pattern checks for JavaScript and TypeScript"""
+    
+    extensions = ('js', 'jsx', 'ts', 'tsx')
+    
+    def analyze(self, code, extension):
+        """Analyze JavaScript/TypeScript code"""
+        result = {
+            "is_valid": True,
+            "language": "javascript",
+            "errors": [],
+            "warnings": [],
+            "metrics": {},
+            "suggestions": []
+        }
+        
+        lines = code.splitlines()
+        result["metrics"]["lines_of_code"] = len(lines)
+        
+        # Masked scan: bracket balance and counts, ignoring strings, comments and regexes
+        scan = scan_braces(code, extension)
+        result["metrics"]["functions"] = scan["functions"]
+        result["metrics"]["imports"] = scan["imports"]
+        
+        # Check for console.log (potential debug code)
+        console_logs = scan["console_logs"]
+        if console_logs > 5:
+            result["warnings"].append(f"Found {console_logs} console.log statements - consider removing debug code")
+        
+        # Check for var usage (prefer let/const)
+        var_usage = scan["var_declarations"]
+        if var_usage > 0:
+            result["suggestions"].append(f"Consider using 'let' or 'const' instead of 'var' ({var_usage} occurrences)")
+        
+        if scan["errors"]:
+            result["errors"].extend(scan["errors"])
+            result["is_valid"] = False
+        
+        return result
@@ -0,0 +1,139 @@
+import ast
+from radon.metrics import h_visit_ast, mi_compute
+from radon.raw import analyze
+from radon.visitors import ComplexityVisitor
+from utils.analyzers.base import LanguageAnalyzer
+
+
+class _PythonStructureVisitor(ast.NodeVisitor):
+    """Counts imports, classes and functions (and missing docstrings) in one walk"""
+    
+    def __init__(self):
+        self.imports = 0
+        self.classes = 0
+        self.functions = 0
+        self.missing_docstrings = 0
+    
+    def visit_Import(self, node):
+        self.imports += 1
+        self.generic_visit(node)
+    
+    visit_ImportFrom = visit_Import
+    
+    def visit_ClassDef(self, node):
+        self.classes += 1
+        self.generic_visit(node)
+    
+    def visit_FunctionDef(self, node):
+        self.functions += 1
+        if not ast.get_docstring(node):
+            self.missing_docstrings += 1
+        self.generic_visit(node)
+
+
+class PythonAnalyzer(LanguageAnalyzer):
+    """Syntax check, radon metrics and structure counts for Python"""
+    
+    extensions = ('py',)
+    
+    def analyze(self, code, extension):
+        """Analyze Python code"""
+        result = {
+            "is_valid": True,
+            "language": "python",
+            "errors": [],
+            "warnings": [],
+            "metrics": {},
+            "suggestions": []
+        }
+        
+        try:
+            # Syntax check using AST
+            tree = ast.parse(code)
+            result["is_valid"] = True
+            
+            # Calculate metrics (the raw scan is shared with the maintainability index)
+            raw_metrics = analyze(code)
+            result["metrics"] = {
+                "lines_of_code": raw_metrics.loc,
+                "logical_lines": raw_metrics.lloc,
+                "source_lines": raw_metrics.sloc,
+                "comments": raw_metrics.comments,
+                "blank_lines": raw_metrics.blank,
+                "single_comments": raw_metrics.single_comments,
+                "multi_comments": raw_metrics.multi
+            }
+            
+            # Complexity analysis on the already parsed tree
+            complexity_visitor = None
+            try:
+                complexity_visitor = ComplexityVisitor.from_ast(tree)
+                complexity = complexity_visitor.blocks
+                avg_complexity = sum(c.complexity for c in complexity) / len(complexity) if complexity else 0
+                result["metrics"]["cyclomatic_complexity"] = round(avg_complexity, 2)
+                result["metrics"]["functions_count"] = len(complexity)
+                
+                # Warn about high complexity
+                high_complexity = [c for c in complexity if c.complexity > 10]
+                if high_complexity:
+                    result["warnings"].append(
+                        f"High complexity detected in {len(high_complexity)} function(s)"
+                    )
+            except:
+                pass
+            
+            # Halstead metrics
+            halstead = None
+            try:
+                halstead = h_visit_ast(tree)
+                if halstead:
+                    result["metrics"]["halstead_difficulty"] = round(halstead.total.difficulty, 2)
+                    result["metrics"]["halstead_effort"] = round(halstead.total.effort, 2)
+            except:
+                pass
+            
+            # Maintainability Index, from the Halstead volume, complexity and raw metrics above
+            try:
+                if complexity_visitor is not None and halstead is not None:
+                    comment_lines = raw_metrics.comments + raw_metrics.multi
+                    comments = comment_lines / float(raw_metrics.sloc) * 100 if raw_metrics.sloc != 0 else 0
+                    mi_score = mi_compute(
+                        halstead.total.volume,
+                        complexity_visitor.total_complexity,
+                        raw_metrics.lloc,
+                        comments
+                    )
+                    result["metrics"]["maintainability_index"] = round(mi_score, 2)
+                    
+                    if mi_score < 20:
+                        result["warnings"].append("Low maintainability - consider refactoring")
+                    elif mi_score < 50:
+                        result["suggestions"].append("Moderate maintainability - some improvements possible")
+            except:
+                pass
+            
+            # Check for common issues
+            self._check_python_patterns(tree, result)
+            
+        except SyntaxError as e:
+            result["is_valid"] = False
+            result["errors"].append(f"Syntax Error at line {e.lineno}: {e.msg}")
+        except MemoryError:
+            raise
+        except Exception as e:
+            result["errors"].append(f"Analysis error: {str(e)}")
+        
+        return result
+    
+    def _check_python_patterns(self, tree, result):
+        """Check for common Python patterns and issues"""
+        visitor = _PythonStructureVisitor()
+        visitor.visit(tree)
+        
+        result["metrics"]["imports"] = visitor.imports
+        result["metrics"]["classes"] = visitor.classes
+        result["metrics"]["functions"] = visitor.functions
+        
+        # Check for docstrings
+        if visitor.missing_docstrings and visitor.missing_docstrings > visitor.functions * 0.5:
+            result["suggestions"].append("Consider adding docstrings to functions")
@@ -0,0 +1,79 @@
+import ast
+import zlib
+from collections import Counter
+from typing import List, Sequence
+
+# Subtrees smaller than this (e.g. a bare name or constant) are too common to
+# say anything about a submission and are left out of the fingerprint
+MIN_SUBTREE_SIZE = 3
+
+_MODULUS = (1 << 61) - 1
+_BASE = 1000003
+
+_label_cache = {}
+
+
+def _label_hash(node: ast.AST) -> int:
+    """Hash of a node's own label: its type, with names and literal values anonymized"""
+    if isinstance(node, ast.Constant):
+        label = f"Constant:{type(node.value).__name__}"
+    else:
+        # Name, arg, FunctionDef, ClassDef, Attribute... keep only the node type
+        label = type(node).__name__
+
+    value = _label_cache.get(label)
+    if value is None:
+        value = _label_cache[label] = zlib.crc32(label.encode('utf-8'))
+    return value
+
+
+def _children(node: ast.AST) -> List[ast.AST]:
+    """Child nodes that carry structure (load/store contexts are dropped)"""
+    return [child for child in ast.iter_child_nodes(node) if not isinstance(child, ast.expr_context)]
+
+
+def subtree_hashes(tree: ast.AST, min_size: int = MIN_SUBTREE_SIZE) -> List[int]:
+    """Bottom-up hashes of every normalized subtree with at least min_size nodes
+
+    Identical code modulo renamed identifiers and changed literals yields the same
+    multiset. The walk is iterative, so deeply nested code cannot hit the recursion limit.
+    """
+    hashes = []
+    computed = {}
+    stack = [(tree, None)]
+
+    while stack:
+        node, children = stack.pop()
+
+        if children is None:
+            children = _children(node)
+            stack.append((node, children))
+            stack.extend((child, None) for child in reversed(children))
+            continue
+
+        value = _label_hash(node)
+        size = 1
+        for child in children:
+            child_hash, child_size = computed.pop(id(child))
+            value = (value * _BASE + child_hash) % _MODULUS
+            size += child_size
+
+        computed[id(node)] = (value, size)
+        if size >= min_size:
+            hashes.append(value)
+
+    return sorted(hashes)
+
+
+def fingerprint_source(code: str, min_size: int = MIN_SUBTREE_SIZE) -> List[int]:
+    """Parse Python source once and return its subtree hash multiset (SyntaxError propagates)"""
+    return subtree_hashes(ast.parse(code), min_size)
+
+
+def multiset_similarity(hashes_a: Sequence[int], hashes_b: Sequence[int]) -> float:
+    """Dice coefficient of two hash multisets: 2 * |A & B| / (|A| + |B|)"""
+    total = len(hashes_a) + len(hashes_b)
+    if not total:
+        return 1.0
+    shared = sum((Counter(hashes_a) & Counter(hashes_b)).values())
+    return 2.0 * shared / total
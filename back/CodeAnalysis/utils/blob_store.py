@@ -0,0 +1,124 @@
+import base64
+import os
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+from utils.fingerprint_index import content_hash
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, zlib is always available
+    zstandard = None
+
+BLOB_TABLE = 'code_blobs'
+
+CODEC_ZSTD = 'zstd'
+CODEC_ZLIB = 'zlib'
+
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+
+# Content hashes per code_blobs lookup; each one adds ~70 bytes to the GET URL,
+# which the PostgREST proxy rejects past a few KB
+LOOKUP_BATCH_SIZE = 100
+
+
+def compression_enabled() -> bool:
+    """New submissions keep their content in code_blobs unless COMPRESSED_STORAGE=false"""
+    return os.getenv('COMPRESSED_STORAGE', 'true').lower() == 'true'
+
+
+def compress(content: str, codec: str = None) -> Tuple[str, str]:
+    """Compress text, returning (codec, base64 data); zstd when installed, else zlib"""
+    codec = codec or (CODEC_ZSTD if zstandard is not None else CODEC_ZLIB)
+    raw = content.encode('utf-8')
+
+    if codec == CODEC_ZSTD:
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    elif codec == CODEC_ZLIB:
+        data = zlib.compress(raw, ZLIB_LEVEL)
+    else:
+        raise ValueError(f"Unknown codec '{codec}'")
+
+    return codec, base64.b64encode(data).decode('ascii')
+
+
+def decompress(codec: str, data: str) -> str:
+    """Inverse of compress()"""
+    raw = base64.b64decode(data)
+
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ImportError("zstandard is not installed, cannot read zstd blobs")
+        return zstandard.ZstdDecompressor().decompress(raw).decode('utf-8')
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(raw).decode('utf-8')
+
+    raise ValueError(f"Unknown codec '{codec}'")
+
+
+def blob_row(content: str) -> Dict:
+    """code_blobs row for a piece of content"""
+    codec, data = compress(content)
+    return {
+        "content_hash": content_hash(content),
+        "codec": codec,
+        "data": data,
+        "original_size": len(content.encode('utf-8')),
+        "compressed_size": len(data),
+        "created_at": datetime.utcnow().isoformat()
+    }
+
+
+def store_blobs(supabase, contents: Iterable[str]) -> int:
+    """Save distinct contents, skipping ones already stored; returns the number of blobs sent"""
+    rows = {}
+    for content in contents:
+        hash_value = content_hash(content)
+        if hash_value not in rows:
+            rows[hash_value] = blob_row(content)
+
+    if rows:
+        supabase.table(BLOB_TABLE).upsert(
+            list(rows.values()),
+            on_conflict='content_hash',
+            ignore_duplicates=True
+        ).execute()
+
+    return len(rows)
+
+
+def stored_submission(submission_data: Dict) -> Dict:
+    """code_submissions row as written: the content moves to code_blobs when compression is on"""
+    if not compression_enabled():
+        return submission_data
+    return {**submission_data, "code_content": None}
+
+
+def load_code(supabase, rows: List[Dict]) -> List[Dict]:
+    """Fill code_content of rows stored compressed, with one blob query per LOOKUP_BATCH_SIZE hashes
+
+    Rows written before compressed storage still carry their content and are left alone.
+    Raises ValueError when a row has neither inline content nor a stored blob.
+    """
+    missing = {row['content_hash'] for row in rows if row.get('code_content') is None and row.get('content_hash')}
+    if missing:
+        missing = sorted(missing)
+        contents = {}
+        for start in range(0, len(missing), LOOKUP_BATCH_SIZE):
+            result = supabase.table(BLOB_TABLE).select('content_hash, codec, data').in_(
+                'content_hash', missing[start:start + LOOKUP_BATCH_SIZE]
+            ).execute()
+            for blob in result.data or []:
+                contents[blob['content_hash']] = decompress(blob['codec'], blob['data'])
+
+        for row in rows:
+            if row.get('code_content') is None and row.get('content_hash') in contents:
+                row['code_content'] = contents[row['content_hash']]
+
+    lost = [row for row in rows if row.get('code_content') is None]
+    if lost:
+        details = ', '.join(f"{row.get('id')} ({row.get('content_hash')})" for row in lost[:5])
+        raise ValueError(f"Content of {len(lost)} submission(s) missing from {BLOB_TABLE}: {details}")
+
+    return rows
@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import Dict, Iterable, List
+from utils.plagiarism_detector import PROFILE_VERSION
+
+POSTINGS_TABLE = 'fingerprint_postings'
+SEARCH_FUNCTION = 'search_fingerprint_corpus'
+
+# Rows per insert request when indexing a submission
+POSTING_BATCH_SIZE = 1000
+
+# Fingerprints shared by more submissions than this (boilerplate, starter code)
+# are left out of the ranking. The search still counts their posting lists to
+# find them, but never joins or groups those rows per submission.
+MAX_POSTINGS = 500
+
+# Candidates fetched per requested result when the top-k is rescored exactly
+RESCORE_FACTOR = 3
+
+
+def posting_rows(submission: Dict, fingerprints: Iterable[int],
+                 profile_version: int = PROFILE_VERSION) -> List[Dict]:
+    """Inverted index rows (fingerprint -> submission) for one submission
+
+    Rows carry the profile version of their fingerprints; searches only match
+    postings of their own version, so a PROFILE_VERSION bump never mixes hashes.
+    """
+    indexed_at = datetime.utcnow().isoformat()
+    return [
+        {
+            "fingerprint": fingerprint,
+            "submission_id": submission['id'],
+            "assignment_id": submission['assignment_id'],
+            "language": submission['file_extension'],
+            "profile_version": profile_version,
+            "indexed_at": indexed_at
+        }
+        for fingerprint in sorted(set(fingerprints))
+    ]
+
+
+def index_postings(supabase, rows: List[Dict]) -> int:
+    """Upsert posting rows in chunks; returns the number of round trips
+
+    Existing postings are overwritten, so reindexing moves them to the new profile version.
+    """
+    round_trips = 0
+    for start in range(0, len(rows), POSTING_BATCH_SIZE):
+        supabase.table(POSTINGS_TABLE).upsert(
+            rows[start:start + POSTING_BATCH_SIZE],
+            on_conflict='fingerprint,submission_id'
+        ).execute()
+        round_trips += 1
+    return round_trips
+
+
+def purge_stale_postings(supabase, column: str, value: str, profile_version: int = PROFILE_VERSION):
+    """Delete postings of other profile versions for one submission_id or assignment_id"""
+    supabase.table(POSTINGS_TABLE).delete().eq(column, value).neq('profile_version', profile_version).execute()
+
+
+def index_submission(supabase, submission: Dict, profile: Dict) -> int:
+    """Add a code_submissions row to the corpus index; returns the number of postings"""
+    rows = posting_rows(submission, profile['fingerprints'], profile['profile_version'])
+    index_postings(supabase, rows)
+    purge_stale_postings(supabase, 'submission_id', submission['id'], profile['profile_version'])
+    return len(rows)
+
+
+def search_corpus(supabase, fingerprints: Iterable[int], language: str, exclude_submission: str,
+                  limit: int, exclude_assignment: str = None,
+                  max_postings: int = MAX_POSTINGS, profile_version: int = PROFILE_VERSION) -> List[Dict]:
+    """Submissions sharing the most fingerprints with the query, best first
+
+    Runs server side as one index lookup per query fingerprint, so the cost grows
+    with the posting lists touched rather than with the size of the corpus.
+    Returns dicts with submission_id, assignment_id and shared (fingerprint count).
+    """
+    fingerprints = sorted(set(fingerprints))
+    if not fingerprints:
+        return []
+
+    result = supabase.rpc(SEARCH_FUNCTION, {
+        "query_fingerprints": fingerprints,
+        "query_language": language,
+        "query_profile_version": profile_version,
+        "exclude_submission": exclude_submission,
+        "exclude_assignment": exclude_assignment,
+        "max_results": limit,
+        "max_postings": max_postings
+    }).execute()
+
+    return result.data or []
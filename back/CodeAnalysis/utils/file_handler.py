@@ -1,9 +1,18 @@
+import codecs
 import os
+import posixpath
+import zipfile
+import zlib
 import chardet
 from werkzeug.utils import secure_filename
 
 ALLOWED_EXTENSIONS = os.getenv('ALLOWED_EXTENSIONS', 'py,js,java,cpp,c,cs,ts,jsx,tsx,html,css').split(',')
 MAX_FILE_SIZE = int(os.getenv('MAX_FILE_SIZE', 10485760))  # 10MB default
+MAX_BATCH_FILES = int(os.getenv('MAX_BATCH_FILES', 500))
+
+# Uploads are read in chunks of this size; encoding detection only sees the first sample
+READ_CHUNK_SIZE = 64 * 1024
+ENCODING_SAMPLE_SIZE = 64 * 1024
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -13,28 +22,93 @@ def get_file_extension(filename):
     """Get file extension"""
     return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
 
-def detect_encoding(file_content):
-    """Detect file encoding"""
-    result = chardet.detect(file_content)
+def detect_encoding(file_content, sample_size=ENCODING_SAMPLE_SIZE):
+    """Detect file encoding from a bounded prefix of the content"""
+    result = chardet.detect(file_content[:sample_size])
     return result['encoding'] or 'utf-8'
 
+def decode_content(file_bytes):
+    """Decode raw file bytes, returning (content, encoding)
+
+    Valid UTF-8 (the common case) is decoded directly; only other content pays
+    for encoding detection, and then only on a bounded prefix.
+    """
+    try:
+        if file_bytes.startswith(codecs.BOM_UTF8):
+            return file_bytes.decode('utf-8-sig'), 'UTF-8-SIG'
+        return file_bytes.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    encoding = detect_encoding(file_bytes)
+    try:
+        return file_bytes.decode(encoding), encoding
+    except (UnicodeDecodeError, LookupError):
+        # The prefix was not representative, fall back to the whole content
+        encoding = detect_encoding(file_bytes, len(file_bytes))
+        return file_bytes.decode(encoding), encoding
+
+def read_limited(stream, limit=MAX_FILE_SIZE):
+    """Read a stream in chunks, failing as soon as it grows past limit bytes"""
+    chunks = []
+    size = 0
+    
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > limit:
+            raise ValueError(f"File size exceeds maximum allowed size of {limit} bytes")
+        chunks.append(chunk)
+    
+    return b''.join(chunks)
+
 def read_file_content(file):
-    """Read and decode file content"""
+    """Stream, size-check and decode an upload, returning (content, encoding, file_size)"""
+    file_bytes = read_limited(file.stream if hasattr(file, 'stream') else file)
+    
     try:
-        file_bytes = file.read()
-        encoding = detect_encoding(file_bytes)
-        content = file_bytes.decode(encoding)
-        return content, encoding
+        content, encoding = decode_content(file_bytes)
     except Exception as e:
         raise ValueError(f"Error reading file: {str(e)}")
-
-def validate_file_size(file):
-    """Validate file size"""
-    file.seek(0, os.SEEK_END)
-    file_size = file.tell()
-    file.seek(0)
     
-    if file_size > MAX_FILE_SIZE:
+    return content, encoding, len(file_bytes)
+
+def open_zip_archive(file):
+    """Open an uploaded ZIP in place; entries are decompressed only when read"""
+    try:
+        return zipfile.ZipFile(file.stream if hasattr(file, 'stream') else file)
+    except (zipfile.BadZipFile, OSError) as e:
+        raise ValueError(f"Invalid ZIP archive: {str(e)}")
+
+def zip_code_entries(archive):
+    """Regular files of an archive, skipping folders, hidden files and macOS metadata"""
+    entries = []
+    for info in archive.infolist():
+        name = posixpath.basename(info.filename)
+        if info.is_dir() or not name or name.startswith('.') or info.filename.startswith('__MACOSX/'):
+            continue
+        entries.append(info)
+    return entries
+
+def read_zip_entry(archive, info):
+    """Decompress and decode one archive entry, returning (content, encoding, size)
+
+    Inflation stops past MAX_FILE_SIZE bytes, whatever size the entry declares.
+    """
+    if info.file_size > MAX_FILE_SIZE:
         raise ValueError(f"File size exceeds maximum allowed size of {MAX_FILE_SIZE} bytes")
     
-    return file_size
+    try:
+        with archive.open(info) as entry:
+            file_bytes = read_limited(entry)
+    except (zipfile.BadZipFile, zlib.error, EOFError, RuntimeError, NotImplementedError) as e:
+        raise ValueError(f"Error reading file: {str(e)}")
+    
+    try:
+        content, encoding = decode_content(file_bytes)
+    except Exception as e:
+        raise ValueError(f"Error reading file: {str(e)}")
+    
+    return content, encoding, len(file_bytes)
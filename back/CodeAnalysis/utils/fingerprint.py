@@ -0,0 +1,120 @@
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+# k-gram size (in tokens) and winnowing window size
+KGRAM_SIZE = 5
+WINDOW_SIZE = 4
+
+# Mersenne prime modulus keeps hashes inside a signed 64-bit column
+_MODULUS = (1 << 61) - 1
+_BASE = 1000003
+
+
+def token_hash(token) -> int:
+    """Stable (process independent) hash of a single token"""
+    if isinstance(token, int):
+        return token
+    return zlib.crc32(str(token).encode('utf-8'))
+
+
+def kgram_hashes(tokens: Sequence, k: int = KGRAM_SIZE) -> List[int]:
+    """Rolling polynomial hashes of every k-gram in a token stream"""
+    values = [token_hash(token) for token in tokens]
+
+    if not values:
+        return []
+
+    if len(values) < k:
+        # Short files still get a single fingerprint for the whole stream
+        k = len(values)
+
+    high = pow(_BASE, k - 1, _MODULUS)
+    current = 0
+    for value in values[:k]:
+        current = (current * _BASE + value) % _MODULUS
+
+    hashes = [current]
+    for i in range(k, len(values)):
+        current = (current - values[i - k] * high) % _MODULUS
+        current = (current * _BASE + values[i]) % _MODULUS
+        hashes.append(current)
+
+    return hashes
+
+
+def winnow(hashes: Sequence[int], window: int = WINDOW_SIZE) -> Set[int]:
+    """Select fingerprints with the winnowing algorithm (rightmost minimum per window)"""
+    if len(hashes) <= window:
+        return set(hashes[:1]) if hashes else set()
+
+    fingerprints = set()
+    last_selected = -1
+
+    for start in range(len(hashes) - window + 1):
+        end = start + window
+        min_index = start
+        for i in range(start, end):
+            if hashes[i] <= hashes[min_index]:
+                min_index = i
+
+        if min_index != last_selected:
+            fingerprints.add(hashes[min_index])
+            last_selected = min_index
+
+    return fingerprints
+
+
+def fingerprint_tokens(tokens: Sequence, k: int = KGRAM_SIZE, window: int = WINDOW_SIZE) -> Set[int]:
+    """Compute the winnowed fingerprint set of a token stream"""
+    return winnow(kgram_hashes(tokens, k), window)
+
+
+def candidate_pairs(fingerprints: List[Set[int]], min_overlap: float = 0.25,
+                    max_document_frequency: float = 0.5, min_documents: int = 20) -> Set[Tuple[int, int]]:
+    """Find index pairs whose fingerprint sets overlap enough to be worth a full comparison
+
+    Overlap is measured as containment: shared fingerprints divided by the size of
+    the smaller set. Fingerprints present in more than ``max_document_frequency`` of
+    the documents (starter code, boilerplate) are ignored once there are at least
+    ``min_documents`` documents, so they do not turn every pair into a candidate.
+    """
+    index: Dict[int, List[int]] = defaultdict(list)
+    for doc_id, fps in enumerate(fingerprints):
+        for fp in fps:
+            index[fp].append(doc_id)
+
+    max_postings = len(fingerprints)
+    if len(fingerprints) >= min_documents:
+        max_postings = max(2, int(len(fingerprints) * max_document_frequency))
+
+    shared: Dict[Tuple[int, int], int] = defaultdict(int)
+    for postings in index.values():
+        if len(postings) < 2 or len(postings) > max_postings:
+            continue
+        for i in range(len(postings)):
+            for j in range(i + 1, len(postings)):
+                shared[(postings[i], postings[j])] += 1
+
+    candidates = set()
+    for (a, b), count in shared.items():
+        smallest = min(len(fingerprints[a]), len(fingerprints[b]))
+        if smallest and count / smallest >= min_overlap:
+            candidates.add((a, b))
+
+    return candidates
+
+
+def exact_duplicate_pairs(keys: Iterable) -> Set[Tuple[int, int]]:
+    """Index pairs whose keys (e.g. normalized code) are identical"""
+    groups: Dict[object, List[int]] = defaultdict(list)
+    for doc_id, key in enumerate(keys):
+        groups[key].append(doc_id)
+
+    pairs = set()
+    for members in groups.values():
+        for i in range(len(members)):
+            for j in range(i + 1, len(members)):
+                pairs.add((members[i], members[j]))
+
+    return pairs
@@ -0,0 +1,92 @@
+import hashlib
+from datetime import datetime
+from typing import Dict, List
+from utils.plagiarism_detector import PlagiarismDetector, PROFILE_VERSION
+
+FINGERPRINT_TABLE = 'submission_fingerprints'
+
+# Content hashes per profile lookup, keeping the GET URL well under proxy limits
+LOOKUP_BATCH_SIZE = 100
+
+
+def content_hash(code: str) -> str:
+    """SHA-256 of the submission content, used as the key of derived artifacts"""
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+def _profile_row(hash_value: str, profile: Dict) -> Dict:
+    """Convert a detector profile into a submission_fingerprints row"""
+    return {
+        "content_hash": hash_value,
+        "language": profile['language'],
+        "profile_version": profile['profile_version'],
+        "normalized_code": profile['normalized_code'],
+        "tokens": profile['tokens'],
+        "structure": profile['structure'],
+        "fingerprints": profile['fingerprints'],
+        "created_at": datetime.utcnow().isoformat()
+    }
+
+
+def _row_profile(row: Dict) -> Dict:
+    """Convert a submission_fingerprints row back into a detector profile"""
+    return {
+        "profile_version": row['profile_version'],
+        "language": row['language'],
+        "normalized_code": row['normalized_code'],
+        "tokens": row['tokens'],
+        "structure": row['structure'],
+        "fingerprints": row['fingerprints']
+    }
+
+
+def store_profile(supabase, code: str, language: str, detector: PlagiarismDetector = None) -> Dict:
+    """Build the profile of a newly uploaded submission and persist it"""
+    detector = detector or PlagiarismDetector()
+    hash_value = content_hash(code)
+    profile = detector.build_profile(code, language)
+
+    supabase.table(FINGERPRINT_TABLE).upsert(
+        _profile_row(hash_value, profile),
+        on_conflict='content_hash,language'
+    ).execute()
+
+    return profile
+
+
+def attach_profiles(supabase, submissions: List[Dict], detector: PlagiarismDetector) -> Dict:
+    """Attach stored profiles to comparison data, building and saving only the missing ones
+
+    Each submission dict needs 'code' and 'language' (and 'content_hash' when the
+    row already has it). Returns counters of reused and rebuilt profiles.
+    """
+    for sub in submissions:
+        if not sub.get('content_hash'):
+            sub['content_hash'] = content_hash(sub['code'])
+
+    hashes = sorted({sub['content_hash'] for sub in submissions})
+    stored = {}
+    for start in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+        result = supabase.table(FINGERPRINT_TABLE).select('*').in_(
+            'content_hash', hashes[start:start + LOOKUP_BATCH_SIZE]
+        ).execute()
+        for row in result.data or []:
+            if row.get('profile_version') == PROFILE_VERSION:
+                stored[(row['content_hash'], row['language'])] = _row_profile(row)
+
+    missing = {}
+    for sub in submissions:
+        key = (sub['content_hash'], sub['language'])
+        if key in stored:
+            sub['profile'] = stored[key]
+        elif key in missing:
+            sub['profile'] = missing[key]
+        else:
+            sub['profile'] = detector.build_profile(sub['code'], sub['language'])
+            missing[key] = sub['profile']
+
+    if missing:
+        rows = [_profile_row(hash_value, profile) for (hash_value, _), profile in missing.items()]
+        supabase.table(FINGERPRINT_TABLE).upsert(rows, on_conflict='content_hash,language').execute()
+
+    return {"profiles_reused": len(submissions) - len(missing), "profiles_built": len(missing)}
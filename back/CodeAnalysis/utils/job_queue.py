@@ -0,0 +1,299 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+
+# Minimum seconds between two progress writes of the same job
+PROGRESS_WRITE_INTERVAL = 0.5
+
+# Seconds between heartbeats of a queue's unfinished jobs, and the age after which
+# a heartbeat is considered stale (its worker exited or hung)
+HEARTBEAT_INTERVAL = float(os.getenv('JOB_HEARTBEAT_SECONDS', 10))
+STALE_AFTER = float(os.getenv('JOB_STALE_SECONDS', 60))
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT,
+    total INTEGER DEFAULT 0,
+    processed INTEGER DEFAULT 0,
+    partial_results TEXT DEFAULT '[]',
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    owner_pid INTEGER,
+    heartbeat_at REAL,
+    queue TEXT
+)
+'''
+
+# Columns added after the first release, for job databases created before them
+_ADDED_COLUMNS = {'owner': 'TEXT', 'owner_pid': 'INTEGER', 'heartbeat_at': 'REAL', 'queue': 'TEXT'}
+
+
+def _pid_alive(pid) -> bool:
+    """Whether a process with this pid exists on this host"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobProgress:
+    """Progress reporter handed to a running job"""
+
+    def __init__(self, queue, job_id):
+        self._queue = queue
+        self._job_id = job_id
+        self._partial = []
+        self._last_write = 0.0
+
+    def update(self, processed: int, total: int, new_results=None):
+        """Record progress and append any new partial results"""
+        if new_results:
+            self._partial.extend(new_results)
+
+        now = time.monotonic()
+        if processed < total and now - self._last_write < PROGRESS_WRITE_INTERVAL:
+            return
+
+        self._last_write = now
+        self._queue._update(
+            self._job_id,
+            processed=processed,
+            total=total,
+            partial_results=json.dumps(self._partial, default=str)
+        )
+
+
+class JobQueue:
+    """Background job runner whose state lives in SQLite, so any worker process can report it
+
+    Each queue stamps its rows with its name, an owner id and pid and keeps their
+    heartbeat fresh. On start-up a queue takes over the unfinished jobs of its
+    name whose owner is gone, left behind when a gunicorn worker was recycled or
+    crashed: kinds listed in resumable (safe to run twice) are queued again with
+    their stored params, the others are failed. Queues sharing the database
+    leave each other's live jobs alone.
+    """
+
+    def __init__(self, db_path: str, max_workers: int = 2, name: str = 'jobs',
+                 resumable: Dict[str, Callable] = None):
+        self.db_path = db_path
+        self.name = name
+        self.resumable = dict(resumable or {})
+        self.owner = str(uuid.uuid4())
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+
+        self._execute('PRAGMA journal_mode=WAL')
+        self._execute(_SCHEMA)
+        self._migrate()
+        self.recover_orphaned()
+
+        threading.Thread(target=self._heartbeat, name='job-heartbeat', daemon=True).start()
+
+    def _execute(self, sql: str, params=()) -> int:
+        """Run one statement on a short-lived connection and commit it; returns the changed row count"""
+        with self._lock:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                changed = conn.execute(sql, params).rowcount
+                conn.commit()
+                return changed
+            finally:
+                conn.close()
+
+    def _query(self, sql: str, params=()):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def _migrate(self):
+        existing = {row['name'] for row in self._query('PRAGMA table_info(jobs)')}
+        for name, kind in _ADDED_COLUMNS.items():
+            if name not in existing:
+                try:
+                    self._execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+                except sqlite3.OperationalError:
+                    # Another worker added it first
+                    pass
+
+    def _heartbeat(self):
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+            try:
+                self._execute(
+                    "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status IN (?, ?)",
+                    (time.time(), self.owner, JOB_QUEUED, JOB_RUNNING)
+                )
+            except sqlite3.Error as e:
+                print(f"Error writing job heartbeat: {str(e)}")
+
+    def recover_orphaned(self) -> Dict[str, int]:
+        """Requeue or fail this queue's unfinished jobs whose owner process is gone or whose heartbeat is stale
+
+        Each orphan is claimed with a conditional update, so when several workers
+        start together only one of them takes it over.
+        """
+        rows = self._query(
+            "SELECT * FROM jobs WHERE status IN (?, ?) AND (owner IS NULL OR owner != ?) "
+            "AND (queue IS NULL OR queue = ?)",
+            (JOB_QUEUED, JOB_RUNNING, self.owner, self.name)
+        )
+        now = time.time()
+        recovered = {"requeued": 0, "failed": 0}
+        for row in rows:
+            if _pid_alive(row['owner_pid']) and now - (row['heartbeat_at'] or row['created_at']) <= STALE_AFTER:
+                continue
+
+            func = self.resumable.get(row['kind'])
+            if func is not None:
+                fields = {
+                    "status": JOB_QUEUED, "owner": self.owner, "owner_pid": os.getpid(), "heartbeat_at": now,
+                    "queue": self.name, "started_at": None, "processed": 0, "partial_results": '[]'
+                }
+            else:
+                fields = {
+                    "status": JOB_FAILED, "finished_at": now,
+                    "error": "Worker exited before the job finished; submit it again"
+                }
+
+            columns = ', '.join(f"{name} = ?" for name in fields)
+            claimed = self._execute(
+                f"UPDATE jobs SET {columns} WHERE id = ? AND status = ? AND owner IS ?",
+                (*fields.values(), row['id'], row['status'], row['owner'])
+            )
+            if not claimed:
+                continue
+
+            if func is not None:
+                self._executor.submit(self._run, row['id'], json.loads(row['params'] or '{}'), func)
+                recovered["requeued"] += 1
+            else:
+                recovered["failed"] += 1
+
+        if recovered["requeued"] or recovered["failed"]:
+            print(f"Recovered orphaned jobs of queue '{self.name}': "
+                  f"{recovered['requeued']} requeued, {recovered['failed']} failed")
+        return recovered
+
+    def _update(self, job_id: str, **fields):
+        columns = ', '.join(f"{name} = ?" for name in fields)
+        self._execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def submit(self, kind: str, params: Dict, func: Callable, job_id: str = None) -> str:
+        """Enqueue func(progress, **params) and return the job id (a new UUID unless given)"""
+        job_id = job_id or str(uuid.uuid4())
+
+        self._execute(
+            "INSERT OR REPLACE INTO jobs (id, kind, status, params, created_at, owner, owner_pid, heartbeat_at, queue) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, kind, JOB_QUEUED, json.dumps(params), time.time(), self.owner, os.getpid(), time.time(), self.name)
+        )
+
+        self._executor.submit(self._run, job_id, params, func)
+        return job_id
+
+    def _run(self, job_id: str, params: Dict, func: Callable):
+        self._update(job_id, status=JOB_RUNNING, started_at=time.time())
+
+        try:
+            result = func(JobProgress(self, job_id), **params)
+            self._update(
+                job_id,
+                status=JOB_COMPLETED,
+                result=json.dumps(result, default=str),
+                finished_at=time.time()
+            )
+        except Exception as e:
+            print(f"Error running job {job_id}: {str(e)}")
+            print(traceback.format_exc())
+            self._update(job_id, status=JOB_FAILED, error=str(e), finished_at=time.time())
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return the status of a job, including progress, ETA and partial results"""
+        rows = self._query("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        row = rows[0]
+
+        eta_seconds = None
+        if row['status'] == JOB_RUNNING and row['started_at'] and 0 < row['processed'] < row['total']:
+            elapsed = time.time() - row['started_at']
+            eta_seconds = round(elapsed / row['processed'] * (row['total'] - row['processed']), 1)
+        elif row['status'] == JOB_COMPLETED:
+            eta_seconds = 0
+
+        def timestamp(value):
+            return datetime.utcfromtimestamp(value).isoformat() if value else None
+
+        return {
+            "job_id": row['id'],
+            "kind": row['kind'],
+            "status": row['status'],
+            "params": json.loads(row['params'] or '{}'),
+            "pairs_total": row['total'],
+            "pairs_processed": row['processed'],
+            "progress": round(row['processed'] / row['total'], 4) if row['total'] else 0.0,
+            "eta_seconds": eta_seconds,
+            "partial_results": json.loads(row['partial_results'] or '[]'),
+            "result": json.loads(row['result']) if row['result'] else None,
+            "error": row['error'],
+            "created_at": timestamp(row['created_at']),
+            "started_at": timestamp(row['started_at']),
+            "finished_at": timestamp(row['finished_at'])
+        }
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue(resumable: Dict[str, Callable] = None) -> JobQueue:
+    """Pool for plagiarism jobs; resumable only takes effect on the call that creates it"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            db_path = os.getenv('JOBS_DB_PATH', '/tmp/codeanalysis_jobs.sqlite3')
+            max_workers = int(os.getenv('JOB_WORKERS', 2))
+            _job_queue = JobQueue(db_path, max_workers, 'jobs', resumable)
+    return _job_queue
+
+
+_analysis_queue = None
+
+
+def get_analysis_queue(resumable: Dict[str, Callable] = None) -> JobQueue:
+    """Separate pool for upload analysis, so long plagiarism jobs cannot delay it"""
+    global _analysis_queue
+    with _job_queue_lock:
+        if _analysis_queue is None:
+            db_path = os.getenv('JOBS_DB_PATH', '/tmp/codeanalysis_jobs.sqlite3')
+            max_workers = int(os.getenv('ANALYSIS_WORKERS', 2))
+            _analysis_queue = JobQueue(db_path, max_workers, 'analysis', resumable)
+    return _analysis_queue
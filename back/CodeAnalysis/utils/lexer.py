@@ -0,0 +1,216 @@
+import re
+from typing import Iterator, List, Tuple
+
+# Canonical token classes. Identifiers, numbers and string literals collapse to a
+# single class each, so renamed variables or edited literals do not change the stream.
+IDENT = 'IDENT'
+NUM = 'NUM'
+STR = 'STR'
+
+_KEYWORDS = {
+    'py': {
+        'False', 'None', 'True', 'and', 'as', 'assert', 'async', 'await', 'break', 'class',
+        'continue', 'def', 'del', 'elif', 'else', 'except', 'finally', 'for', 'from', 'global',
+        'if', 'import', 'in', 'is', 'lambda', 'nonlocal', 'not', 'or', 'pass', 'raise',
+        'return', 'try', 'while', 'with', 'yield',
+    },
+    'js': {
+        'async', 'await', 'break', 'case', 'catch', 'class', 'const', 'continue', 'debugger',
+        'default', 'delete', 'do', 'else', 'export', 'extends', 'false', 'finally', 'for',
+        'function', 'if', 'import', 'in', 'instanceof', 'let', 'new', 'null', 'return', 'super',
+        'switch', 'this', 'throw', 'true', 'try', 'typeof', 'undefined', 'var', 'void', 'while',
+        'with', 'yield', 'of', 'from',
+    },
+    'ts': {
+        'abstract', 'any', 'as', 'boolean', 'declare', 'enum', 'implements', 'interface',
+        'keyof', 'module', 'namespace', 'never', 'number', 'private', 'protected', 'public',
+        'readonly', 'string', 'type', 'unknown',
+    },
+    'java': {
+        'abstract', 'assert', 'boolean', 'break', 'byte', 'case', 'catch', 'char', 'class',
+        'const', 'continue', 'default', 'do', 'double', 'else', 'enum', 'extends', 'false',
+        'final', 'finally', 'float', 'for', 'if', 'implements', 'import', 'instanceof', 'int',
+        'interface', 'long', 'native', 'new', 'null', 'package', 'private', 'protected',
+        'public', 'return', 'short', 'static', 'super', 'switch', 'synchronized', 'this',
+        'throw', 'throws', 'transient', 'true', 'try', 'var', 'void', 'volatile', 'while',
+    },
+    'c': {
+        'auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do', 'double', 'else',
+        'enum', 'extern', 'float', 'for', 'goto', 'if', 'inline', 'int', 'long', 'register',
+        'return', 'short', 'signed', 'sizeof', 'static', 'struct', 'switch', 'typedef', 'union',
+        'unsigned', 'void', 'volatile', 'while', 'NULL',
+    },
+    'cpp': {
+        'bool', 'catch', 'class', 'constexpr', 'delete', 'false', 'friend', 'namespace', 'new',
+        'nullptr', 'operator', 'private', 'protected', 'public', 'template', 'this', 'throw',
+        'true', 'try', 'typename', 'using', 'virtual',
+    },
+    'cs': {
+        'abstract', 'as', 'base', 'bool', 'break', 'byte', 'case', 'catch', 'char', 'class',
+        'const', 'continue', 'decimal', 'default', 'delegate', 'do', 'double', 'else', 'enum',
+        'event', 'false', 'finally', 'float', 'for', 'foreach', 'get', 'if', 'in', 'int',
+        'interface', 'internal', 'is', 'long', 'namespace', 'new', 'null', 'object', 'out',
+        'override', 'private', 'protected', 'public', 'readonly', 'ref', 'return', 'set',
+        'static', 'string', 'struct', 'switch', 'this', 'throw', 'true', 'try', 'using', 'var',
+        'virtual', 'void', 'while',
+    },
+}
+
+# File extension -> keyword sets of its language
+_LANGUAGE_KEYWORDS = {
+    'py': _KEYWORDS['py'],
+    'js': _KEYWORDS['js'],
+    'jsx': _KEYWORDS['js'],
+    'ts': _KEYWORDS['js'] | _KEYWORDS['ts'],
+    'tsx': _KEYWORDS['js'] | _KEYWORDS['ts'],
+    'java': _KEYWORDS['java'],
+    'c': _KEYWORDS['c'],
+    'cpp': _KEYWORDS['c'] | _KEYWORDS['cpp'],
+    'cs': _KEYWORDS['cs'],
+}
+
+SUPPORTED_LANGUAGES = tuple(_LANGUAGE_KEYWORDS)
+
+_OPERATORS = [
+    '>>>=', '<<=', '>>=', '>>>', '===', '!==', '**=', '//=', '...', '->', '::', '=>', '++', '--',
+    '&&', '||', '==', '!=', '<=', '>=', '+=', '-=', '*=', '/=', '%=', '&=', '|=', '^=', '<<',
+    '>>', '**', '//', '??', '?.', ':=',
+    '+', '-', '*', '/', '%', '=', '<', '>', '!', '&', '|', '^', '~', '?', ':', ';', ',', '.',
+    '(', ')', '{', '}', '[', ']', '@',
+]
+
+_DIRECTIVES = [
+    '#define', '#elif', '#else', '#endif', '#endregion', '#error', '#if', '#ifdef', '#ifndef',
+    '#include', '#line', '#nullable', '#pragma', '#region', '#undef', '#warning',
+]
+
+_NUMBER = r'0[xXbBoO][0-9a-fA-F_]+[uUlLnN]*|(?:\d[\d_]*(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?[fFdDlLuUmMjJn]*'
+_IDENTIFIER = r'[A-Za-z_$][\w$]*'
+_OPERATOR = '|'.join(re.escape(op) for op in _OPERATORS)
+_QUOTED = r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+
+_BRACE_BODY = (
+    r'|(?P<str>@"(?:""|[^"])*"|`(?:\\[\s\S]|[^`\\])*`|' + _QUOTED + r')'
+    r'|(?P<num>' + _NUMBER + r')'
+    r'|(?P<ident>' + _IDENTIFIER + r')'
+    r'|(?P<op>' + _OPERATOR + r')'
+    r'|(?P<other>.)'
+)
+
+# Newlines are skipped on their own so that a preprocessor directive is still
+# matched at the start of its (possibly indented) line
+_BRACE_SKIP = r'(?P<skip>[ \t\r\f\v]+|\n|//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))'
+
+_BRACE_PATTERN = re.compile(_BRACE_SKIP + _BRACE_BODY)
+
+# C, C++ and C# also have line-based preprocessor directives
+_PREPROCESSOR_PATTERN = re.compile(
+    r'(?P<directive>^[ \t]*#[ \t]*[A-Za-z]+)[^\n]*|' + _BRACE_SKIP + _BRACE_BODY,
+    re.MULTILINE
+)
+
+_PYTHON_PATTERN = re.compile(
+    r'(?P<skip>\s+|#[^\n]*|\\\n)'
+    r'|(?P<str>(?:[rRbBuUfF]{1,2})?(?:"""[\s\S]*?(?:"""|\Z)|\'\'\'[\s\S]*?(?:\'\'\'|\Z)|' + _QUOTED + r'))'
+    r'|(?P<num>' + _NUMBER + r')'
+    r'|(?P<ident>' + _IDENTIFIER + r')'
+    r'|(?P<op>' + _OPERATOR + r')'
+    r'|(?P<other>.)'
+)
+
+# JavaScript regex literals, recognized only where a '/' cannot be a division
+_REGEX_LITERAL = re.compile(r'/(?![*/])(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[A-Za-z]*')
+_REGEX_PREFIX_KEYWORDS = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw', 'case',
+    'do', 'else', 'yield', 'await',
+}
+_JS_LANGUAGES = ('js', 'jsx', 'ts', 'tsx')
+
+# Stable integer ids: 1..3 for the literal classes, then the sorted vocabulary.
+# Changing the vocabulary changes the ids, so bump PROFILE_VERSION in plagiarism_detector.
+_VOCABULARY = [IDENT, NUM, STR] + sorted(set().union(*_KEYWORDS.values())) + _DIRECTIVES + _OPERATORS
+TOKEN_IDS = {}
+for _token in _VOCABULARY:
+    TOKEN_IDS.setdefault(_token, len(TOKEN_IDS) + 1)
+_UNKNOWN_ID = len(TOKEN_IDS) + 1
+
+
+def _token_class(kind: str, text: str, keywords) -> str:
+    """Canonical class of a matched lexeme"""
+    if kind == 'ident':
+        return text if text in keywords else IDENT
+    if kind == 'num':
+        return NUM
+    if kind == 'str':
+        return STR
+    if kind == 'directive':
+        # Preprocessor directives keep their name, e.g. '#include'
+        return '#' + text.strip()[1:].strip()
+    return text
+
+
+def _regex_can_start(previous: str, keywords) -> bool:
+    """Whether a '/' after the previous token class opens a JS regex literal rather than dividing"""
+    if previous is None:
+        return True
+    if previous in (IDENT, NUM, STR, ')', ']', '}', '++', '--'):
+        return False
+    if previous in keywords:
+        return previous in _REGEX_PREFIX_KEYWORDS
+    return True
+
+
+def iter_tokens(code: str, language: str) -> Iterator[Tuple[str, str, int]]:
+    """Yield (canonical class, lexeme, offset) for every significant token
+
+    Comments and whitespace are dropped; string, character and template literals,
+    numbers and identifiers are reported by class, keywords and operators as themselves.
+    JavaScript/TypeScript regex literals are reported as STR.
+    """
+    keywords = _LANGUAGE_KEYWORDS.get(language, set())
+    if language == 'py':
+        pattern = _PYTHON_PATTERN
+    elif language in ('c', 'cpp', 'cs'):
+        pattern = _PREPROCESSOR_PATTERN
+    else:
+        pattern = _BRACE_PATTERN
+
+    if language not in _JS_LANGUAGES:
+        for match in pattern.finditer(code):
+            kind = match.lastgroup
+            if kind != 'skip':
+                text = match.group(kind)
+                yield _token_class(kind, text, keywords), text, match.start()
+        return
+
+    # JavaScript/TypeScript: a '/' may open a regex literal, which then resumes the scan after it
+    previous = None
+    position = 0
+    length = len(code)
+    while position < length:
+        match = pattern.match(code, position)
+        position = match.end()
+        kind = match.lastgroup
+        if kind == 'skip':
+            continue
+
+        text = match.group(kind)
+        start = match.start()
+        token = _token_class(kind, text, keywords)
+        if text in ('/', '/=') and kind == 'op' and _regex_can_start(previous, keywords):
+            literal = _REGEX_LITERAL.match(code, start)
+            if literal:
+                token, text, position = STR, literal.group(), literal.end()
+
+        previous = token
+        yield token, text, start
+
+
+def token_classes(code: str, language: str) -> List[str]:
+    """Canonical token class stream of the code"""
+    return [token for token, _, _ in iter_tokens(code, language)]
+
+
+def token_ids(code: str, language: str) -> List[int]:
+    """Canonical token class stream encoded as small integers"""
+    return [TOKEN_IDS.get(token, _UNKNOWN_ID) for token, _, _ in iter_tokens(code, language)]
@@ -0,0 +1,83 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Columns returned by list endpoints unless more are requested with include=
+LIST_COLUMNS = [
+    'id', 'assignment_id', 'student_id', 'filename', 'file_extension', 'file_size',
+    'encoding', 'content_hash', 'submitted_at', 'is_analyzed'
+]
+
+# include= values and the heavy columns they add
+INCLUDE_COLUMNS = {
+    'code': 'code_content',
+    'analysis': 'analysis_result',
+}
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def list_columns(include: Optional[str]) -> str:
+    """Projection for a list query: metadata plus any include=code,analysis columns"""
+    columns = list(LIST_COLUMNS)
+    for name in (include or '').split(','):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in INCLUDE_COLUMNS:
+            raise ValueError(f"Unknown include '{name}', expected one of: {', '.join(INCLUDE_COLUMNS)}")
+        columns.append(INCLUDE_COLUMNS[name])
+    return ', '.join(columns)
+
+
+def page_size(limit: Optional[int]) -> int:
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE"""
+    return min(max(limit or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+
+
+def encode_cursor(row: Dict) -> str:
+    """Opaque cursor pointing just after a row in (submitted_at, id) order"""
+    payload = json.dumps([row['submitted_at'], row['id']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """(submitted_at, id) of a cursor made by encode_cursor"""
+    try:
+        submitted_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        # Both values end up in a filter expression, so only well-formed ones are accepted
+        datetime.fromisoformat(submitted_at)
+        return submitted_at, str(uuid.UUID(row_id))
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_page(query, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """Run a list query newest first, one page at a time
+
+    Rows are ordered by (submitted_at DESC, id DESC) and the cursor resumes
+    strictly after the last row of the previous page, so pages stay stable
+    while new submissions arrive and cost the same at any depth.
+    """
+    # postgrest-py 0.13 has no or_() and sends each order() as a separate parameter,
+    # so the keyset filter and the two-column sort are added as raw parameters
+    if cursor:
+        submitted_at, row_id = decode_cursor(cursor)
+        query.params = query.params.add(
+            'or',
+            f'(submitted_at.lt."{submitted_at}",and(submitted_at.eq."{submitted_at}",id.lt.{row_id}))'
+        )
+    query.params = query.params.add('order', 'submitted_at.desc,id.desc')
+
+    result = query.limit(limit + 1).execute()
+    rows = result.data or []
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+
+    return rows, next_cursor
@@ -1,65 +1,365 @@
-import difflib
+import multiprocessing
 import re
-import ast
-from typing import List, Dict, Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Dict, Tuple, Set
+from utils.fingerprint import fingerprint_tokens, candidate_pairs, exact_duplicate_pairs
+from utils.similarity_kernels import SimilarityKernel, get_kernel
+from utils.lexer import token_ids
+from utils.ast_fingerprint import fingerprint_source, multiset_similarity
+
+# Comparison modes: every pair, or only pairs selected by fingerprint overlap
+MODE_EXHAUSTIVE = 'exhaustive'
+MODE_FINGERPRINT = 'fingerprint'
+MODES = (MODE_EXHAUSTIVE, MODE_FINGERPRINT)
+
+# Bump whenever the derived artifacts of build_profile change, so stored
+# profiles computed by an older version are rebuilt instead of reused
+PROFILE_VERSION = 5
+
+# k-gram size for canonical token class streams; classes are far less
+# distinctive than raw words, so longer k-grams are needed to stay selective
+CLASS_KGRAM_SIZE = 12
+
+# Python class streams have no braces and few keywords per line, so they need
+# longer k-grams than the brace languages for the same selectivity
+PY_CLASS_KGRAM_SIZE = 20
+
+BRACE_LANGUAGES = ['js', 'jsx', 'ts', 'tsx', 'java', 'c', 'cpp', 'cs']
+
+# Below this many pairs the process pool start-up costs more than it saves
+MIN_PARALLEL_PAIRS = 64
+
+# Pairs compared between two progress notifications (also caps parallel chunk size)
+PROGRESS_INTERVAL = 200
+
+# Upper bounds must clear the threshold by this much, so pruning never hides a
+# pair whose overall similarity would round up to the threshold
+PRUNE_MARGIN = 1e-4
+
+# Per-process state of pool workers, shipped once by _init_worker
+_worker_detector = None
+_worker_submissions = None
+
+def _init_worker(detector, submissions):
+    """Receive the detector and the pre-profiled submissions once per worker process"""
+    global _worker_detector, _worker_submissions
+    _worker_detector = detector
+    _worker_submissions = submissions
+
+def _compare_chunk(pairs):
+    """Compare a chunk of submission index pairs inside a worker process"""
+    _worker_detector.pruned_pairs = 0
+    results = []
+    for i, j in pairs:
+        case = _worker_detector._compare_pair(_worker_submissions[i], _worker_submissions[j])
+        if case:
+            results.append(case)
+    return results, _worker_detector.pruned_pairs
 
 class PlagiarismDetector:
     """Detects code plagiarism using multiple algorithms"""
     
-    def __init__(self, threshold=0.75):
+    def __init__(self, threshold=0.75, mode=MODE_EXHAUSTIVE, candidate_overlap=0.25, workers=1, kernel=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown plagiarism mode '{mode}', expected one of {', '.join(MODES)}")
+        
         self.threshold = threshold
+        self.mode = mode
+        self.candidate_overlap = candidate_overlap
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.kernel = kernel if isinstance(kernel, SimilarityKernel) else get_kernel(kernel)
+        self.pruned_pairs = 0
+        self.last_stats = {}
+        # Ids of the corpus submissions the last compare_against actually compared
+        self.last_compared_ids = []
     
-    def compare_submissions(self, submissions: List[Dict]) -> List[Dict]:
-        """Compare all submissions and detect plagiarism"""
+    def compare_submissions(self, submissions: List[Dict], progress_callback: Callable = None) -> List[Dict]:
+        """Compare all submissions and detect plagiarism
+
+        progress_callback, when given, is called as (pairs_processed, pairs_total, new_cases)
+        while the comparison runs.
+        """
         results = []
+        total_pairs = len(submissions) * (len(submissions) - 1) // 2
         
-        for i in range(len(submissions)):
-            for j in range(i + 1, len(submissions)):
-                submission_a = submissions[i]
-                submission_b = submissions[j]
-                
-                similarity = self.calculate_similarity(
-                    submission_a['code'],
-                    submission_b['code'],
-                    submission_a['language']
-                )
+        if self.mode == MODE_FINGERPRINT:
+            pairs = sorted(self.generate_candidates(submissions))
+        else:
+            pairs = [(i, j) for i in range(len(submissions)) for j in range(i + 1, len(submissions))]
+        
+        self.pruned_pairs = 0
+        workers = min(self.workers, max(1, len(pairs) // MIN_PARALLEL_PAIRS))
+        if workers > 1:
+            results = self._compare_parallel(submissions, pairs, workers, progress_callback)
+        else:
+            pending = []
+            for processed, (i, j) in enumerate(pairs, start=1):
+                case = self._compare_pair(submissions[i], submissions[j])
+                if case:
+                    results.append(case)
+                    pending.append(case)
                 
-                if similarity['overall_similarity'] >= self.threshold:
-                    results.append({
-                        "submission_a_id": submission_a['id'],
-                        "submission_b_id": submission_b['id'],
-                        "student_a_id": submission_a['student_id'],
-                        "student_b_id": submission_b['student_id'],
-                        "similarity_score": similarity['overall_similarity'],
-                        "text_similarity": similarity['text_similarity'],
-                        "structure_similarity": similarity.get('structure_similarity', 0),
-                        "details": similarity['details'],
-                        "is_plagiarism": True
-                    })
+                if progress_callback and (processed % PROGRESS_INTERVAL == 0 or processed == len(pairs)):
+                    progress_callback(processed, len(pairs), pending)
+                    pending = []
+        
+        self.last_stats = {
+            "mode": self.mode,
+            "total_pairs": total_pairs,
+            "compared_pairs": len(pairs),
+            "pruned_pairs": self.pruned_pairs,
+            "workers": workers
+        }
+        
+        return results
+    
+    def _compare_parallel(self, submissions: List[Dict], pairs: List[Tuple[int, int]], workers: int,
+                          progress_callback: Callable = None) -> List[Dict]:
+        """Fan pair chunks out over a process pool, preserving the serial result order"""
+        # Profiles are built once here and shipped to each worker with the initializer
+        for sub in submissions:
+            self._profile_of(sub)
+        
+        # Several chunks per worker keeps the pool balanced when pair costs differ
+        chunk_size = max(1, min(PROGRESS_INTERVAL, -(-len(pairs) // (workers * 4))))
+        chunks = [pairs[start:start + chunk_size] for start in range(0, len(pairs), chunk_size)]
+        
+        results = []
+        processed = 0
+        # Callers are threaded (gunicorn gthread workers, the job queue), and forking a
+        # threaded process can leave children stuck on locks held by other threads
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(self, submissions)) as executor:
+            for chunk, (chunk_results, chunk_pruned) in zip(chunks, executor.map(_compare_chunk, chunks)):
+                results.extend(chunk_results)
+                self.pruned_pairs += chunk_pruned
+                processed += len(chunk)
+                if progress_callback:
+                    progress_callback(processed, len(pairs), chunk_results)
         
         return results
     
-    def calculate_similarity(self, code_a: str, code_b: str, language: str) -> Dict:
+    def compare_against(self, submission: Dict, corpus: List[Dict]) -> List[Dict]:
+        """Compare a single (new or changed) submission against the rest of an assignment"""
+        results = []
+        
+        if self.mode == MODE_FINGERPRINT:
+            profile = self._profile_of(submission)
+            fingerprints = set(profile['fingerprints'])
+            others = [
+                other for other in corpus
+                if self._is_candidate(profile, fingerprints, self._profile_of(other))
+            ]
+        else:
+            others = corpus
+        
+        self.pruned_pairs = 0
+        self.last_compared_ids = [other['id'] for other in others]
+        for other in others:
+            # Existing submissions come first; saved reports are re-oriented by submission id
+            case = self._compare_pair(other, submission)
+            if case:
+                results.append(case)
+        
+        self.last_stats = {
+            "mode": self.mode,
+            "total_pairs": len(corpus),
+            "compared_pairs": len(others),
+            "pruned_pairs": self.pruned_pairs
+        }
+        
+        return results
+    
+    def _is_candidate(self, profile: Dict, fingerprints: Set[int], other_profile: Dict) -> bool:
+        """Whether two profiles overlap enough to deserve a full comparison"""
+        if profile['normalized_code'] == other_profile['normalized_code']:
+            return True
+        
+        smallest = min(len(fingerprints), len(other_profile['fingerprints']))
+        if not smallest:
+            return False
+        
+        shared = len(fingerprints.intersection(other_profile['fingerprints']))
+        return shared / smallest >= self.candidate_overlap
+    
+    def _compare_pair(self, submission_a: Dict, submission_b: Dict) -> Dict:
+        """Compare two submissions, returning a plagiarism case when above threshold"""
+        similarity = self._staged_similarity(
+            submission_a['code'],
+            submission_b['code'],
+            submission_a['language'],
+            self._profile_of(submission_a),
+            self._profile_of(submission_b)
+        )
+        
+        if similarity is None:
+            self.pruned_pairs += 1
+            return None
+        
+        if similarity['overall_similarity'] < self.threshold:
+            return None
+        
+        return {
+            "submission_a_id": submission_a['id'],
+            "submission_b_id": submission_b['id'],
+            "student_a_id": submission_a['student_id'],
+            "student_b_id": submission_b['student_id'],
+            "similarity_score": similarity['overall_similarity'],
+            "text_similarity": similarity['text_similarity'],
+            "structure_similarity": similarity.get('structure_similarity', 0),
+            "details": similarity['details'],
+            "is_plagiarism": True
+        }
+    
+    def generate_candidates(self, submissions: List[Dict]) -> Set[Tuple[int, int]]:
+        """Select plausibly similar submission index pairs using winnowed k-gram fingerprints"""
+        profiles = [self._profile_of(sub) for sub in submissions]
+        fingerprints = [set(profile['fingerprints']) for profile in profiles]
+        
+        candidates = candidate_pairs(fingerprints, min_overlap=self.candidate_overlap)
+        candidates |= exact_duplicate_pairs(profile['normalized_code'] for profile in profiles)
+        
+        return candidates
+    
+    def evaluate_candidates(self, submissions: List[Dict]) -> Dict:
+        """Measure candidate generation recall/precision against the exhaustive scan"""
+        exhaustive = PlagiarismDetector(self.threshold, MODE_EXHAUSTIVE, workers=self.workers, kernel=self.kernel).compare_submissions(submissions)
+        expected = {(case['submission_a_id'], case['submission_b_id']) for case in exhaustive}
+        
+        candidates = self.generate_candidates(submissions)
+        candidate_ids = {(submissions[i]['id'], submissions[j]['id']) for i, j in candidates}
+        
+        found = expected & candidate_ids
+        total_pairs = len(submissions) * (len(submissions) - 1) // 2
+        
+        return {
+            "total_pairs": total_pairs,
+            "candidate_pairs": len(candidate_ids),
+            "flagged_pairs": len(expected),
+            "flagged_in_candidates": len(found),
+            "recall": round(len(found) / len(expected), 4) if expected else 1.0,
+            "precision": round(len(found) / len(candidate_ids), 4) if candidate_ids else 1.0,
+            "pruned_ratio": round(1 - len(candidate_ids) / total_pairs, 4) if total_pairs else 0.0
+        }
+    
+    def build_profile(self, code: str, language: str) -> Dict:
+        """Compute the derived artifacts used to compare a submission against others"""
+        normalized = self._normalize_code(code, language)
+        
+        # Python structure is the multiset of anonymized AST subtree hashes
+        structure = None
+        if language == 'py':
+            try:
+                structure = fingerprint_source(code)
+            except (SyntaxError, ValueError, RecursionError, MemoryError):
+                structure = None
+        
+        # Canonical token class ids (IDENT, NUM, STR, keywords, operators) for brace
+        # languages, so renamed identifiers do not change tokens or fingerprints
+        if language in BRACE_LANGUAGES:
+            tokens = token_ids(code, language)
+            fingerprints = fingerprint_tokens(tokens, k=CLASS_KGRAM_SIZE)
+        elif language == 'py':
+            # Python compares structure through the AST, but its fingerprints need
+            # the same rename resistance as the brace languages
+            tokens = self._tokenize_code(code)
+            fingerprints = fingerprint_tokens(token_ids(code, language), k=PY_CLASS_KGRAM_SIZE)
+        else:
+            tokens = self._tokenize_code(code)
+            fingerprints = fingerprint_tokens(self._tokenize_code(normalized))
+        
+        return {
+            "profile_version": PROFILE_VERSION,
+            "language": language,
+            "normalized_code": normalized,
+            "tokens": tokens,
+            "structure": structure,
+            "fingerprints": sorted(fingerprints)
+        }
+    
+    def _profile_of(self, submission: Dict) -> Dict:
+        """Return the submission's profile, building (and memoizing) it when missing or stale"""
+        profile = submission.get('profile')
+        if not profile or profile.get('profile_version') != PROFILE_VERSION:
+            profile = self.build_profile(submission['code'], submission['language'])
+            submission['profile'] = profile
+        return profile
+    
+    def calculate_similarity(self, code_a: str, code_b: str, language: str,
+                             profile_a: Dict = None, profile_b: Dict = None) -> Dict:
         """Calculate similarity between two code submissions"""
+        profile_a = profile_a or self.build_profile(code_a, language)
+        profile_b = profile_b or self.build_profile(code_b, language)
+        
         # Text-based similarity
         text_similarity = self._text_similarity(code_a, code_b)
         
         # Structure-based similarity (for supported languages)
-        structure_similarity = 0
-        if language == 'py':
-            structure_similarity = self._python_structure_similarity(code_a, code_b)
-        elif language in ['js', 'jsx', 'ts', 'tsx', 'java', 'c', 'cpp', 'cs']:
-            structure_similarity = self._token_based_similarity(code_a, code_b)
+        structure_similarity = self._structure_similarity(profile_a, profile_b, language)
         
         # Normalized code similarity (removes whitespace and comments)
-        normalized_similarity = self._normalized_similarity(code_a, code_b, language)
+        normalized_similarity = self._normalized_similarity(profile_a, profile_b)
         
-        # Overall similarity (weighted average)
-        overall_similarity = (
-            text_similarity * 0.3 +
-            structure_similarity * 0.4 +
-            normalized_similarity * 0.3
+        return self._similarity_result(text_similarity, structure_similarity, normalized_similarity)
+    
+    def _staged_similarity(self, code_a: str, code_b: str, language: str,
+                           profile_a: Dict, profile_b: Dict) -> Dict:
+        """calculate_similarity with early exit: None once an upper bound proves the pair is below threshold
+        
+        Cheap bounds (lengths, then multiset overlap) are tried first; exact ratios
+        then replace the bounds one by one, cheapest and heaviest first. Pairs that
+        are not pruned get exactly the scores of calculate_similarity.
+        """
+        cutoff = self.threshold - PRUNE_MARGIN
+        inputs = {
+            "text": (code_a, code_b),
+            "structure": self._structure_inputs(profile_a, profile_b, language),
+            "normalized": (profile_a['normalized_code'], profile_b['normalized_code'])
+        }
+        
+        # A component without inputs scores exactly 0
+        scores = {name: 1.0 if pair is not None else 0.0 for name, pair in inputs.items()}
+        
+        for bound in (self.kernel.length_bound, self.kernel.overlap_bound):
+            for name, pair in inputs.items():
+                if pair is not None:
+                    scores[name] = min(scores[name], bound(*pair))
+            if self._weighted(scores) < cutoff:
+                return None
+        
+        exact = {
+            "structure": lambda: self._structure_similarity(profile_a, profile_b, language),
+            "normalized": lambda: self._normalized_similarity(profile_a, profile_b),
+            "text": lambda: self._text_similarity(code_a, code_b)
+        }
+        for name in ("structure", "normalized", "text"):
+            if inputs[name] is not None:
+                scores[name] = exact[name]()
+            if self._weighted(scores) < cutoff:
+                return None
+        
+        return self._similarity_result(scores['text'], scores['structure'], scores['normalized'])
+    
+    def _weighted(self, scores: Dict) -> float:
+        """Weighted overall similarity of the component scores"""
+        return (
+            scores['text'] * 0.3 +
+            scores['structure'] * 0.4 +
+            scores['normalized'] * 0.3
         )
+    
+    def _similarity_result(self, text_similarity: float, structure_similarity: float,
+                           normalized_similarity: float) -> Dict:
+        """Combine component scores into the similarity result"""
+        # Overall similarity (weighted average)
+        overall_similarity = self._weighted({
+            "text": text_similarity,
+            "structure": structure_similarity,
+            "normalized": normalized_similarity
+        })
         
         return {
             "overall_similarity": round(overall_similarity, 4),
@@ -69,15 +369,31 @@ class PlagiarismDetector:
             "details": self._get_similarity_details(overall_similarity)
         }
     
+    def _structure_inputs(self, profile_a: Dict, profile_b: Dict, language: str):
+        """Sequences compared by the structure component, or None when it scores 0"""
+        if language == 'py':
+            if profile_a['structure'] is None or profile_b['structure'] is None:
+                return None
+            return profile_a['structure'], profile_b['structure']
+        elif language in BRACE_LANGUAGES:
+            return profile_a['tokens'], profile_b['tokens']
+        return None
+    
+    def _structure_similarity(self, profile_a: Dict, profile_b: Dict, language: str) -> float:
+        """Structure-based similarity for supported languages"""
+        if language == 'py':
+            return self._python_structure_similarity(profile_a, profile_b)
+        elif language in BRACE_LANGUAGES:
+            return self._token_based_similarity(profile_a, profile_b)
+        return 0
+    
     def _text_similarity(self, text_a: str, text_b: str) -> float:
-        """Calculate text similarity using SequenceMatcher"""
-        return difflib.SequenceMatcher(None, text_a, text_b).ratio()
+        """Calculate text similarity with the configured kernel"""
+        return self.kernel.ratio(text_a, text_b)
     
-    def _normalized_similarity(self, code_a: str, code_b: str, language: str) -> float:
+    def _normalized_similarity(self, profile_a: Dict, profile_b: Dict) -> float:
         """Calculate similarity after normalizing code"""
-        norm_a = self._normalize_code(code_a, language)
-        norm_b = self._normalize_code(code_b, language)
-        return difflib.SequenceMatcher(None, norm_a, norm_b).ratio()
+        return self.kernel.ratio(profile_a['normalized_code'], profile_b['normalized_code'])
     
     def _normalize_code(self, code: str, language: str) -> str:
         """Normalize code by removing comments, whitespace, and formatting"""
@@ -86,7 +402,7 @@ class PlagiarismDetector:
             code = re.sub(r'#.*', '', code)
             code = re.sub(r'"""[\s\S]*?"""', '', code)
             code = re.sub(r"'''[\s\S]*?'''", '', code)
-        elif language in ['js', 'jsx', 'ts', 'tsx', 'java', 'c', 'cpp', 'cs']:
+        elif language in BRACE_LANGUAGES:
             code = re.sub(r'//.*', '', code)
             code = re.sub(r'/\*[\s\S]*?\*/', '', code)
         
@@ -99,50 +415,17 @@ class PlagiarismDetector:
         
         return code
     
-    def _python_structure_similarity(self, code_a: str, code_b: str) -> float:
-        """Calculate structural similarity for Python code using AST"""
-        try:
-            tree_a = ast.parse(code_a)
-            tree_b = ast.parse(code_b)
-            
-            structure_a = self._extract_python_structure(tree_a)
-            structure_b = self._extract_python_structure(tree_b)
-            
-            # Compare structures
-            similarity = difflib.SequenceMatcher(None, structure_a, structure_b).ratio()
-            return similarity
-        except:
+    def _python_structure_similarity(self, profile_a: Dict, profile_b: Dict) -> float:
+        """Calculate structural similarity for Python code from AST subtree hashes"""
+        # A missing structure means the code could not be parsed
+        if profile_a['structure'] is None or profile_b['structure'] is None:
             return 0.0
+        
+        return multiset_similarity(profile_a['structure'], profile_b['structure'])
     
-    def _extract_python_structure(self, tree) -> str:
-        """Extract structural representation of Python code"""
-        structure = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                structure.append(f"FUNC:{node.name}:{len(node.args.args)}")
-            elif isinstance(node, ast.ClassDef):
-                structure.append(f"CLASS:{node.name}")
-            elif isinstance(node, ast.For):
-                structure.append("FOR_LOOP")
-            elif isinstance(node, ast.While):
-                structure.append("WHILE_LOOP")
-            elif isinstance(node, ast.If):
-                structure.append("IF_STATEMENT")
-            elif isinstance(node, ast.Import):
-                for alias in node.names:
-                    structure.append(f"IMPORT:{alias.name}")
-            elif isinstance(node, ast.ImportFrom):
-                structure.append(f"IMPORT_FROM:{node.module}")
-        
-        return "|".join(structure)
-    
-    def _token_based_similarity(self, code_a: str, code_b: str) -> float:
-        """Calculate similarity based on code tokens"""
-        tokens_a = self._tokenize_code(code_a)
-        tokens_b = self._tokenize_code(code_b)
-        
-        return difflib.SequenceMatcher(None, tokens_a, tokens_b).ratio()
+    def _token_based_similarity(self, profile_a: Dict, profile_b: Dict) -> float:
+        """Calculate similarity of the canonical token class streams"""
+        return self.kernel.ratio(profile_a['tokens'], profile_b['tokens'])
     
     def _tokenize_code(self, code: str) -> List[str]:
         """Tokenize code into meaningful tokens"""
@@ -162,16 +445,3 @@ class PlagiarismDetector:
             return "Low similarity - acceptable"
         else:
             return "Very low similarity - original work"
-    
-    def get_matching_blocks(self, code_a: str, code_b: str) -> List[Tuple]:
-        """Get matching code blocks between two submissions"""
-        matcher = difflib.SequenceMatcher(None, code_a, code_b)
-        blocks = matcher.get_matching_blocks()
-        
-        # Filter out small matches
-        significant_blocks = [
-            (a, b, size) for a, b, size in blocks 
-            if size > 20  # Minimum 20 characters
-        ]
-        
-        return significant_blocks
@@ -0,0 +1,257 @@
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from typing import Dict, Iterable, List
+from utils.analyzers import analyzer_modules, registered_extensions, warm_up
+from utils.code_analyzer import CodeAnalyzer
+
+try:
+    import resource
+except ImportError:  # not available on Windows, where only the wall-clock timeout applies
+    resource = None
+
+# Why an analysis was aborted
+ABORT_TIMEOUT = 'timeout'
+ABORT_CPU = 'cpu_time'
+ABORT_MEMORY = 'memory'
+ABORT_CRASH = 'crashed'
+
+
+def sandbox_enabled() -> bool:
+    """Analysis runs in limited child processes unless ANALYSIS_SANDBOX=false"""
+    return os.getenv('ANALYSIS_SANDBOX', 'true').lower() == 'true'
+
+
+def warmup_extensions() -> List[str]:
+    """Analyzers to load ahead of the first analysis: ANALYZER_WARMUP=all or e.g. "py,java"; lazy when unset"""
+    value = os.getenv('ANALYZER_WARMUP', '').strip().lower()
+    if value == 'all':
+        return registered_extensions()
+    return [extension.strip() for extension in value.split(',') if extension.strip()]
+
+
+def preload_analyzers(extensions: Iterable[str]):
+    """Import analyzer modules in the forkserver, so every sandbox worker, recycled ones
+    included, starts with them loaded. Only applies before the forkserver starts.
+    """
+    modules = analyzer_modules(extensions)
+    if modules and 'forkserver' in multiprocessing.get_all_start_methods():
+        multiprocessing.set_forkserver_preload(modules)
+
+
+def aborted_result(code: str, language: str, reason: str, limit) -> Dict:
+    """analyze()-shaped result for an analysis stopped by the sandbox"""
+    messages = {
+        ABORT_TIMEOUT: f"Analysis aborted: no result within {limit} seconds",
+        ABORT_CPU: f"Analysis aborted: exceeded the CPU time limit of {limit} seconds",
+        ABORT_MEMORY: f"Analysis aborted: exceeded the memory limit of {limit} MB",
+        ABORT_CRASH: "Analysis aborted: the analysis process exited unexpectedly",
+    }
+    return {
+        "is_valid": False,
+        "language": language.lower(),
+        "errors": [messages[reason]],
+        "warnings": [],
+        "metrics": {"aborted": {"reason": reason, "limit": limit}},
+        "suggestions": [],
+        "code_length": len(code),
+        "lines_of_code": len(code.splitlines())
+    }
+
+
+def _worker_main(conn, cpu_seconds: int, memory_bytes: int, warmup: List[str]):
+    """Child process loop: receive (code, language), send back ('ok', analysis) or ('aborted', reason)"""
+    if resource is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, hard))
+
+    # Instant when the forkserver preloaded the modules; under spawn this is the import
+    warm_up(warmup)
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        # RLIMIT_CPU counts the whole process, so each task gets its budget on top of
+        # what was already used; going over it delivers SIGXCPU, which ends the process
+        if resource is not None:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            resource.setrlimit(resource.RLIMIT_CPU, (math.ceil(usage.ru_utime + usage.ru_stime) + cpu_seconds, hard))
+
+        code, language = task
+        try:
+            conn.send(('ok', CodeAnalyzer(code, language).analyze()))
+        except MemoryError:
+            # The heap may be fragmented past the limit; report and let the pool replace us
+            conn.send(('aborted', ABORT_MEMORY))
+            return
+
+
+class _Worker:
+    """One sandbox child process and its end of the pipe"""
+
+    def __init__(self, context, cpu_seconds: int, memory_bytes: int, warmup: List[str]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, cpu_seconds, memory_bytes, warmup),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class AnalysisSandbox:
+    """Pool of child processes running CodeAnalyzer under CPU time and memory limits
+
+    A task that runs out of CPU time or memory, or gives no answer within the
+    wall-clock timeout, gets its process killed and replaced and yields an
+    "analysis aborted" result instead of stalling the calling request. Workers
+    are also recycled after max_tasks analyses, and start on first use with the
+    warmup analyzers already loaded.
+    """
+
+    def __init__(self, workers: int = 2, cpu_seconds: int = 10, memory_mb: int = 512,
+                 timeout: int = 30, max_tasks: int = 200, warmup: Iterable[str] = ()):
+        self.workers = max(1, workers)
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.timeout = timeout
+        self.max_tasks = max_tasks
+        self.warmup = list(warmup)
+        preload_analyzers(self.warmup)
+
+        # forkserver children start from a clean process instead of a copy of the
+        # threaded web worker
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+        # Idle workers; None stands for a slot whose process is not started yet
+        self._idle = queue.Queue()
+        for _ in range(self.workers):
+            self._idle.put(None)
+
+        self._lock = threading.Lock()
+        self._counters = {"completed": 0, "recycled": 0, ABORT_TIMEOUT: 0, ABORT_CPU: 0, ABORT_MEMORY: 0, ABORT_CRASH: 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _exit_reason(self, worker: _Worker) -> str:
+        """Why a worker died in the middle of a task"""
+        worker.process.join(1)
+        if worker.process.exitcode == -signal.SIGXCPU:
+            return ABORT_CPU
+        # The kernel OOM killer answers with SIGKILL
+        if worker.process.exitcode == -signal.SIGKILL:
+            return ABORT_MEMORY
+        return ABORT_CRASH
+
+    def _limit(self, reason: str):
+        return {ABORT_TIMEOUT: self.timeout, ABORT_CPU: self.cpu_seconds, ABORT_MEMORY: self.memory_mb}.get(reason)
+
+    def analyze(self, code: str, language: str) -> Dict:
+        """CodeAnalyzer(code, language).analyze() in a sandboxed worker, blocking while all are busy"""
+        worker = self._idle.get()
+        try:
+            if worker is None or not worker.alive():
+                worker = _Worker(self._context, self.cpu_seconds, self.memory_mb * 1024 * 1024, self.warmup)
+
+            worker.conn.send((code, language))
+            status, payload = None, ABORT_TIMEOUT
+            if worker.conn.poll(self.timeout):
+                try:
+                    status, payload = worker.conn.recv()
+                except EOFError:
+                    payload = self._exit_reason(worker)
+
+            if status == 'ok':
+                self._count("completed")
+                worker.tasks += 1
+                if worker.tasks >= self.max_tasks:
+                    self._count("recycled")
+                    worker.stop()
+                    worker = None
+                return payload
+
+            self._count(payload)
+            worker.kill()
+            worker = None
+            return aborted_result(code, language, payload, self._limit(payload))
+
+        except BaseException:
+            if worker is not None:
+                worker.kill()
+                worker = None
+            raise
+
+        finally:
+            self._idle.put(worker)
+
+    def stats(self) -> Dict:
+        """Completed, aborted (by reason) and recycled counts, plus the configured limits"""
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "workers": self.workers,
+            "cpu_seconds": self.cpu_seconds,
+            "memory_mb": self.memory_mb,
+            "timeout": self.timeout,
+            "max_tasks": self.max_tasks,
+            "completed": counters.pop("completed"),
+            "recycled": counters.pop("recycled"),
+            "aborted": counters
+        }
+
+
+_sandbox = None
+_sandbox_lock = threading.Lock()
+
+
+def get_sandbox() -> AnalysisSandbox:
+    global _sandbox
+    with _sandbox_lock:
+        if _sandbox is None:
+            _sandbox = AnalysisSandbox(
+                workers=int(os.getenv('ANALYSIS_SANDBOX_WORKERS', 2)),
+                cpu_seconds=int(os.getenv('ANALYSIS_CPU_SECONDS', 10)),
+                memory_mb=int(os.getenv('ANALYSIS_MEMORY_MB', 512)),
+                timeout=int(os.getenv('ANALYSIS_TIMEOUT', 30)),
+                max_tasks=int(os.getenv('ANALYSIS_TASKS_PER_WORKER', 200)),
+                warmup=warmup_extensions()
+            )
+    return _sandbox
+
+
+def run_analysis(code: str, language: str) -> Dict:
+    """Analyze code in the sandbox, or in-process when ANALYSIS_SANDBOX=false"""
+    if sandbox_enabled():
+        return get_sandbox().analyze(code, language)
+    return CodeAnalyzer(code, language).analyze()
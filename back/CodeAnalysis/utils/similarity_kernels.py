@@ -0,0 +1,78 @@
+import difflib
+import os
+from collections import Counter
+from typing import Sequence
+
+try:
+    from rapidfuzz.distance import Indel
+except ImportError:  # rapidfuzz is optional, difflib is always available
+    Indel = None
+
+
+class SimilarityKernel:
+    """Scores the similarity of two sequences (strings or token lists) in [0, 1]"""
+
+    name = 'base'
+
+    def ratio(self, a: Sequence, b: Sequence) -> float:
+        raise NotImplementedError
+
+    def length_bound(self, a: Sequence, b: Sequence) -> float:
+        """Upper bound of ratio() from the lengths only (SequenceMatcher.real_quick_ratio)"""
+        total = len(a) + len(b)
+        return 2.0 * min(len(a), len(b)) / total if total else 1.0
+
+    def overlap_bound(self, a: Sequence, b: Sequence) -> float:
+        """Upper bound of ratio() from the multiset overlap (SequenceMatcher.quick_ratio)"""
+        total = len(a) + len(b)
+        if not total:
+            return 1.0
+        matches = sum((Counter(a) & Counter(b)).values())
+        return 2.0 * matches / total
+
+
+class DifflibKernel(SimilarityKernel):
+    """Legacy kernel: difflib.SequenceMatcher.ratio(), kept for parity checks"""
+
+    name = 'difflib'
+
+    def ratio(self, a: Sequence, b: Sequence) -> float:
+        return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+class RapidfuzzKernel(SimilarityKernel):
+    """C-backed Indel (LCS based) similarity from rapidfuzz
+
+    Computes 2 * LCS / (len(a) + len(b)) with a bit-parallel algorithm. This is
+    the same formula as SequenceMatcher.ratio(), but with the exact longest common
+    subsequence instead of difflib's greedy matching blocks and junk heuristic,
+    so scores are equal or slightly higher.
+    """
+
+    name = 'rapidfuzz'
+
+    def __init__(self):
+        if Indel is None:
+            raise ImportError("rapidfuzz is not installed")
+
+    def ratio(self, a: Sequence, b: Sequence) -> float:
+        return Indel.normalized_similarity(a, b)
+
+
+KERNELS = {
+    DifflibKernel.name: DifflibKernel,
+    RapidfuzzKernel.name: RapidfuzzKernel,
+}
+
+
+def get_kernel(name: str = None) -> SimilarityKernel:
+    """Create a kernel by name; 'auto' picks rapidfuzz when installed, else difflib"""
+    name = (name or os.getenv('SIMILARITY_KERNEL', 'auto')).lower()
+
+    if name == 'auto':
+        name = RapidfuzzKernel.name if Indel is not None else DifflibKernel.name
+
+    if name not in KERNELS:
+        raise ValueError(f"Unknown similarity kernel '{name}', expected one of: auto, {', '.join(KERNELS)}")
+
+    return KERNELS[name]()
@@ -1,7 +1,6 @@
 from typing import List, Optional
 from fastapi import HTTPException
 from datetime import datetime
-import httpx
 import os
 
 from models.contact import ContactMessage, ContactMessageResponse, ContactMessageCreate, ContactStats
@@ -12,6 +11,7 @@ from utils.supabase import (
     get_contact_messages_by_tenant,
     get_user_by_email
 )
+from utils.http_client import get_http_client
 
 class ContactController:
     def __init__(self):
@@ -96,38 +96,38 @@ class ContactController:
             table_prefix = get_tenant_table_prefix(tenant)
             table_name = f"{table_prefix}_contact_messages"
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                headers = {
-                    "apikey": self.supabase_service_key,
-                    "Authorization": f"Bearer {self.supabase_service_key}"
-                }
-                
-                # Obtener estadísticas
-                response = await client.get(
-                    f"{self.supabase_url}/rest/v1/{table_name}?select=status,created_at",
-                    headers=headers
+            client = get_http_client()
+            headers = {
+                "apikey": self.supabase_service_key,
+                "Authorization": f"Bearer {self.supabase_service_key}"
+            }
+
+            # Obtener estadísticas
+            response = await client.get(
+                f"{self.supabase_url}/rest/v1/{table_name}?select=status,created_at",
+                headers=headers
+            )
+
+            if response.status_code == 200:
+                messages = response.json()
+                total = len(messages)
+                pendientes = len([m for m in messages if m.get("status") == "pendiente"])
+                respondidos = len([m for m in messages if m.get("status") == "respondido"])
+
+                ultimo_mensaje = None
+                if messages:
+                    ultimo_mensaje = max([m.get("created_at") for m in messages if m.get("created_at")])
+                    ultimo_mensaje = datetime.fromisoformat(ultimo_mensaje.replace('Z', '+00:00'))
+
+                return ContactStats(
+                    total_mensajes=total,
+                    mensajes_pendientes=pendientes,
+                    mensajes_respondidos=respondidos,
+                    tenant=tenant,
+                    ultimo_mensaje=ultimo_mensaje
                 )
-                
-                if response.status_code == 200:
-                    messages = response.json()
-                    total = len(messages)
-                    pendientes = len([m for m in messages if m.get("status") == "pendiente"])
-                    respondidos = len([m for m in messages if m.get("status") == "respondido"])
-                    
-                    ultimo_mensaje = None
-                    if messages:
-                        ultimo_mensaje = max([m.get("created_at") for m in messages if m.get("created_at")])
-                        ultimo_mensaje = datetime.fromisoformat(ultimo_mensaje.replace('Z', '+00:00'))
-                    
-                    return ContactStats(
-                        total_mensajes=total,
-                        mensajes_pendientes=pendientes,
-                        mensajes_respondidos=respondidos,
-                        tenant=tenant,
-                        ultimo_mensaje=ultimo_mensaje
-                    )
-                else:
-                    raise HTTPException(status_code=500, detail="Error obteniendo estadísticas")
+            else:
+                raise HTTPException(status_code=500, detail="Error obteniendo estadísticas")
 
         except HTTPException:
             raise
@@ -150,26 +150,26 @@ class ContactController:
             if atendido_por:
                 update_data["atendido_por"] = atendido_por
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                headers = {
-                    "apikey": self.supabase_service_key,
-                    "Authorization": f"Bearer {self.supabase_service_key}",
-                    "Content-Type": "application/json"
+            client = get_http_client()
+            headers = {
+                "apikey": self.supabase_service_key,
+                "Authorization": f"Bearer {self.supabase_service_key}",
+                "Content-Type": "application/json"
+            }
+
+            response = await client.patch(
+                f"{self.supabase_url}/rest/v1/{table_name}?id=eq.{message_id}",
+                headers=headers,
+                json=update_data
+            )
+
+            if response.status_code == 204:
+                return {
+                    "success": True,
+                    "message": "Estado del mensaje actualizado exitosamente"
                 }
-                
-                response = await client.patch(
-                    f"{self.supabase_url}/rest/v1/{table_name}?id=eq.{message_id}",
-                    headers=headers,
-                    json=update_data
-                )
-                
-                if response.status_code == 204:
-                    return {
-                        "success": True,
-                        "message": "Estado del mensaje actualizado exitosamente"
-                    }
-                else:
-                    raise HTTPException(status_code=500, detail="Error actualizando el mensaje")
+            else:
+                raise HTTPException(status_code=500, detail="Error actualizando el mensaje")
 
         except HTTPException:
             raise
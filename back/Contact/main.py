@@ -19,11 +19,14 @@ if not all([SUPABASE_URL, SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY]):
     raise RuntimeError("Variables de entorno de Supabase no configuradas. Verifica tu archivo .env")
 
 from routes.contact_routes import router as contact_router
+from utils.http_client import lifespan
+from utils.supabase import tenant_cache_stats
 
 app = FastAPI(
     title="Contact Microservice",
     version="1.0.0",
-    description="API para gestión de contactos y soporte multi-tenant"
+    description="API para gestión de contactos y soporte multi-tenant",
+    lifespan=lifespan
 )
 
 # CORS
@@ -73,7 +76,8 @@ async def health():
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
-        "service": "contact"
+        "service": "contact",
+        "tenant_cache": tenant_cache_stats()
     }
 
 # Manejo de errores global
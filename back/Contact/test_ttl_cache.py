@@ -0,0 +1,111 @@
+import asyncio
+
+from utils.ttl_cache import AsyncTTLCache
+
+
+class Loader:
+    """Consulta simulada que cuenta cuántas veces se llamó"""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, value, fail=False):
+        async def load():
+            self.calls += 1
+            await asyncio.sleep(self.delay)
+            if fail:
+                raise RuntimeError("fallo de consulta")
+            return value
+        return load
+
+
+def test_single_flight():
+    """Consultas concurrentes de una clave ausente comparten una sola llamada"""
+    async def run():
+        cache = AsyncTTLCache(ttl=60)
+        loader = Loader()
+        results = await asyncio.gather(*[cache.get('ucb', loader({"id": 1})) for _ in range(20)])
+        assert results == [{"id": 1}] * 20
+        assert loader.calls == 1
+        assert await cache.get('ucb', loader({"id": 2})) == {"id": 1}
+        stats = cache.stats()
+        assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 19, 1)
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_does_not_cancel_the_load():
+    """Si se cancela quien inició la carga, los demás reciben el valor igual"""
+    async def run():
+        cache = AsyncTTLCache(ttl=60)
+        loader = Loader()
+        first = asyncio.ensure_future(cache.get('ucb', loader("valor")))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(cache.get('ucb', loader("otro")))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "valor"
+        assert loader.calls == 1
+    asyncio.run(run())
+
+
+def test_errors_and_none_are_not_cached():
+    """Los errores y los valores None se reintentan en la siguiente consulta"""
+    async def run():
+        cache = AsyncTTLCache(ttl=60)
+        loader = Loader()
+        try:
+            await cache.get('ucb', loader(None, fail=True))
+            assert False, "se esperaba el error de la consulta"
+        except RuntimeError:
+            pass
+        assert await cache.get('ucb', loader(None)) is None
+        assert await cache.get('ucb', loader("valor")) == "valor"
+        assert loader.calls == 3
+    asyncio.run(run())
+
+
+def test_expiry_and_invalidation():
+    """Las entradas vencen tras el TTL, y una invalidación descarta la carga en curso"""
+    async def run():
+        cache = AsyncTTLCache(ttl=0.05)
+        loader = Loader(delay=0.01)
+        assert await cache.get('ucb', loader("viejo")) == "viejo"
+        await asyncio.sleep(0.06)
+        assert await cache.get('ucb', loader("nuevo")) == "nuevo"
+
+        pending = asyncio.ensure_future(cache.get('upb', loader("antes")))
+        await asyncio.sleep(0)
+        cache.invalidate('upb')
+        assert await pending == "antes"
+        assert await cache.get('upb', loader("después")) == "después"
+    asyncio.run(run())
+
+
+def test_invalidation_during_fetch_starts_a_new_load():
+    """Quien consulta tras invalidar no espera la carga vieja, y esta no suelta la nueva"""
+    async def run():
+        cache = AsyncTTLCache(ttl=60)
+        before, after = Loader(delay=0.02), Loader(delay=0.05)
+        old = asyncio.ensure_future(cache.get('ucb', before("viejo")))
+        await asyncio.sleep(0)
+        cache.invalidate('ucb')
+
+        fresh = asyncio.ensure_future(cache.get('ucb', after("nuevo")))
+        await asyncio.sleep(0)
+        assert await old == "viejo"
+        # La carga vieja terminó primero; la nueva sigue siendo la carga en curso
+        assert await cache.get('ucb', after("otro")) == "nuevo"
+        assert await fresh == "nuevo"
+        assert (before.calls, after.calls) == (1, 1)
+        assert await cache.get('ucb', after("otro")) == "nuevo"
+        assert cache.stats()["coalesced"] == 1
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    for test in (test_single_flight, test_cancelled_waiter_does_not_cancel_the_load,
+                 test_errors_and_none_are_not_cached, test_expiry_and_invalidation,
+                 test_invalidation_during_fetch_starts_a_new_load):
+        test()
+        print(f"✅ {test.__name__}")
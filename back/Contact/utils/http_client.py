@@ -0,0 +1,63 @@
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (HTTP/2 de httpx requiere el extra httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Cliente compartido por todo el proceso: reutiliza conexiones TCP+TLS entre consultas
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    """Crear el cliente con pool de conexiones, límites y timeouts configurables por entorno"""
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", 100)),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", 20)),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30.0))
+    )
+    timeout = httpx.Timeout(
+        float(os.getenv("HTTP_TIMEOUT", 10.0)),
+        connect=float(os.getenv("HTTP_CONNECT_TIMEOUT", 5.0))
+    )
+    http2 = HTTP2_AVAILABLE and os.getenv("HTTP2", "true").lower() == "true"
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2)
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Crear el cliente compartido (al iniciar la aplicación)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def close_http_client():
+    """Cerrar el cliente compartido y sus conexiones (al apagar la aplicación)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Cliente compartido; se crea aquí si la aplicación no pasó por el lifespan (scripts, pruebas)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Lifespan de FastAPI: abre el pool al arrancar y lo cierra al apagar"""
+    await start_http_client()
+    try:
+        yield
+    finally:
+        await close_http_client()
@@ -1,8 +1,9 @@
-import httpx
 import os
 from typing import Optional, Dict
 from fastapi import HTTPException, Header
 import jwt
+from utils.http_client import get_http_client
+from utils.ttl_cache import AsyncTTLCache
 
 # Variables de entorno
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -10,6 +11,9 @@ SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET", SUPABASE_ANON_KEY)
 
+# Los tenants casi nunca cambian: se guardan en memoria TENANT_CACHE_TTL segundos
+_tenant_cache = AsyncTTLCache(ttl=float(os.getenv("TENANT_CACHE_TTL", 300)))
+
 def get_tenant_from_email(email: str) -> Optional[str]:
     """Obtener dominio del tenant según el email - Similar al C# Program.cs"""
     if not email:
@@ -35,24 +39,39 @@ def get_tenant_table_prefix(tenant: str) -> str:
     }
     return tenant_mapping.get(tenant, "tenant_unknown")
 
+async def _fetch_tenant_info(domain: str) -> Optional[Dict]:
+    """Consultar el tenant en Supabase (sin caché)"""
+    client = get_http_client()
+    headers = {
+        "apikey": SUPABASE_ANON_KEY,
+        "Authorization": f"Bearer {SUPABASE_ANON_KEY}"
+    }
+    response = await client.get(
+        f"{SUPABASE_URL}/rest/v1/tenants?domain=eq.{domain}&select=*",
+        headers=headers
+    )
+    if response.status_code == 200:
+        tenants = response.json()
+        return tenants[0] if tenants else None
+    return None
+
 async def get_tenant_info(domain: str) -> Optional[Dict]:
     """Obtener información del tenant desde Supabase"""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            headers = {
-                "apikey": SUPABASE_ANON_KEY,
-                "Authorization": f"Bearer {SUPABASE_ANON_KEY}"
-            }
-            response = await client.get(
-                f"{SUPABASE_URL}/rest/v1/tenants?domain=eq.{domain}&select=*",
-                headers=headers
-            )
-            if response.status_code == 200:
-                tenants = response.json()
-                return tenants[0] if tenants else None
-    except Exception as e:
+        tenant = await _tenant_cache.get(domain, lambda: _fetch_tenant_info(domain))
+        # Copia: quien llama no debe modificar la entrada compartida de la caché
+        return dict(tenant) if tenant else None
+    except Exception:
         return None
 
+def invalidate_tenant_info(domain: Optional[str] = None):
+    """Descartar de la caché un tenant (o todos), p. ej. después de modificarlo"""
+    _tenant_cache.invalidate(domain)
+
+def tenant_cache_stats() -> Dict:
+    """Métricas de la caché de tenants"""
+    return _tenant_cache.stats()
+
 async def get_current_user(authorization: str = Header(None)) -> Dict:
     """Extraer y validar usuario del token JWT"""
     if not authorization or not authorization.startswith("Bearer "):
@@ -82,18 +101,18 @@ async def get_user_by_email(email: str, tenant: str) -> Optional[Dict]:
         table_prefix = get_tenant_table_prefix(tenant)
         table_name = f"{table_prefix}_usuarios"
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            headers = {
-                "apikey": SUPABASE_SERVICE_ROLE_KEY,
-                "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
-            }
-            response = await client.get(
-                f"{SUPABASE_URL}/rest/v1/{table_name}?email=eq.{email}&select=*",
-                headers=headers
-            )
-            if response.status_code == 200:
-                users = response.json()
-                return users[0] if users else None
+        client = get_http_client()
+        headers = {
+            "apikey": SUPABASE_SERVICE_ROLE_KEY,
+            "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
+        }
+        response = await client.get(
+            f"{SUPABASE_URL}/rest/v1/{table_name}?email=eq.{email}&select=*",
+            headers=headers
+        )
+        if response.status_code == 200:
+            users = response.json()
+            return users[0] if users else None
     except Exception as e:
         return None
 
@@ -103,33 +122,33 @@ async def create_contact_message(contact_data: Dict, tenant: str) -> Optional[Di
         table_prefix = get_tenant_table_prefix(tenant)
         table_name = f"{table_prefix}_contact_messages"
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            headers = {
-                "apikey": SUPABASE_SERVICE_ROLE_KEY,
-                "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-                "Content-Type": "application/json",
-                "Prefer": "return=representation"
-            }
-            
-            response = await client.post(
-                f"{SUPABASE_URL}/rest/v1/{table_name}",
-                headers=headers,
-                json=contact_data
-            )
-            
-            if response.status_code == 201:
-                try:
-                    result = response.json()
-                    return result
-                except Exception as json_error:
-                    # Return a basic success response if JSON parsing fails
-                    return {"success": True, "message": "Contact message created"}
-            elif response.status_code == 409:
-                return None
-            elif response.status_code == 400:
-                return None
-            else:
-                return None
+        client = get_http_client()
+        headers = {
+            "apikey": SUPABASE_SERVICE_ROLE_KEY,
+            "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
+            "Content-Type": "application/json",
+            "Prefer": "return=representation"
+        }
+
+        response = await client.post(
+            f"{SUPABASE_URL}/rest/v1/{table_name}",
+            headers=headers,
+            json=contact_data
+        )
+
+        if response.status_code == 201:
+            try:
+                result = response.json()
+                return result
+            except Exception as json_error:
+                # Return a basic success response if JSON parsing fails
+                return {"success": True, "message": "Contact message created"}
+        elif response.status_code == 409:
+            return None
+        elif response.status_code == 400:
+            return None
+        else:
+            return None
                 
     except Exception as e:
         return None
@@ -140,16 +159,16 @@ async def get_contact_messages_by_tenant(tenant: str, limit: int = 50) -> list:
         table_prefix = get_tenant_table_prefix(tenant)
         table_name = f"{table_prefix}_contact_messages"
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            headers = {
-                "apikey": SUPABASE_SERVICE_ROLE_KEY,
-                "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
-            }
-            response = await client.get(
-                f"{SUPABASE_URL}/rest/v1/{table_name}?order=created_at.desc&limit={limit}",
-                headers=headers
-            )
-            if response.status_code == 200:
-                return response.json()
+        client = get_http_client()
+        headers = {
+            "apikey": SUPABASE_SERVICE_ROLE_KEY,
+            "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
+        }
+        response = await client.get(
+            f"{SUPABASE_URL}/rest/v1/{table_name}?order=created_at.desc&limit={limit}",
+            headers=headers
+        )
+        if response.status_code == 200:
+            return response.json()
     except Exception as e:
         return []
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""Latencia de un endpoint típico: cliente httpx nuevo por consulta vs cliente compartido con pool
+
+Uso:
+    python benchmarks/http_pool.py                     # servidor HTTPS local con certificado temporal
+    python benchmarks/http_pool.py --url https://<proyecto>.supabase.co --key <anon key>
+
+Cada "request" reproduce lo que hace un endpoint de cursos: get_tenant_info,
+get_user_by_email y una consulta a la tabla del tenant, en secuencia. Contra un
+servidor local solo se mide el costo de CPU del handshake TCP+TLS; contra
+Supabase se suma además la latencia de red de cada conexión nueva.
+"""
+import argparse
+import asyncio
+import http.server
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.http_client import get_http_client, close_http_client
+
+QUERIES = [
+    "/rest/v1/tenants?domain=eq.ucb.edu.bo&select=*",
+    "/rest/v1/tenant_ucb_usuarios?email=eq.docente@ucb.edu.bo&select=*",
+    "/rest/v1/tenant_ucb_cursos?select=*&order=created_at.desc",
+]
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'[{"id": 1, "schema_name": "tenant_ucb", "rol": "Profesor"}]'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_local_server(directory):
+    """Servidor HTTPS local con un certificado autofirmado generado con openssl"""
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost",
+         "-keyout", key, "-out", cert],
+        check=True, capture_output=True
+    )
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"https://localhost:{server.server_address[1]}", cert
+
+
+async def request_fresh(url, headers):
+    """Como antes: un AsyncClient nuevo (y una conexión nueva) por consulta"""
+    for query in QUERIES:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            (await client.get(url + query, headers=headers)).raise_for_status()
+
+
+async def request_pooled(url, headers):
+    """Con el cliente compartido de utils.http_client"""
+    client = get_http_client()
+    for query in QUERIES:
+        (await client.get(url + query, headers=headers)).raise_for_status()
+
+
+async def measure(func, url, headers, requests, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await func(url, headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await func(url, headers)  # calentamiento
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="URL de Supabase; sin ella se usa un servidor local")
+    parser.add_argument("--key", default=os.getenv("SUPABASE_ANON_KEY", "local"))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.url:
+            url = args.url.rstrip("/")
+        else:
+            server, url, cert = start_local_server(directory)
+            # Ambos clientes confían en el certificado local a través del entorno
+            os.environ["SSL_CERT_FILE"] = cert
+
+        headers = {"apikey": args.key, "Authorization": f"Bearer {args.key}"}
+        print(f"{'cliente':>22}  {'req/s':>8}  {'p50 ms':>8}  {'p99 ms':>8}   ({len(QUERIES)} consultas por request)")
+        for name, func in (("nuevo por consulta", request_fresh), ("compartido con pool", request_pooled)):
+            stats = await measure(func, url, headers, args.requests, args.concurrency)
+            print(f"{name:>22}  {stats['rps']:>8.0f}  {stats['p50']:>8.1f}  {stats['p99']:>8.1f}")
+
+        await close_http_client()
+        if not args.url:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
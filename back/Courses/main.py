@@ -17,11 +17,14 @@ if not all([SUPABASE_URL, SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY]):
     raise RuntimeError("Variables de entorno de Supabase no configuradas. Verifica tu archivo .env")
 
 from routes.course_routes import router as course_router
+from utils.http_client import lifespan
+from utils.supabase import tenant_cache_stats
 
 app = FastAPI(
     title="Courses Microservice",
     version="1.0.0",
-    description="API para gestión de cursos multi-tenant"
+    description="API para gestión de cursos multi-tenant",
+    lifespan=lifespan
 )
 
 # CORS
@@ -55,7 +58,8 @@ async def health():
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
-        "service": "courses"
+        "service": "courses",
+        "tenant_cache": tenant_cache_stats()
     }
 
 # Manejo de errores global
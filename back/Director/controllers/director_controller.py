@@ -1,10 +1,10 @@
-import httpx
 import os
 import secrets
 import string
 from typing import List, Optional
 from models.usuario import UsuarioCreate, UsuarioUpdate, UsuarioResponse
 from utils.supabase import supabase_request, get_tenant_schema
+from utils.http_client import get_http_client
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
@@ -32,10 +32,10 @@ async def create_supabase_auth_user(email: str, password: str) -> dict:
         }
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        return response.json()
+    client = get_http_client()
+    response = await client.post(url, headers=headers, json=payload)
+    response.raise_for_status()
+    return response.json()
 
 async def delete_supabase_auth_user(user_id: str) -> bool:
     """Delete a user from Supabase Auth"""
@@ -45,9 +45,9 @@ async def delete_supabase_auth_user(user_id: str) -> bool:
         "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(url, headers=headers)
-        return response.status_code == 200
+    client = get_http_client()
+    response = await client.delete(url, headers=headers)
+    return response.status_code == 200
 
 async def get_all_users(tenant_schema: str) -> List[UsuarioResponse]:
     """Get all users from a tenant's usuarios table"""
@@ -17,11 +17,13 @@ if not all([SUPABASE_URL, SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY]):
     raise RuntimeError("❌ Variables de entorno de Supabase no configuradas")
 
 from routes.director_routes import router as director_router
+from utils.http_client import lifespan
 
 app = FastAPI(
     title="Director Microservice",
     version="1.0.0",
-    description="API para gestión de usuarios (estudiantes y profesores) por directores multi-tenant"
+    description="API para gestión de usuarios (estudiantes y profesores) por directores multi-tenant",
+    lifespan=lifespan
 )
 
 app.add_middleware(
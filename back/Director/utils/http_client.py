@@ -0,0 +1,63 @@
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (httpx needs the httpx[http2] extra for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# One client for the whole process, so queries reuse TCP+TLS connections
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    """Build the pooled client; limits and timeouts come from the environment"""
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", 100)),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", 20)),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30.0))
+    )
+    timeout = httpx.Timeout(
+        float(os.getenv("HTTP_TIMEOUT", 5.0)),
+        connect=float(os.getenv("HTTP_CONNECT_TIMEOUT", 5.0))
+    )
+    http2 = HTTP2_AVAILABLE and os.getenv("HTTP2", "true").lower() == "true"
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2)
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client (on application startup)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def close_http_client():
+    """Close the shared client and its connections (on application shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared client; created here when the app did not go through the lifespan (scripts, tests)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """FastAPI lifespan: open the pool on startup and close it on shutdown"""
+    await start_http_client()
+    try:
+        yield
+    finally:
+        await close_http_client()
@@ -17,11 +17,13 @@ if not all([SUPABASE_URL, SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY]):
     raise RuntimeError("❌ Variables de entorno de Supabase no configuradas")
 
 from routes.grades_routes import router as grades_router
+from utils.http_client import lifespan
 
 app = FastAPI(
     title="Grades Microservice",
     version="1.0.0",
-    description="API para gestión de notas/calificaciones multi-tenant"
+    description="API para gestión de notas/calificaciones multi-tenant",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -1,5 +1,5 @@
 import os
-import httpx
+from utils.http_client import get_http_client
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
@@ -18,20 +18,20 @@ async def supabase_request(method: str, endpoint: str, data: dict = None):
     url = f"{SUPABASE_URL}/rest/v1/{endpoint}"
     headers = get_supabase_headers()
     
-    async with httpx.AsyncClient() as client:
-        if method == "GET":
-            response = await client.get(url, headers=headers)
-        elif method == "POST":
-            response = await client.post(url, headers=headers, json=data)
-        elif method == "PATCH":
-            response = await client.patch(url, headers=headers, json=data)
-        elif method == "DELETE":
-            response = await client.delete(url, headers=headers)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
-        
-        response.raise_for_status()
-        return response.json() if response.text else None
+    client = get_http_client()
+    if method == "GET":
+        response = await client.get(url, headers=headers)
+    elif method == "POST":
+        response = await client.post(url, headers=headers, json=data)
+    elif method == "PATCH":
+        response = await client.patch(url, headers=headers, json=data)
+    elif method == "DELETE":
+        response = await client.delete(url, headers=headers)
+    else:
+        raise ValueError(f"Unsupported HTTP method: {method}")
+
+    response.raise_for_status()
+    return response.json() if response.text else None
 
 def get_tenant_schema(email: str) -> str:
     """Extract tenant schema name from email domain"""
@@ -1,12 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routes import router
+from utils.http_client import lifespan
 from datetime import datetime
 
 app = FastAPI(
     title="Reports Microservice",
     description="Generate detailed reports for teachers and directors",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -1,7 +1,7 @@
 import os
 from dotenv import load_dotenv
-import httpx
 from typing import Optional, Dict, List
+from utils.http_client import get_http_client
 
 load_dotenv()
 
@@ -36,19 +36,19 @@ async def supabase_request(method: str, endpoint: str, data: Optional[Dict] = No
     
     url = f"{SUPABASE_URL}/rest/v1/{endpoint}"
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        if method == "GET":
-            response = await client.get(url, headers=headers)
-        elif method == "POST":
-            response = await client.post(url, headers=headers, json=data)
-        elif method == "PUT":
-            response = await client.put(url, headers=headers, json=data)
-        elif method == "PATCH":
-            response = await client.patch(url, headers=headers, json=data)
-        elif method == "DELETE":
-            response = await client.delete(url, headers=headers)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
-        
-        response.raise_for_status()
-        return response.json()
+    client = get_http_client()
+    if method == "GET":
+        response = await client.get(url, headers=headers)
+    elif method == "POST":
+        response = await client.post(url, headers=headers, json=data)
+    elif method == "PUT":
+        response = await client.put(url, headers=headers, json=data)
+    elif method == "PATCH":
+        response = await client.patch(url, headers=headers, json=data)
+    elif method == "DELETE":
+        response = await client.delete(url, headers=headers)
+    else:
+        raise ValueError(f"Unsupported HTTP method: {method}")
+
+    response.raise_for_status()
+    return response.json()